@@ -15,10 +15,15 @@ fi
 cd "$SRCROOT"
 
 # Run the script and capture output
-# We suppress warnings but show actual errors
-OUTPUT=$(python3 "$SRCROOT/scripts/add_missing_files_to_project.py" 2>&1)
+# We suppress warnings but show actual errors. The hook exits after a few
+# stat() calls when no source directory or the project file changed since
+# the last sync; -S skips site-packages setup to keep that path cheap.
+OUTPUT=$(python3 -S "$SRCROOT/scripts/project_sync_hook.py" 2>&1)
 EXIT_CODE=$?
 
+# Show how long the hook took in the build log
+echo "$OUTPUT" | grep "⏱" || true
+
 # Check if there were real errors (not just warnings)
 if [ $EXIT_CODE -ne 0 ]; then
     # Check if it's a real error or just warnings
@@ -8,36 +8,29 @@ import sys
 import os
 from pathlib import Path
 
+# Missing dependencies are reported by main(); importing this module
+# never exits the interpreter
 try:
     from PIL import Image
     import numpy as np
 except ImportError:
-    print("⚠️  PIL/Pillow not available. Installing...")
-    print("   Run: pip3 install Pillow numpy")
-    sys.exit(1)
+    Image = np = None
 
-def analyze_icon_edges(image_path):
-    """Analyze icon for edge transparency"""
-    img = Image.open(image_path)
-    width, height = img.size
-
-    print(f"📊 Analyzing: {os.path.basename(image_path)}")
-    print(f"   Size: {width}x{height}")
-    print(f"   Mode: {img.mode}")
+import output_writer
+from png_preflight import preflight
 
-    if img.mode != 'RGBA':
-        print("   ✅ No alpha channel - icon should be fine")
-        return False
+DEFAULT_MASTER_ICON = "Plena/Assets.xcassets/PlenaRoundedAppIcon_v2.appiconset/icon_1024x1024_ios-marketing_app_1x.png"
 
-    # Convert to numpy for analysis
-    img_array = np.array(img)
-    alpha = img_array[:, :, 3] if len(img_array.shape) == 3 else None
+def measure_edge_transparency(alpha):
+    """
+    Measure how much of the outermost pixel ring is not fully opaque.
 
-    if alpha is None:
-        print("   ✅ No alpha channel")
-        return False
+    Args:
+        alpha: 2D alpha array
 
-    # Check edge pixels
+    Returns:
+        (transparent pixel count, total edge pixels, percent)
+    """
     edge_pixels = np.concatenate([
         alpha[0, :],           # Top edge
         alpha[-1, :],          # Bottom edge
@@ -45,9 +38,35 @@ def analyze_icon_edges(image_path):
         alpha[:, -1]           # Right edge
     ])
 
-    transparent_count = np.sum(edge_pixels < 255)
+    transparent_count = int(np.sum(edge_pixels < 255))
     total_edge = len(edge_pixels)
-    transparent_percent = (transparent_count / total_edge) * 100
+    return transparent_count, total_edge, (transparent_count / total_edge) * 100
+
+def analyze_icon_edges(image_path):
+    """Analyze icon for edge transparency"""
+    # Size, mode and alpha presence come from the PNG header alone
+    info = preflight(image_path)
+    if info is None:
+        with Image.open(image_path) as img:
+            info = {'width': img.width, 'height': img.height, 'mode': img.mode,
+                    'has_alpha': img.mode in ('RGBA', 'LA', 'P')}
+    width, height = info['width'], info['height']
+
+    print(f"📊 Analyzing: {os.path.basename(image_path)}")
+    print(f"   Size: {width}x{height}")
+    print(f"   Mode: {info['mode']}")
+
+    if not info['has_alpha']:
+        print("   ✅ No alpha channel - icon should be fine")
+        return False
+
+    # Only icons that can carry alpha are fully decoded
+    with Image.open(image_path) as img:
+        img_array = np.array(img.convert('RGBA'))
+    alpha = img_array[:, :, 3]
+
+    # Check edge pixels
+    transparent_count, total_edge, transparent_percent = measure_edge_transparency(alpha)
 
     print(f"   Edge transparency: {transparent_percent:.1f}% ({transparent_count}/{total_edge} pixels)")
 
@@ -59,63 +78,49 @@ def analyze_icon_edges(image_path):
         print("   ✅ Edges are mostly opaque")
         return False
 
-def fix_icon_edges(image_path, output_path):
-    """Fix icon by filling transparent edges with background color"""
-    img = Image.open(image_path)
-    width, height = img.size
-
-    if img.mode != 'RGBA':
+def fix_icon_edges(image_path, output_path, preset=None):
+    """Fix icon by filling transparent edges with background color (preset: see png_encoder.PRESETS)"""
+    info = preflight(image_path)
+    if info is not None and not info['has_alpha']:
         print(f"   ℹ️  No transparency to fix, copying as-is")
-        img.save(output_path)
+        with open(image_path, 'rb') as f:
+            output_writer.write_bytes(output_path, f.read())
         return
 
-    # Get background color from center area (most likely the actual background)
-    center_x, center_y = width // 2, height // 2
-    # Sample a small area around center
-    sample_size = min(100, width // 4, height // 4)
-    sample = img.crop((
-        center_x - sample_size // 2,
-        center_y - sample_size // 2,
-        center_x + sample_size // 2,
-        center_y + sample_size // 2
-    ))
-
-    # Get most common color (background)
-    colors = sample.getcolors(maxcolors=256*256*256)
-    if colors:
-        # Sort by frequency and get most common
-        colors.sort(reverse=True, key=lambda x: x[0])
-        bg_color = colors[0][1]
-
-        # If bg_color has alpha, make it opaque
-        if isinstance(bg_color, tuple) and len(bg_color) == 4:
-            bg_color = bg_color[:3]  # Remove alpha
-
-        print(f"   🎨 Detected background color: {bg_color}")
-
-        # Create new image with solid background
-        new_img = Image.new('RGB', (width, height), bg_color)
+    # One decode/encode: detect the background color from the center area
+    # (most likely the actual background) and composite onto it
+    from icon_pipeline import apply_pipeline
 
-        # Paste original image on top (this will composite properly)
-        if img.mode == 'RGBA':
-            new_img.paste(img, (0, 0), img.split()[3])  # Use alpha channel as mask
-        else:
-            new_img.paste(img, (0, 0))
+    context = apply_pipeline(image_path, output_path, ['edge-fill'], preset=preset)
+    bg_color = context.get('background_color')
 
-        new_img.save(output_path, 'PNG')
+    if bg_color is not None:
+        print(f"   🎨 Detected background color: {bg_color}")
         print(f"   ✅ Created edge-filled version: {os.path.basename(output_path)}")
     else:
-        # Fallback: just remove alpha
-        new_img = img.convert('RGB')
-        new_img.save(output_path, 'PNG')
         print(f"   ✅ Removed alpha channel: {os.path.basename(output_path)}")
 
 def main():
-    master_icon = "Plena/Assets.xcassets/PlenaRoundedAppIcon_v2.appiconset/icon_1024x1024_ios-marketing_app_1x.png"
+    import argparse
+    import png_encoder
+
+    parser = argparse.ArgumentParser(description="Check the master icon for transparent edges and write a fixed copy")
+    parser.add_argument("master_icon", nargs="?", default=DEFAULT_MASTER_ICON,
+                        help="Master icon PNG (default: the 1024px marketing icon)")
+    png_encoder.add_preset_argument(parser)
+    args = parser.parse_args()
+
+    if Image is None or np is None:
+        print("⚠️  PIL/Pillow and numpy are required")
+        print("   Run: pip3 install Pillow numpy")
+        return 1
+
+    # For whole-catalog checks use audit_assets.py
+    master_icon = args.master_icon
 
     if not os.path.exists(master_icon):
         print(f"❌ Master icon not found: {master_icon}")
-        sys.exit(1)
+        return 1
 
     print("🔍 Step 1: Analyzing master icon for edge issues...\n")
     has_issues = analyze_icon_edges(master_icon)
@@ -123,7 +128,7 @@ def main():
     if has_issues:
         print("\n🔧 Step 2: Fixing edge transparency...\n")
         fixed_icon = master_icon.replace('.png', '_fixed.png')
-        fix_icon_edges(master_icon, fixed_icon)
+        fix_icon_edges(master_icon, fixed_icon, args.png_preset)
 
         print(f"\n✅ Fixed icon created: {fixed_icon}")
         print("\n📝 Next steps:")
@@ -134,9 +139,7 @@ def main():
         print("\n✅ Master icon looks good! No edge transparency issues.")
         print("   If you still see borders, the issue might be in the design itself.")
         print("   Ensure the icon design extends to all edges with no padding.")
+    return 0
 
 if __name__ == "__main__":
-    main()
-
-
-
+    sys.exit(main())
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Audit every asset catalog image and stream the results as JSON Lines.
+
+Walks each .xcassets directory under the project roots (Plena/,
+Plena Watch App/, PlenaShared/ by default), reads every .appiconset and
+.imageset Contents.json, and for each image reports:
+
+- dimensions, color mode and alpha presence (from the PNG header)
+- edge transparency (only decoded when the image can carry alpha)
+- mismatches between the pixel size and the slot's size x scale
+- a sha256 content hash, with `duplicate_of` pointing at the first image
+  that had the same bytes
+
+One JSON object is written per line as soon as it is ready, followed by a
+final summary object, so CI can consume the stream incrementally. The exit
+status is non-zero if any error-level issue was found, including a
+Contents.json that can't be read or parsed. One worker pool serves every
+catalog.
+
+Usage:
+    python3 scripts/audit_assets.py [root ...] [--jobs N] [--output report.jsonl]
+"""
+
+import os
+import sys
+import json
+import argparse
+
+from icon_cache import file_sha256
+from icon_jobs import add_jobs_argument, job_pool, run_jobs
+from icon_slots import pixel_size
+from png_preflight import preflight
+
+DEFAULT_ROOTS = ["Plena", "Plena Watch App", "PlenaShared"]
+ASSET_SET_SUFFIXES = ('.appiconset', '.imageset')
+
+# Edge transparency above this percentage is reported for app icons
+EDGE_TRANSPARENCY_LIMIT = 5.0
+
+ERRORS = {'missing_file', 'unreadable', 'alpha_in_app_icon', 'size_mismatch', 'bad_contents_json', 'audit_failed'}
+
+
+def find_catalogs(roots):
+    """Yield every .xcassets directory under the given roots, sorted."""
+    for root in roots:
+        if not os.path.isdir(root):
+            continue
+        for dirpath, dirnames, _ in os.walk(root):
+            dirnames.sort()
+            catalogs = [d for d in dirnames if d.endswith('.xcassets')]
+            for name in catalogs:
+                yield os.path.join(dirpath, name)
+            # Catalogs are walked separately; don't descend into them here
+            dirnames[:] = [d for d in dirnames if not d.endswith('.xcassets')]
+
+
+def find_asset_sets(catalog):
+    """Yield every .appiconset / .imageset directory inside a catalog."""
+    for dirpath, dirnames, _ in os.walk(catalog):
+        dirnames.sort()
+        for name in dirnames:
+            if name.endswith(ASSET_SET_SUFFIXES):
+                yield os.path.join(dirpath, name)
+        # Sets don't nest; only keep walking through folders/groups
+        dirnames[:] = [d for d in dirnames if not d.endswith(ASSET_SET_SUFFIXES)]
+
+
+def plan_set(set_path):
+    """
+    Build audit tasks for one asset set from its Contents.json.
+
+    Returns:
+        (tasks, records) - tasks are argument tuples for audit_image;
+        records are issues found without touching any image
+    """
+    tasks = []
+    records = []
+    set_type = 'appiconset' if set_path.endswith('.appiconset') else 'imageset'
+    contents_path = os.path.join(set_path, 'Contents.json')
+
+    try:
+        with open(contents_path, 'r') as f:
+            contents = json.load(f)
+    except (OSError, ValueError) as e:
+        records.append({'type': 'set', 'set': set_path, 'issues': ['bad_contents_json'], 'error': str(e)})
+        return tasks, records
+
+    referenced = set()
+    for entry in contents.get('images', []):
+        slot = {key: entry[key] for key in ('idiom', 'size', 'scale', 'role', 'subtype') if key in entry}
+        filename = entry.get('filename')
+        if not filename:
+            if set_type == 'appiconset':
+                records.append({'type': 'slot', 'set': set_path, 'slot': slot, 'issues': ['unfilled_slot']})
+            continue
+        referenced.add(filename)
+        tasks.append((os.path.join(set_path, filename), set_type, slot, pixel_size(entry)))
+
+    for filename in sorted(os.listdir(set_path)):
+        if filename.lower().endswith('.png') and filename not in referenced:
+            records.append({'type': 'file', 'path': os.path.join(set_path, filename),
+                            'set': set_path, 'issues': ['unreferenced_file']})
+
+    return tasks, records
+
+
+def audit_image(path, set_type, slot, expected):
+    """
+    Audit one referenced image (runs in a worker process).
+
+    Args:
+        path: Image path
+        set_type: 'appiconset' or 'imageset'
+        slot: Contents.json slot attributes
+        expected: Expected (width, height) in pixels, or None
+
+    Returns:
+        Record dict
+    """
+    record = {'type': 'image', 'path': path, 'set': os.path.dirname(path),
+              'set_type': set_type, 'slot': slot, 'issues': []}
+
+    if not os.path.exists(path):
+        record['issues'].append('missing_file')
+        return record
+
+    record['sha256'] = file_sha256(path)
+    info = preflight(path)
+    if info is None:
+        record['issues'].append('unreadable')
+        return record
+
+    record.update({
+        'width': info['width'],
+        'height': info['height'],
+        'mode': info['mode'],
+        'bit_depth': info['bit_depth'],
+        'has_alpha': info['has_alpha'],
+        'edge_transparency': 0.0 if not info['has_alpha'] else None,
+    })
+
+    if expected is not None:
+        record['expected'] = list(expected)
+        if (info['width'], info['height']) != tuple(expected):
+            record['issues'].append('size_mismatch')
+
+    if info['has_alpha']:
+        # Only images that can carry alpha are decoded
+        import numpy as np
+        from PIL import Image
+        from analyze_and_fix_icon import measure_edge_transparency
+
+        with Image.open(path) as img:
+            alpha = np.asarray(img.convert('RGBA'))[:, :, 3]
+        record['edge_transparency'] = round(measure_edge_transparency(alpha)[2], 2)
+
+        if set_type == 'appiconset':
+            record['issues'].append('alpha_in_app_icon')
+            if record['edge_transparency'] > EDGE_TRANSPARENCY_LIMIT:
+                record['issues'].append('edge_transparency')
+
+    return record
+
+
+def audit(roots, jobs=1):
+    """
+    Audit every catalog under `roots`, yielding records as they complete.
+
+    Image records come back in walk order; `duplicate_of` refers to the
+    first earlier image with identical content.
+    """
+    first_by_hash = {}
+    with job_pool(jobs) as pool:
+        for catalog in find_catalogs(roots):
+            tasks = []
+            for set_path in find_asset_sets(catalog):
+                set_tasks, records = plan_set(set_path)
+                for record in records:
+                    record['catalog'] = catalog
+                    yield record
+                tasks.extend(set_tasks)
+
+            for task, outcome in run_jobs(audit_image, tasks, jobs, pool):
+                if outcome['error']:
+                    # Worker raised: report it against the task rather than dying
+                    yield {'type': 'error', 'path': task[0], 'catalog': catalog, 'issues': ['audit_failed'],
+                           'error': outcome['error'].strip().splitlines()[-1]}
+                    continue
+                record = outcome['result']
+                record['catalog'] = catalog
+                digest = record.get('sha256')
+                if digest:
+                    if digest in first_by_hash:
+                        record['duplicate_of'] = first_by_hash[digest]
+                    else:
+                        first_by_hash[digest] = record['path']
+                yield record
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Audit all asset catalogs and stream JSON Lines results")
+    parser.add_argument("roots", nargs="*", default=DEFAULT_ROOTS,
+                        help=f"Directories to search for .xcassets (default: {', '.join(DEFAULT_ROOTS)})")
+    parser.add_argument("--output", "-o", help="Write the report to a file instead of stdout")
+    add_jobs_argument(parser)
+    args = parser.parse_args()
+
+    out = open(args.output, 'w') if args.output else sys.stdout
+    counts = {'records': 0, 'images': 0, 'errors': 0, 'warnings': 0, 'duplicates': 0}
+    try:
+        for record in audit(args.roots, jobs=args.jobs):
+            counts['records'] += 1
+            if record['type'] == 'image':
+                counts['images'] += 1
+            if 'duplicate_of' in record:
+                counts['duplicates'] += 1
+            for issue in record['issues']:
+                counts['errors' if issue in ERRORS else 'warnings'] += 1
+            out.write(json.dumps(record, sort_keys=True) + '\n')
+            out.flush()
+        out.write(json.dumps({'type': 'summary', **counts}, sort_keys=True) + '\n')
+    finally:
+        if args.output:
+            out.close()
+
+    return 1 if counts['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Vectorized dominant background color detection for icons.
+
+Pixels from the chosen sample regions (center, corners, perimeter ring) are
+packed into uint32 keys and counted with np.bincount (small, quantized
+domains) or np.unique (full 24-bit color), so finding the most common colors
+never builds or sorts a Python list of every distinct color. Optional coarse
+quantization groups near-identical shades of noisy gradients together.
+
+Usage:
+    python3 scripts/background_color.py <image> [--regions center,corners,perimeter] [--top 5] [--quantize 3]
+"""
+
+import sys
+import argparse
+import numpy as np
+
+REGIONS = ('center', 'corners', 'perimeter')
+
+# np.bincount is used when the packed key space is at most this large
+BINCOUNT_LIMIT = 1 << 18
+
+
+def _center(data, size):
+    height, width = data.shape[:2]
+    # At least one pixel, and no larger than the image
+    size = max(1, min(size, height, width))
+    top, left = (height - size) // 2, (width - size) // 2
+    return [data[top:top + size, left:left + size]]
+
+
+def _corners(data, size):
+    return [
+        data[:size, :size],
+        data[:size, -size:],
+        data[-size:, :size],
+        data[-size:, -size:],
+    ]
+
+
+def _perimeter(data, size):
+    ring = max(1, size // 4)
+    return [
+        data[:ring, :],                 # Top band
+        data[-ring:, :],                # Bottom band
+        data[ring:-ring, :ring],        # Left band (without corners counted twice)
+        data[ring:-ring, -ring:],       # Right band
+    ]
+
+
+_REGION_FUNCS = {'center': _center, 'corners': _corners, 'perimeter': _perimeter}
+
+
+def sample_pixels(data, regions=('center',), sample_size=None):
+    """
+    Collect the pixels of the requested regions as an (N, C) array.
+
+    Args:
+        data: uint8 array of shape (H, W, 3) or (H, W, 4)
+        regions: Iterable of names from REGIONS
+        sample_size: Edge length of the center/corner squares (and 4x the
+            perimeter ring width); defaults to min(100, W // 4, H // 4)
+
+    Returns:
+        uint8 array of shape (N, C)
+    """
+    height, width = data.shape[:2]
+    if sample_size is None:
+        sample_size = min(100, width // 4, height // 4)
+    sample_size = max(1, sample_size)
+
+    parts = []
+    for region in regions:
+        if region not in _REGION_FUNCS:
+            raise ValueError(f"unknown region '{region}' (available: {', '.join(REGIONS)})")
+        parts.extend(p.reshape(-1, data.shape[2]) for p in _REGION_FUNCS[region](data, sample_size) if p.size)
+    if not parts:
+        return np.empty((0, data.shape[2]), dtype=np.uint8)
+    return np.concatenate(parts)
+
+
+def pack_rgb(pixels, quantize=0):
+    """
+    Pack RGB pixels into uint32 keys, dropping `quantize` low bits per channel.
+
+    Args:
+        pixels: uint8 array of shape (N, >=3)
+        quantize: Bits to drop per channel (0-7)
+
+    Returns:
+        (keys, bits per channel)
+    """
+    bits = 8 - quantize
+    rgb = pixels[:, :3].astype(np.uint32) >> quantize
+    return (rgb[:, 0] << (2 * bits)) | (rgb[:, 1] << bits) | rgb[:, 2], bits
+
+
+def dominant_colors(data, regions=('center',), top_k=1, quantize=0, sample_size=None,
+                    ignore_transparent=True):
+    """
+    Find the most common colors in the sampled regions.
+
+    Args:
+        data: uint8 RGB or RGBA array
+        regions: Sample regions (see REGIONS)
+        top_k: Number of colors to return
+        quantize: Bits dropped per channel before counting (0 = exact colors);
+            quantized results report the mean color of each bucket
+        sample_size: See sample_pixels
+        ignore_transparent: Skip pixels whose alpha is 0 (their RGB is
+            meaningless)
+
+    Returns:
+        List of (RGB tuple, share of sampled pixels) pairs, most common first
+    """
+    pixels = sample_pixels(data, regions, sample_size)
+    if ignore_transparent and pixels.shape[1] == 4:
+        pixels = pixels[pixels[:, 3] > 0]
+    if len(pixels) == 0:
+        return []
+
+    keys, bits = pack_rgb(pixels, quantize)
+    domain = 1 << (3 * bits)
+
+    if domain <= BINCOUNT_LIMIT:
+        # Small key space: count straight into a dense histogram
+        bucket_counts = np.bincount(keys, minlength=domain)
+        index = keys
+    else:
+        bucket_keys, index, bucket_counts = np.unique(keys, return_inverse=True, return_counts=True)
+
+    k = min(top_k, int(np.count_nonzero(bucket_counts)))
+    top = np.argpartition(-bucket_counts, k - 1)[:k]
+    top = top[np.argsort(-bucket_counts[top], kind='stable')]
+    top_keys = top if domain <= BINCOUNT_LIMIT else bucket_keys[top]
+
+    if quantize:
+        # Report each bucket's mean color rather than its corner value
+        sums = [np.bincount(index, weights=pixels[:, c], minlength=len(bucket_counts))[top] for c in range(3)]
+        colors = [tuple(int(round(sums[c][n] / bucket_counts[i])) for c in range(3)) for n, i in enumerate(top)]
+    else:
+        mask = (1 << bits) - 1
+        colors = [(int(key >> (2 * bits)), int((key >> bits) & mask), int(key & mask)) for key in top_keys]
+
+    total = float(len(pixels))
+    return [(color, int(bucket_counts[i]) / total) for color, i in zip(colors, top)]
+
+
+def detect_background_color(data, regions=('perimeter', 'center'), quantize=0, default=(255, 255, 255)):
+    """
+    Return the single most common color in the sampled regions.
+
+    Regions are tried in order; the first one that has any non-transparent
+    pixels decides. Falls back to `default` when nothing can be sampled.
+    """
+    for region in regions:
+        colors = dominant_colors(data, regions=(region,), top_k=1, quantize=quantize)
+        if colors:
+            return colors[0][0]
+    return tuple(default)
+
+
+def main():
+    from PIL import Image
+
+    parser = argparse.ArgumentParser(description="Report the dominant colors of an image's sample regions")
+    parser.add_argument("image", help="Path to image")
+    parser.add_argument("--regions", default="center", help=f"Comma-separated regions ({', '.join(REGIONS)})")
+    parser.add_argument("--top", type=int, default=5, help="Number of colors to report (default 5)")
+    parser.add_argument("--quantize", type=int, default=0, choices=range(0, 8), help="Low bits dropped per channel")
+    args = parser.parse_args()
+
+    with Image.open(args.image) as img:
+        data = np.array(img.convert('RGBA'))
+
+    regions = [r.strip() for r in args.regions.split(',') if r.strip()]
+    for color, share in dominant_colors(data, regions, top_k=args.top, quantize=args.quantize):
+        print(f"  {color}  {share * 100:5.1f}%")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Shared scaffolding of the benchmark scripts (bench_project_sync.py,
+bench_icons.py).
+
+A benchmark measures each case in a fresh worker process (run_worker),
+collects the results into one JSON document (environment() gives the
+common header) and hands it to finish(), which:
+
+- compares every timing with the --baseline results and reports each one
+  slower by more than --tolerance, ignoring differences below the
+  benchmark's noise floor
+- writes the results to --output, except over the baseline it was just
+  compared with when that comparison found regressions
+
+The benchmark itself only says which timings correspond, through a pairs()
+function yielding (label, seconds now, seconds in the baseline).
+"""
+
+import os
+import sys
+import json
+import platform
+import subprocess
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def add_arguments(parser, default_output, default_tolerance, unit):
+    """
+    Add --output/-o, --baseline and --tolerance to an argparse parser.
+
+    Args:
+        default_output: Results file written by default
+        default_tolerance: Allowed slowdown as a fraction (0.25 = 25%)
+        unit: What one timing is, for the help text ("stage", "case")
+    """
+    parser.add_argument("--output", "-o", default=default_output,
+                        help=f"Write the results here (default: {os.path.relpath(default_output, REPO_DIR)})")
+    parser.add_argument("--baseline", help="Compare with earlier results and fail on regressions")
+    parser.add_argument("--tolerance", type=float, default=default_tolerance,
+                        help=f"Allowed slowdown per {unit} with --baseline (default: {default_tolerance})")
+
+
+def environment(**fields):
+    """Header of a results document: interpreter, platform and `fields`."""
+    return {'python': platform.python_version(), 'platform': platform.platform(), **fields}
+
+
+def run_worker(script, *args):
+    """Run `script --worker ...` in a fresh interpreter and return its JSON output."""
+    result = subprocess.run([sys.executable, os.path.abspath(script), '--worker', *map(str, args)],
+                            stdout=subprocess.PIPE, check=True, text=True)
+    return json.loads(result.stdout)
+
+
+def compare(pairs, tolerance, min_regression, format_seconds):
+    """
+    Report timings slower than their baseline by more than `tolerance`.
+
+    Args:
+        pairs: Iterable of (label, seconds now, seconds in the baseline)
+        tolerance: Allowed slowdown as a fraction
+        min_regression: Differences below this many seconds are noise
+        format_seconds: Renders a timing for the report (e.g. as ms)
+
+    Returns:
+        Number of regressions
+    """
+    regressions = 0
+    for label, now, before in pairs:
+        if now > before * (1 + tolerance) and now - before > min_regression:
+            regressions += 1
+            print(f"⚠️  {label}: {format_seconds(before)} → {format_seconds(now)} "
+                  f"(+{(now / before - 1) * 100:.0f}%)")
+    return regressions
+
+
+def write_results(results, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+        f.write('\n')
+    print(f"\n📝 Results written to {path}")
+
+
+def finish(results, args, pairs, min_regression, format_seconds, unit):
+    """
+    Compare with --baseline (if given) and write --output.
+
+    Args:
+        results: Results document
+        args: Parsed arguments from a parser set up by add_arguments()
+        pairs: Called as pairs(results, baseline); yields what compare() takes
+        min_regression, format_seconds: As for compare()
+        unit: What one timing is, for the report ("stage", "case")
+
+    Returns:
+        Number of regressions
+    """
+    regressions = 0
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(pairs(results, baseline), args.tolerance, min_regression, format_seconds)
+        if not regressions:
+            print(f"\n✅ No {unit} slower than {args.baseline} by more than {args.tolerance:.0%}")
+
+    if regressions and args.baseline and os.path.abspath(args.baseline) == os.path.abspath(args.output):
+        print(f"\n⏭ Not overwriting the baseline {args.output} with regressed results")
+    elif args.output:
+        write_results(results, args.output)
+    return regressions
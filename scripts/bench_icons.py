@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the icon-processing scripts on synthetic catalogs.
+
+Generates .appiconset directories and runs each operation over them:
+
+- remove_alpha_channel: fix_app_store_icons.process_icon_set (in place)
+- remove_white_border: remove_icon_border.process_icon_set
+- remove_edge_border: remove_edge_border.process_icon_set
+- fix_icon_edges: analyze_and_fix_icon.fix_icon_edges on every file
+
+Images cycle through RGBA, P and LA, each with and without an alpha
+border (a transparent margin inside a thin white ring, which is what the
+border scripts remove), at sizes from the catalog's size list. The default
+catalogs cover the real slot sizes (20 images, 48-1024 px), large masters
+(20 images, 1024-4096 px) and a bulk catalog (2000 small images).
+
+Every (catalog, operation, job count) runs in a fresh process, which
+reports:
+
+- seconds: wall time of the best run
+- files, files_per_s: output files and files per second of that run
+- latency_ms: mean, p50 and p95 of the per-file decode/process/encode
+  time (apply_pipeline; files copied unchanged by fix_icon_edges are
+  counted in files but not in latency or decoded)
+- peak_rss_mb / peak_worker_rss_mb: peak RSS of the process and of its
+  --jobs worker processes
+- bytes_read / output_bytes: input read and PNG bytes written
+
+Results are written as JSON; with --baseline, runs that got slower than
+the tolerance allows are reported and the exit status is non-zero.
+
+Usage:
+    python3 scripts/bench_icons.py [--catalogs slots large bulk] [--jobs 1 4] [-o results.json]
+    python3 scripts/bench_icons.py --operations remove_alpha_channel --catalogs slots --repeat 5
+    python3 scripts/bench_icons.py --baseline scripts/benchmarks/icons.json
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+
+import bench_harness
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+BENCH_DIR = os.path.join(SCRIPT_DIR, 'benchmarks')
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, 'icons.json')
+
+DEFAULT_JOBS = (1, 2)
+DEFAULT_REPEAT = 2
+DEFAULT_TOLERANCE = 0.25
+# Differences below this many seconds are noise, not regressions
+MIN_REGRESSION = 0.05
+
+MODES = ('RGBA', 'P', 'LA')
+OPERATIONS = ('remove_alpha_channel', 'remove_white_border', 'remove_edge_border', 'fix_icon_edges')
+# Stage timed once per file by every operation
+FILE_STAGE = 'apply_pipeline'
+
+SLOT_SIZES = (40, 48, 55, 58, 60, 66, 80, 87, 88, 92, 100, 102, 120, 152, 167, 172, 180, 196, 216, 1024)
+
+# name -> (number of images, pixel sizes cycled over)
+CATALOGS = {
+    'slots': (20, SLOT_SIZES[1:]),
+    'large': (20, (1024, 2048, 3072, 4096)),
+    'bulk': (2000, tuple(size for size in SLOT_SIZES[1:] if size <= 216)),
+}
+
+
+def render(size, mode, border, index):
+    """
+    Draw one synthetic icon.
+
+    A diagonal gradient with a disc on top; with `border`, the artwork sits
+    inside a transparent margin ringed by near-white pixels.
+    """
+    from PIL import Image, ImageDraw
+
+    hue = (index * 37) % 256
+    gradient = Image.linear_gradient('L').resize((size, size)).rotate(45 + index % 4 * 90)
+    icon = Image.merge('RGB', (gradient.point(lambda v: (v + hue) % 256),
+                               gradient.point(lambda v: 255 - v // 2),
+                               Image.new('L', (size, size), hue // 2)))
+    draw = ImageDraw.Draw(icon)
+    inset = size // 4
+    draw.ellipse((inset, inset, size - inset, size - inset), fill=(250, 250, 255 - hue // 4))
+    icon = icon.convert('RGBA')
+
+    if border:
+        margin = max(2, size // 16)
+        ring = max(1, size // 128)
+        canvas = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+        inner = icon.resize((size - 2 * margin, size - 2 * margin))
+        canvas.paste(inner, (margin, margin))
+        ImageDraw.Draw(canvas).rectangle((margin - ring, margin - ring, size - margin + ring - 1,
+                                          size - margin + ring - 1), outline=(252, 252, 252, 255), width=ring)
+        icon = canvas
+
+    if mode == 'LA':
+        return icon.convert('LA')
+    if mode == 'P':
+        source = icon if border else icon.convert('RGB')
+        return source.quantize(colors=128, method=Image.Quantize.FASTOCTREE)
+    return icon
+
+
+def generate(directory, images, sizes):
+    """
+    Create a synthetic .appiconset with `images` icons in `directory`.
+
+    Returns:
+        Dict describing the catalog (images, sizes, modes, bytes)
+    """
+    os.makedirs(directory, exist_ok=True)
+    entries = []
+    total = 0
+    for index in range(images):
+        size = sizes[index % len(sizes)]
+        mode = MODES[index % len(MODES)]
+        border = index // len(MODES) % 2 == 0
+        filename = f"icon_{index:04d}_{size}_{mode}{'_border' if border else ''}.png"
+        path = os.path.join(directory, filename)
+        render(size, mode, border, index).save(path)
+        total += os.path.getsize(path)
+        entries.append({'filename': filename, 'idiom': 'universal', 'platform': 'ios',
+                        'size': f"{size}x{size}", 'scale': '1x'})
+    with open(os.path.join(directory, 'Contents.json'), 'w', encoding='utf-8') as f:
+        json.dump({'images': entries, 'info': {'author': 'xcode', 'version': 1}}, f, indent=2)
+    return {
+        'images': images,
+        'sizes': [min(sizes), max(sizes)],
+        'modes': list(MODES),
+        'bytes': total,
+    }
+
+
+def run_operation(operation, catalog, output, jobs):
+    """
+    Run one operation over `catalog`, writing to `output`.
+
+    remove_alpha_channel works in place, so `catalog` must be a scratch
+    copy for it.
+
+    Returns:
+        True if every file was processed
+    """
+    if operation == 'remove_alpha_channel':
+        import fix_app_store_icons
+        return fix_app_store_icons.process_icon_set(catalog, jobs=jobs, use_cache=False)
+    if operation == 'remove_white_border':
+        import remove_icon_border
+        return remove_icon_border.process_icon_set(catalog, output, jobs=jobs, use_cache=False)
+    if operation == 'remove_edge_border':
+        import remove_edge_border
+        return remove_edge_border.process_icon_set(catalog, output, jobs=jobs, use_cache=False)
+
+    from analyze_and_fix_icon import fix_icon_edges
+    from icon_jobs import run_jobs
+
+    os.makedirs(output, exist_ok=True)
+    tasks = [(os.path.join(catalog, name), os.path.join(output, name))
+             for name in sorted(os.listdir(catalog)) if name.endswith('.png')]
+    return all(not outcome['error'] for _, outcome in run_jobs(fix_icon_edges, tasks, jobs))
+
+
+def peak_rss_kib():
+    """
+    Peak RSS of this process image in KiB, or None where unavailable.
+
+    Linux carries ru_maxrss over execve, so a worker started by the parent
+    would report the parent's peak (it held the generated catalogs);
+    VmHWM starts fresh.
+    """
+    try:
+        with open('/proc/self/status', 'r', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def measure(catalog, operation, jobs, repeat):
+    """
+    Time `operation` over `catalog` `repeat` times; the best run counts.
+
+    Runs in a worker process started by run_case(). Every run works on a
+    fresh copy of the catalog (made outside the timed region).
+
+    Returns:
+        Dict of the measurements listed in the module docstring
+    """
+    import resource
+    from contextlib import redirect_stdout
+    import stage_timing
+
+    best = None
+    for _ in range(repeat):
+        scratch = tempfile.mkdtemp(prefix='bench-icons-run-')
+        try:
+            work = os.path.join(scratch, 'AppIcon.appiconset')
+            shutil.copytree(catalog, work)
+            output = work if operation == 'remove_alpha_channel' else os.path.join(scratch, 'output')
+
+            stage_timing.stats.reset()
+            stage_timing.configure(True, trace=True)
+            with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+                started = time.perf_counter()
+                ok = run_operation(operation, work, output, jobs)
+                seconds = time.perf_counter() - started
+            stage_timing.configure(False)
+
+            outputs = [name for name in os.listdir(output) if name.endswith('.png')]
+            latencies = [duration / 1000 for name, _, duration, _, _ in stage_timing.stats.events if name == FILE_STAGE]
+            run = {
+                'ok': bool(ok),
+                'seconds': seconds,
+                'files': len(outputs),
+                'decoded': len(latencies),
+                'latencies': latencies,
+                'bytes_read': stage_timing.stats.counters.get('bytes_read', 0),
+                'output_bytes': sum(os.path.getsize(os.path.join(output, name)) for name in outputs),
+            }
+        finally:
+            shutil.rmtree(scratch, ignore_errors=True)
+        if best is None or run['seconds'] < best['seconds']:
+            best = run
+
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    scale = 2**20 if sys.platform == 'darwin' else 2**10
+    latencies = best.pop('latencies') or [0.0]
+    own_rss = peak_rss_kib()
+    return dict(
+        best,
+        seconds=round(best['seconds'], 4),
+        files_per_s=round(best['files'] / best['seconds'], 1) if best['seconds'] else 0.0,
+        latency_ms={'mean': round(sum(latencies) / len(latencies), 3),
+                    'p50': round(percentile(latencies, 0.5), 3),
+                    'p95': round(percentile(latencies, 0.95), 3)},
+        peak_rss_mb=round(own_rss / 2**10 if own_rss else resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1),
+        peak_worker_rss_mb=round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale, 1),
+    )
+
+
+def run_case(catalog, operation, jobs, repeat):
+    """Measure one (operation, job count) over `catalog` in a fresh process."""
+    return bench_harness.run_worker(__file__, catalog, '--operations', operation, '--jobs', jobs, '--repeat', repeat)
+
+
+def regression_pairs(results, baseline):
+    """(label, seconds now, seconds in the baseline) per catalog, operation and job count."""
+    for name, catalog in results['catalogs'].items():
+        previous_catalog = baseline.get('catalogs', {}).get(name)
+        if not previous_catalog or previous_catalog.get('images') != catalog['images']:
+            continue
+        for operation, runs in catalog['operations'].items():
+            for jobs, current in runs.items():
+                previous = previous_catalog.get('operations', {}).get(operation, {}).get(jobs)
+                if previous:
+                    yield f"{name}, {operation}, {jobs} job(s)", current['seconds'], previous['seconds']
+
+
+def print_table(results):
+    print(f"\n{'catalog':<8}{'operation':<22}{'jobs':>5}{'seconds':>9}{'files/s':>9}"
+          f"{'p50 ms':>9}{'p95 ms':>9}{'rss MB':>8}{'out KB':>10}")
+    for name, catalog in results['catalogs'].items():
+        for operation, runs in catalog['operations'].items():
+            for jobs, info in runs.items():
+                rss = max(info['peak_rss_mb'], info['peak_worker_rss_mb'])
+                print(f"{name:<8}{operation:<22}{jobs:>5}{info['seconds']:9.2f}{info['files_per_s']:9.1f}"
+                      f"{info['latency_ms']['p50']:9.2f}{info['latency_ms']['p95']:9.2f}{rss:8.1f}"
+                      f"{info['output_bytes'] / 1024:10.0f}")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the icon-processing scripts on synthetic catalogs")
+    parser.add_argument("--catalogs", nargs="+", choices=list(CATALOGS), default=list(CATALOGS),
+                        help="Synthetic catalogs to run (default: all)")
+    parser.add_argument("--images", type=int, help="Override the number of images in every catalog")
+    parser.add_argument("--operations", nargs="+", choices=OPERATIONS, default=list(OPERATIONS),
+                        help="Operations to run (default: all)")
+    parser.add_argument("--jobs", type=int, nargs="+", default=list(DEFAULT_JOBS),
+                        help="Worker counts to run every operation with (default: 1 2)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help=f"Timed runs per case; the best is kept (default: {DEFAULT_REPEAT})")
+    bench_harness.add_arguments(parser, DEFAULT_OUTPUT, DEFAULT_TOLERANCE, 'case')
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    sys.path.insert(0, SCRIPT_DIR)
+
+    if args.worker:
+        json.dump(measure(args.worker, args.operations[0], args.jobs[0], args.repeat), sys.stdout)
+        return 0
+
+    results = bench_harness.environment(cpus=os.cpu_count(), repeat=args.repeat, catalogs={})
+    ok = True
+    root = tempfile.mkdtemp(prefix='bench-icons-')
+    try:
+        for name in args.catalogs:
+            images, sizes = CATALOGS[name]
+            images = args.images or images
+            print(f"⏱  {name}: generating {images} icons ({min(sizes)}-{max(sizes)} px)...", flush=True)
+            catalog = os.path.join(root, name, 'AppIcon.appiconset')
+            info = generate(catalog, images, sizes)
+            info['operations'] = {}
+            results['catalogs'][name] = info
+            for operation in args.operations:
+                runs = info['operations'][operation] = {}
+                for jobs in args.jobs:
+                    print(f"   {operation}, {jobs} job(s)...", flush=True)
+                    run = runs[str(jobs)] = run_case(catalog, operation, jobs, args.repeat)
+                    if not run['ok'] or run['files'] != images:
+                        print(f"❌ {name}, {operation}, {jobs} job(s): "
+                              f"processed {run['files']} of {images} file(s)")
+                        ok = False
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    print_table(results)
+
+    regressions = bench_harness.finish(results, args, regression_pairs, MIN_REGRESSION,
+                                       lambda seconds: f"{seconds:.2f}s", 'case')
+    return 0 if ok and not regressions else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
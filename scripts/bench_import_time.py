@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Import-time budget for the plena-tools commands.
+
+The project commands run on every Xcode build (through the build-phase
+hook), so their startup cost is budgeted. For each command, a fresh
+interpreter runs `python -X importtime` and imports plena_tools plus the
+command's module without running it. The self times of every module that
+a bare interpreter doesn't already import are summed, and the median of
+several runs is compared with the command's budget.
+
+Independently of timing, PIL and NumPy must not be imported on the
+project path at all.
+
+Usage:
+    python3 scripts/bench_import_time.py [--runs N] [--command "project sync" ...]
+    python3 scripts/bench_import_time.py --command "icons fix" --top 10
+"""
+
+import os
+import sys
+import argparse
+import subprocess
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Milliseconds of module imports on top of a bare interpreter
+BUDGETS = {
+    'project hook': 10.0,
+    'project sync': 40.0,
+    'project check': 40.0,
+}
+
+# Modules that must never be imported by the budgeted commands
+FORBIDDEN = ('PIL', 'numpy')
+
+DEFAULT_RUNS = 7
+
+
+def import_times(code):
+    """
+    Run `code` in a fresh interpreter under -X importtime.
+
+    Returns:
+        Dict mapping module name -> self time in microseconds
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # header line
+        times[fields[2].strip()] = times.get(fields[2].strip(), 0) + int(fields[0])
+    return times
+
+
+def measure(command, runs):
+    """
+    Import cost of one plena-tools command.
+
+    Returns:
+        (median milliseconds, {module: median self microseconds})
+    """
+    words = tuple(command.split())
+    code = (f"import sys; sys.path.insert(0, {SCRIPT_DIR!r}); "
+            f"import plena_tools; plena_tools.load({words!r})")
+    baseline = set(import_times('pass'))
+    samples = []
+    for _ in range(runs):
+        times = {name: us for name, us in import_times(code).items() if name not in baseline}
+        samples.append(times)
+    totals = sorted(sum(times.values()) for times in samples)
+    modules = {}
+    for name in samples[0]:
+        values = sorted(times.get(name, 0) for times in samples)
+        modules[name] = values[len(values) // 2]
+    return totals[len(totals) // 2] / 1000, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check plena-tools commands against their import-time budget")
+    parser.add_argument("--command", action="append",
+                        help="Command to measure, e.g. \"project sync\" (default: every budgeted command)")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS,
+                        help=f"Interpreter runs per command; the median counts (default: {DEFAULT_RUNS})")
+    parser.add_argument("--top", type=int, default=5, help="Slowest modules to list per command (default: 5)")
+    args = parser.parse_args()
+
+    sys.path.insert(0, SCRIPT_DIR)
+    from plena_tools import COMMANDS
+
+    commands = args.command or list(BUDGETS)
+    failures = 0
+    for command in commands:
+        if tuple(command.split()) not in COMMANDS:
+            print(f"❌ Unknown command: {command}")
+            failures += 1
+            continue
+        total, modules = measure(command, args.runs)
+        budget = BUDGETS.get(command)
+        forbidden = sorted(name for name in modules if name.split('.')[0] in FORBIDDEN)
+
+        if forbidden and budget is not None:
+            print(f"❌ {command}: imports {', '.join(forbidden[:3])}")
+            failures += 1
+        elif budget is not None and total > budget:
+            print(f"❌ {command}: {total:.1f} ms of imports (budget {budget:.0f} ms)")
+            failures += 1
+        elif budget is not None:
+            print(f"✅ {command}: {total:.1f} ms of imports (budget {budget:.0f} ms)")
+        else:
+            print(f"⏱ {command}: {total:.1f} ms of imports (no budget)")
+        print(f"   {len(modules)} module(s); slowest:")
+        for name, us in sorted(modules.items(), key=lambda item: -item[1])[:args.top]:
+            print(f"   {us / 1000:7.2f} ms  {name}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
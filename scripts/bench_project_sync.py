@@ -0,0 +1,730 @@
+#!/usr/bin/env python3
+"""
+Benchmark and golden checks for the project sync pipeline.
+
+Generates synthetic Xcode projects with a matching on-disk Swift tree and
+times each stage of a reconcile run on its own:
+
+- scan: walk the source roots (source_scanner.scan)
+- parse: read and parse project.pbxproj (PBXProject)
+- diff: resolve the group tree, index target membership and plan the
+  changeset (ProjectTree, TargetIndex, project_reconcile.plan)
+- apply: apply the changeset to the object graph in one batch
+- write: splice the edits into the text and replace the file atomically
+
+Each project has N file references in a deep group tree spread over three
+source roots and two app targets. Before the run, about 1% of N files are
+added on disk (some in new folders), removed and moved, so every kind of
+edit is exercised. Every size runs in a fresh process, which reports its
+peak RSS; an extra, untimed pass under tracemalloc records the peak Python
+allocation of each stage.
+
+Golden checks:
+
+- the spliced output of every run must equal a full re-render of the
+  edited graph in Xcode's layout (sections sorted by isa, objects by ID)
+- a small project with seeded object IDs is generated, edited, and compared
+  byte for byte with scripts/benchmarks/golden/project.*.pbxproj
+- golden/Plena.snapshot.pbxproj is a copy of this app's project.pbxproj (so
+  the check doesn't move with the live project): it must round-trip byte for
+  byte, and adding files to it must leave every line outside the modified
+  objects as is, matching golden/Plena.snapshot.after.pbxproj
+
+All golden files are regression snapshots: the expected outputs are written
+by this tooling (--update-golden), so they catch changes in its own output,
+not differences from what Xcode would write for the same edit.
+
+Results are written as JSON; with --baseline, stages that got slower than
+the tolerance allows are reported and the exit status is non-zero.
+
+Usage:
+    python3 scripts/bench_project_sync.py [--sizes 1000 10000 50000] [-o results.json]
+    python3 scripts/bench_project_sync.py --baseline scripts/benchmarks/project_sync.json
+    python3 scripts/bench_project_sync.py --golden-only [--update-golden]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import tempfile
+import posixpath
+
+import bench_harness
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+BENCH_DIR = os.path.join(SCRIPT_DIR, 'benchmarks')
+GOLDEN_DIR = os.path.join(BENCH_DIR, 'golden')
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, 'project_sync.json')
+
+DEFAULT_SIZES = (1000, 10000, 50000)
+DEFAULT_DEPTH = 6
+DEFAULT_REPEAT = 3
+DEFAULT_TOLERANCE = 0.25
+# Differences below this many seconds are noise, not regressions
+MIN_REGRESSION = 0.005
+
+STAGES = ('scan', 'parse', 'diff', 'apply', 'write')
+ROOTS = ('App', 'Shared', 'Watch')
+FILES_PER_GROUP = 16
+PROJECT_FILE = 'Bench.xcodeproj/project.pbxproj'
+
+# (path prefix, targets), as in project_targets.DEFAULT_RULES
+RULES = [
+    ('Shared/', ['@application']),
+    ('Watch/', ['BenchWatch']),
+    ('App/', ['Bench']),
+]
+
+GOLDEN_SIZE = 48
+GOLDEN_DEPTH = 3
+GOLDEN_SEED = 20
+
+PROJECT_SNAPSHOT = 'Plena.snapshot'
+# Files added to the project snapshot: existing groups of both app
+# targets and shared code, and a folder that needs a new group
+PROJECT_SNAPSHOT_FILES = (
+    'Plena/Views/GoldenView.swift',
+    'PlenaShared/Services/GoldenService.swift',
+    'Plena Watch App/Golden/GoldenWatchView.swift',
+)
+
+# Two app targets with Sources phases and three top-level source groups,
+# in Xcode's layout; the generator adds groups, files and build files
+TEMPLATE = """// !$*UTF8*$!
+{
+	archiveVersion = 1;
+	classes = {
+	};
+	objectVersion = 77;
+	objects = {
+
+/* Begin PBXFileReference section */
+		BE0000000000000000000011 /* Bench.app */ = {isa = PBXFileReference; explicitFileType = wrapper.application; includeInIndex = 0; path = Bench.app; sourceTree = BUILT_PRODUCTS_DIR; };
+		BE0000000000000000000012 /* BenchWatch.app */ = {isa = PBXFileReference; explicitFileType = wrapper.application; includeInIndex = 0; path = BenchWatch.app; sourceTree = BUILT_PRODUCTS_DIR; };
+/* End PBXFileReference section */
+
+/* Begin PBXGroup section */
+		BE0000000000000000000001 = {
+			isa = PBXGroup;
+			children = (
+				BE0000000000000000000002 /* App */,
+				BE0000000000000000000003 /* Shared */,
+				BE0000000000000000000004 /* Watch */,
+				BE0000000000000000000005 /* Products */,
+			);
+			sourceTree = "<group>";
+		};
+		BE0000000000000000000002 /* App */ = {
+			isa = PBXGroup;
+			children = (
+			);
+			path = App;
+			sourceTree = "<group>";
+		};
+		BE0000000000000000000003 /* Shared */ = {
+			isa = PBXGroup;
+			children = (
+			);
+			path = Shared;
+			sourceTree = "<group>";
+		};
+		BE0000000000000000000004 /* Watch */ = {
+			isa = PBXGroup;
+			children = (
+			);
+			path = Watch;
+			sourceTree = "<group>";
+		};
+		BE0000000000000000000005 /* Products */ = {
+			isa = PBXGroup;
+			children = (
+				BE0000000000000000000011 /* Bench.app */,
+				BE0000000000000000000012 /* BenchWatch.app */,
+			);
+			name = Products;
+			sourceTree = "<group>";
+		};
+/* End PBXGroup section */
+
+/* Begin PBXNativeTarget section */
+		BE0000000000000000000021 /* Bench */ = {
+			isa = PBXNativeTarget;
+			buildConfigurationList = BE0000000000000000000042 /* Build configuration list for PBXNativeTarget "Bench" */;
+			buildPhases = (
+				BE0000000000000000000031 /* Sources */,
+			);
+			buildRules = (
+			);
+			dependencies = (
+			);
+			name = Bench;
+			productName = Bench;
+			productReference = BE0000000000000000000011 /* Bench.app */;
+			productType = "com.apple.product-type.application";
+		};
+		BE0000000000000000000022 /* BenchWatch */ = {
+			isa = PBXNativeTarget;
+			buildConfigurationList = BE0000000000000000000043 /* Build configuration list for PBXNativeTarget "BenchWatch" */;
+			buildPhases = (
+				BE0000000000000000000032 /* Sources */,
+			);
+			buildRules = (
+			);
+			dependencies = (
+			);
+			name = BenchWatch;
+			productName = BenchWatch;
+			productReference = BE0000000000000000000012 /* BenchWatch.app */;
+			productType = "com.apple.product-type.application";
+		};
+/* End PBXNativeTarget section */
+
+/* Begin PBXProject section */
+		BE0000000000000000000010 /* Project object */ = {
+			isa = PBXProject;
+			attributes = {
+				BuildIndependentTargetsInParallel = 1;
+				LastSwiftUpdateCheck = 1600;
+				LastUpgradeCheck = 1600;
+			};
+			buildConfigurationList = BE0000000000000000000041 /* Build configuration list for PBXProject "Bench" */;
+			developmentRegion = en;
+			hasScannedForEncodings = 0;
+			knownRegions = (
+				en,
+				Base,
+			);
+			mainGroup = BE0000000000000000000001;
+			minimizedProjectReferenceProxies = 1;
+			preferredProjectObjectVersion = 77;
+			productRefGroup = BE0000000000000000000005 /* Products */;
+			projectDirPath = "";
+			projectRoot = "";
+			targets = (
+				BE0000000000000000000021 /* Bench */,
+				BE0000000000000000000022 /* BenchWatch */,
+			);
+		};
+/* End PBXProject section */
+
+/* Begin PBXSourcesBuildPhase section */
+		BE0000000000000000000031 /* Sources */ = {
+			isa = PBXSourcesBuildPhase;
+			buildActionMask = 2147483647;
+			files = (
+			);
+			runOnlyForDeploymentPostprocessing = 0;
+		};
+		BE0000000000000000000032 /* Sources */ = {
+			isa = PBXSourcesBuildPhase;
+			buildActionMask = 2147483647;
+			files = (
+			);
+			runOnlyForDeploymentPostprocessing = 0;
+		};
+/* End PBXSourcesBuildPhase section */
+
+/* Begin XCBuildConfiguration section */
+		BE0000000000000000000051 /* Debug */ = {
+			isa = XCBuildConfiguration;
+			buildSettings = {
+				SDKROOT = iphoneos;
+			};
+			name = Debug;
+		};
+		BE0000000000000000000052 /* Release */ = {
+			isa = XCBuildConfiguration;
+			buildSettings = {
+				SDKROOT = iphoneos;
+			};
+			name = Release;
+		};
+		BE0000000000000000000053 /* Debug */ = {
+			isa = XCBuildConfiguration;
+			buildSettings = {
+				PRODUCT_NAME = "$(TARGET_NAME)";
+			};
+			name = Debug;
+		};
+		BE0000000000000000000054 /* Release */ = {
+			isa = XCBuildConfiguration;
+			buildSettings = {
+				PRODUCT_NAME = "$(TARGET_NAME)";
+			};
+			name = Release;
+		};
+		BE0000000000000000000055 /* Debug */ = {
+			isa = XCBuildConfiguration;
+			buildSettings = {
+				PRODUCT_NAME = "$(TARGET_NAME)";
+				SDKROOT = watchos;
+			};
+			name = Debug;
+		};
+		BE0000000000000000000056 /* Release */ = {
+			isa = XCBuildConfiguration;
+			buildSettings = {
+				PRODUCT_NAME = "$(TARGET_NAME)";
+				SDKROOT = watchos;
+			};
+			name = Release;
+		};
+/* End XCBuildConfiguration section */
+
+/* Begin XCConfigurationList section */
+		BE0000000000000000000041 /* Build configuration list for PBXProject "Bench" */ = {
+			isa = XCConfigurationList;
+			buildConfigurations = (
+				BE0000000000000000000051 /* Debug */,
+				BE0000000000000000000052 /* Release */,
+			);
+			defaultConfigurationIsVisible = 0;
+			defaultConfigurationName = Release;
+		};
+		BE0000000000000000000042 /* Build configuration list for PBXNativeTarget "Bench" */ = {
+			isa = XCConfigurationList;
+			buildConfigurations = (
+				BE0000000000000000000053 /* Debug */,
+				BE0000000000000000000054 /* Release */,
+			);
+			defaultConfigurationIsVisible = 0;
+			defaultConfigurationName = Release;
+		};
+		BE0000000000000000000043 /* Build configuration list for PBXNativeTarget "BenchWatch" */ = {
+			isa = XCConfigurationList;
+			buildConfigurations = (
+				BE0000000000000000000055 /* Debug */,
+				BE0000000000000000000056 /* Release */,
+			);
+			defaultConfigurationIsVisible = 0;
+			defaultConfigurationName = Release;
+		};
+/* End XCConfigurationList section */
+	};
+	rootObject = BE0000000000000000000010 /* Project object */;
+}
+"""
+
+
+def seeded_ids(seed):
+    """Endless stream of reproducible 24-hex-digit object IDs."""
+    rng = random.Random(seed)
+    while True:
+        yield f"{rng.getrandbits(96):024X}"
+
+
+def source_paths(count, depth):
+    """
+    Paths of `count` Swift files in a group tree `depth` levels deep.
+
+    Folders are spread round-robin over the source roots, FILES_PER_GROUP
+    files each; every file name is unique.
+    """
+    folders = -(-count // FILES_PER_GROUP)
+    per_root = -(-folders // len(ROOTS))
+    fanout = 2
+    while fanout ** depth < per_root:
+        fanout += 1
+
+    paths = []
+    for number in range(count):
+        folder = number // FILES_PER_GROUP
+        index = folder // len(ROOTS)
+        parts = [ROOTS[folder % len(ROOTS)]]
+        for level in range(depth):
+            index, digit = divmod(index, fanout)
+            parts.append(f"Level{level}_{digit}")
+        parts.append(f"Type{number:06d}.swift")
+        paths.append('/'.join(parts))
+    return paths
+
+
+def plan_changes(paths, rng):
+    """
+    Pick the on-disk changes made after the project was generated.
+
+    Returns:
+        (adds, removes, moves) with moves as (old, new) pairs
+    """
+    changes = max(4, len(paths) // 100)
+    picked = rng.sample(range(len(paths)), 2 * changes)
+    removes = sorted(paths[i] for i in picked[:changes])
+    moved = [paths[i] for i in picked[changes:]]
+    moves = []
+    for old in sorted(moved):
+        other = paths[rng.randrange(len(paths))]
+        moves.append((old, posixpath.join(posixpath.dirname(other), posixpath.basename(old))))
+    moves = [(old, new) for old, new in moves if old != new]
+
+    adds = []
+    for number in range(changes):
+        folder = posixpath.dirname(paths[rng.randrange(len(paths))])
+        if number % 2:
+            # A folder the project doesn't have a group for yet
+            folder = posixpath.join(folder, f"Added{number // 2 % 4}")
+        adds.append(posixpath.join(folder, f"New{number:06d}.swift"))
+    return sorted(set(adds)), removes, moves
+
+
+def write_source(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def generate(directory, count, depth, seed):
+    """
+    Create a synthetic project in `directory` and change its source tree.
+
+    The project references `count` files; afterwards files are added,
+    removed and moved on disk so the tree no longer matches it.
+
+    Returns:
+        Dict describing the project (refs, objects, changes)
+    """
+    from pbxproj import PBXProject
+    from project_targets import FILE_TYPES, TargetIndex
+    from project_tree import ProjectTree
+
+    paths = source_paths(count, depth)
+    project = PBXProject(TEMPLATE)
+    project.id_source = seeded_ids(seed)
+    tree = ProjectTree(project)
+    targets = TargetIndex(project, tree, RULES)
+    file_kind, phase_kind = FILE_TYPES['.swift']
+    for path in paths:
+        file_ref = tree.add_file(path, {'lastKnownFileType': file_kind})
+        targets.add_member(file_ref, targets.targets_for(path), phase_kind)
+
+    text = project.serialize(canonical=True)
+    write_source(os.path.join(directory, PROJECT_FILE), text)
+    for path in paths:
+        write_source(os.path.join(directory, path), f"struct {posixpath.basename(path)[:-6]} {{}}\n")
+
+    adds, removes, moves = plan_changes(paths, random.Random(seed))
+    for path in adds:
+        write_source(os.path.join(directory, path), f"struct {posixpath.basename(path)[:-6]} {{}}\n")
+    for path in removes:
+        os.remove(os.path.join(directory, path))
+    for old, new in moves:
+        os.makedirs(os.path.dirname(os.path.join(directory, new)), exist_ok=True)
+        os.replace(os.path.join(directory, old), os.path.join(directory, new))
+
+    return {
+        'refs': len(paths),
+        'objects': len(project.objects),
+        'bytes': len(text.encode('utf-8')),
+        'depth': depth,
+        'changes': {'adds': len(adds), 'removes': len(removes), 'moves': len(moves)},
+    }
+
+
+def run_pipeline(seed, timer=None):
+    """
+    Run one reconcile over the project in the current directory.
+
+    Args:
+        seed: Seed of the IDs given to new objects
+        timer: Called as timer(stage, phase) with phase 'start' or 'end'
+
+    Returns:
+        (original text, written text)
+    """
+    import project_io
+    from pbxproj import PBXProject
+    from project_reconcile import apply, plan
+    from project_targets import FILE_TYPES, TargetIndex
+    from project_tree import ProjectTree
+    from source_scanner import scan
+
+    timer = timer or (lambda stage, phase: None)
+
+    timer('scan', 'start')
+    on_disk = scan(ROOTS, extensions=tuple(FILE_TYPES))
+    timer('scan', 'end')
+
+    timer('parse', 'start')
+    text, expected = project_io.read_project(PROJECT_FILE)
+    project = PBXProject(text)
+    timer('parse', 'end')
+    project.id_source = seeded_ids(seed)
+
+    timer('diff', 'start')
+    tree = ProjectTree(project)
+    targets = TargetIndex(project, tree, RULES)
+    changeset = plan(tree, on_disk, ROOTS)
+    timer('diff', 'end')
+
+    timer('apply', 'start')
+    with open(os.devnull, 'w') as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            apply(changeset, project, tree, targets)
+        finally:
+            sys.stdout = stdout
+    timer('apply', 'end')
+
+    timer('write', 'start')
+    output = project.serialize()
+    with project_io.ProjectLock(PROJECT_FILE):
+        if not project_io.write_project(PROJECT_FILE, output, text, expected, backups=1):
+            raise RuntimeError(f"{PROJECT_FILE} was not written")
+    timer('write', 'end')
+    return text, output
+
+
+def xcode_layout_matches(output):
+    """True if `output` is exactly the full Xcode-layout render of its graph."""
+    from pbxproj import PBXProject
+    return PBXProject(output).serialize(canonical=True) == output
+
+
+def measure(directory, repeat, seed):
+    """
+    Time every stage `repeat` times (best run wins) and trace allocations.
+
+    Runs in a worker process started by run_size().
+
+    Returns:
+        Dict with 'stages' (seconds), 'peak_alloc_mb', 'peak_rss_mb' and
+        'xcode_layout'
+    """
+    import resource
+    import tracemalloc
+
+    os.chdir(directory)
+    with open(PROJECT_FILE, 'r', encoding='utf-8') as f:
+        original = f.read()
+
+    def restore():
+        with open(PROJECT_FILE, 'w', encoding='utf-8') as f:
+            f.write(original)
+
+    best = {}
+    output = None
+    for _ in range(repeat):
+        started = {}
+
+        def timer(stage, phase):
+            if phase == 'start':
+                started[stage] = time.perf_counter()
+            else:
+                elapsed = time.perf_counter() - started[stage]
+                best[stage] = min(best.get(stage, elapsed), elapsed)
+
+        _, output = run_pipeline(seed, timer)
+        restore()
+    layout = xcode_layout_matches(output)
+
+    peaks = {}
+
+    def tracer(stage, phase):
+        if phase == 'start':
+            tracemalloc.reset_peak()
+            started_size[0] = tracemalloc.get_traced_memory()[0]
+        else:
+            peaks[stage] = round((tracemalloc.get_traced_memory()[1] - started_size[0]) / 2**20, 2)
+
+    started_size = [0]
+    tracemalloc.start()
+    run_pipeline(seed, tracer)
+    tracemalloc.stop()
+    restore()
+
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss_mb = rss / 2**20 if sys.platform == 'darwin' else rss / 2**10
+    return {
+        'stages': {stage: round(best[stage], 4) for stage in STAGES},
+        'total': round(sum(best[stage] for stage in STAGES), 4),
+        'peak_alloc_mb': peaks,
+        'peak_rss_mb': round(rss_mb, 1),
+        'xcode_layout': layout,
+    }
+
+
+def run_size(count, depth, repeat, seed):
+    """Generate a project of `count` refs and measure it in a fresh process."""
+    directory = tempfile.mkdtemp(prefix=f'bench-project-{count}-')
+    try:
+        started = time.perf_counter()
+        info = generate(directory, count, depth, seed)
+        info['generate_seconds'] = round(time.perf_counter() - started, 2)
+        info.update(bench_harness.run_worker(__file__, directory, '--repeat', repeat, '--seed', seed))
+        return info
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def check_golden(update=False):
+    """
+    Generate and edit the small seeded project and compare it with the
+    golden files.
+
+    Returns:
+        True if both files match (or were updated)
+    """
+    ok = True
+    directory = tempfile.mkdtemp(prefix='bench-project-golden-')
+    cwd = os.getcwd()
+    try:
+        generate(directory, GOLDEN_SIZE, GOLDEN_DEPTH, GOLDEN_SEED)
+        os.chdir(directory)
+        before, after = run_pipeline(GOLDEN_SEED + 1)
+        if not xcode_layout_matches(after):
+            print("❌ Golden: edited project differs from a full Xcode-layout render")
+            ok = False
+        for name, text in (('before', before), ('after', after)):
+            ok = _golden_file(f'project.{name}', text, update, cwd) and ok
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(directory, ignore_errors=True)
+    ok = check_project_snapshot(update) and ok
+    if ok and not update:
+        print("✅ Golden project files match")
+    return ok
+
+
+def _golden_file(name, text, update, cwd):
+    """Compare `text` with (or, with `update`, write it to) a golden file."""
+    golden = os.path.join(GOLDEN_DIR, f'{name}.pbxproj')
+    if update:
+        os.makedirs(GOLDEN_DIR, exist_ok=True)
+        with open(golden, 'w', encoding='utf-8') as f:
+            f.write(text)
+        print(f"📝 Updated {os.path.relpath(golden, cwd)}")
+        return True
+    try:
+        with open(golden, 'r', encoding='utf-8') as f:
+            expected = f.read()
+    except FileNotFoundError:
+        print(f"❌ Golden file missing: {golden} (run with --update-golden)")
+        return False
+    if text != expected:
+        print(f"❌ Golden: {name} differs from {os.path.relpath(golden, cwd)}")
+        for number, (a, b) in enumerate(zip(expected.splitlines(), text.splitlines()), 1):
+            if a != b:
+                print(f"   line {number}:\n   - {a!r}\n   + {b!r}")
+                break
+        return False
+    return True
+
+
+def check_project_snapshot(update=False):
+    """
+    Round-trip and edit the snapshot of this app's project file.
+
+    Returns:
+        True if the round trip is byte-identical, the edit only changes the
+        objects it modified and the result matches the golden file (or was
+        updated)
+    """
+    import difflib
+    from pbxproj import PBXProject
+    from project_targets import TargetIndex, file_type
+    from project_tree import ProjectTree
+
+    with open(os.path.join(GOLDEN_DIR, f'{PROJECT_SNAPSHOT}.pbxproj'), 'r', encoding='utf-8') as f:
+        text = f.read()
+    project = PBXProject(text)
+    if project.serialize() != text:
+        print(f"❌ Golden: {PROJECT_SNAPSHOT} does not round-trip byte for byte")
+        return False
+
+    project.id_source = seeded_ids(GOLDEN_SEED)
+    tree = ProjectTree(project)
+    targets = TargetIndex(project, tree)
+    for path in PROJECT_SNAPSHOT_FILES:
+        file_ref = tree.add_file(path, {'lastKnownFileType': file_type(path)[0]},
+                                 group=tree.ensure_group(posixpath.dirname(path), create_top_level=True))
+        targets.add_member(file_ref, targets.targets_for(path), file_type(path)[1])
+    output = project.serialize()
+
+    # Lines of the objects the edit modified; they are re-rendered, every
+    # other line of the snapshot must survive as is
+    rewritten = set()
+    for obj in project.objects.values():
+        if obj.span is not None and obj.dirty:
+            first = text.count('\n', 0, obj.span[0])
+            rewritten.update(range(first, first + text.count('\n', obj.span[0], obj.span[1])))
+
+    ok = True
+    opcodes = difflib.SequenceMatcher(None, text.splitlines(), output.splitlines(), autojunk=False).get_opcodes()
+    changed = [op for op in opcodes
+               if op[0] not in ('equal', 'insert') and not rewritten.issuperset(range(op[1], op[2]))]
+    if changed:
+        tag, i1, i2, _, _ = changed[0]
+        print(f"❌ Golden: adding files to {PROJECT_SNAPSHOT} changed lines outside the edited objects ({tag} at line {i1 + 1})")
+        ok = False
+    if PBXProject(output).serialize() != output:
+        print(f"❌ Golden: edited {PROJECT_SNAPSHOT} does not round-trip")
+        ok = False
+    return _golden_file(f'{PROJECT_SNAPSHOT}.after', output, update, os.getcwd()) and ok
+
+
+def regression_pairs(results, baseline):
+    """(label, seconds now, seconds in the baseline) per size and stage."""
+    for size, current in results['sizes'].items():
+        previous = baseline.get('sizes', {}).get(size)
+        if not previous:
+            continue
+        for stage in STAGES:
+            before = previous['stages'].get(stage)
+            if before is not None:
+                yield f"{size} refs, {stage}", current['stages'][stage], before
+
+
+def print_table(results):
+    print(f"\n{'refs':>7}  " + ''.join(f"{stage:>9}" for stage in STAGES) + f"{'total':>9}{'rss MB':>9}")
+    for size, info in results['sizes'].items():
+        times = ''.join(f"{info['stages'][stage] * 1000:7.1f}ms" for stage in STAGES)
+        print(f"{size:>7}  {times}{info['total'] * 1000:7.0f}ms{info['peak_rss_mb']:9.1f}")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the project sync pipeline on synthetic projects")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="Numbers of file references to generate (default: 1000 10000 50000)")
+    parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH,
+                        help=f"Group tree depth below each source root (default: {DEFAULT_DEPTH})")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help=f"Timed runs per size; the best is kept (default: {DEFAULT_REPEAT})")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for the generated projects (default: 1)")
+    bench_harness.add_arguments(parser, DEFAULT_OUTPUT, DEFAULT_TOLERANCE, 'stage')
+    parser.add_argument("--golden-only", action="store_true", help="Only run the golden file checks")
+    parser.add_argument("--update-golden", action="store_true", help="Rewrite the golden files")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    sys.path.insert(0, SCRIPT_DIR)
+
+    if args.worker:
+        json.dump(measure(args.worker, args.repeat, args.seed), sys.stdout)
+        return 0
+
+    ok = check_golden(update=args.update_golden)
+    if args.golden_only or args.update_golden:
+        return 0 if ok else 1
+
+    results = bench_harness.environment(repeat=args.repeat, sizes={})
+    for count in args.sizes:
+        print(f"⏱  {count} file references...", flush=True)
+        info = run_size(count, args.depth, args.repeat, args.seed)
+        results['sizes'][str(count)] = info
+        if not info['xcode_layout']:
+            print(f"❌ {count} refs: spliced output differs from a full Xcode-layout render")
+            ok = False
+    print_table(results)
+
+    regressions = bench_harness.finish(results, args, regression_pairs, MIN_REGRESSION,
+                                       lambda seconds: f"{seconds * 1000:.1f}ms", 'stage')
+    return 0 if ok and not regressions else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,12 +1,22 @@
 #!/bin/bash
-# Script to check for Swift files that exist but aren't in the Xcode project
-# Usage: ./check_missing_files.sh [--fix] [--verbose]
+# Script to check for Swift files that exist but aren't in the Xcode project,
+# and for project references whose file no longer exists
+# Usage: ./check_missing_files.sh [--fix] [--json] [--verbose]
+#
+# The check itself is add_missing_files_to_project.py --check: the project's
+# references are resolved once and diffed against the scanned source tree
+# (exact paths, so View.swift is not satisfied by DashboardView.swift).
+# Exit status is 0 when both agree and 1 otherwise, so CI can call it too.
+# Files named by a reference that sits in no group are listed as orphaned
+# but don't fail the check. --verbose is passed on to the --fix run.
 
 set -e
 
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 PROJECT_FILE="Plena.xcodeproj/project.pbxproj"
 FIX_MODE=false
-VERBOSE=false
+FORMAT=plain
+VERBOSE_ARGS=()
 
 # Parse arguments
 while [[ $# -gt 0 ]]; do
@@ -15,13 +25,17 @@ while [[ $# -gt 0 ]]; do
             FIX_MODE=true
             shift
             ;;
+        --json)
+            FORMAT=json
+            shift
+            ;;
         --verbose|-v)
-            VERBOSE=true
+            VERBOSE_ARGS=(--verbose)
             shift
             ;;
         *)
             echo "Unknown option: $1"
-            echo "Usage: $0 [--fix] [--verbose]"
+            echo "Usage: $0 [--fix] [--json] [--verbose]"
             exit 1
             ;;
     esac
@@ -32,69 +46,21 @@ if [ ! -f "$PROJECT_FILE" ]; then
     exit 1
 fi
 
-echo "🔍 Checking for Swift files not in Xcode project..."
-echo ""
-
-# Find all Swift files in the project directories
-SWIFT_FILES=$(find Plena Plena\ Watch\ App PlenaShared Tests -name "*.swift" -type f 2>/dev/null | sort)
-
-if [ -z "$SWIFT_FILES" ]; then
-    echo "⚠️  No Swift files found in project directories"
-    exit 0
-fi
-
-MISSING_FILES=()
-TOTAL_FILES=0
-
-# Check each Swift file
-while IFS= read -r file; do
-    TOTAL_FILES=$((TOTAL_FILES + 1))
-
-    # Get just the filename
-    filename=$(basename "$file")
-
-    # Check if file is referenced in project.pbxproj
-    if ! grep -q "$filename" "$PROJECT_FILE"; then
-        MISSING_FILES+=("$file")
-        if [ "$VERBOSE" = true ]; then
-            echo "  ❌ Missing: $file"
-        fi
-    fi
-done <<< "$SWIFT_FILES"
-
-echo "📊 Summary:"
-echo "   Total Swift files: $TOTAL_FILES"
-echo "   Missing from project: ${#MISSING_FILES[@]}"
-echo ""
-
-if [ ${#MISSING_FILES[@]} -eq 0 ]; then
-    echo "✅ All Swift files are included in the Xcode project!"
+if python3 "$SCRIPT_DIR/add_missing_files_to_project.py" --check --format "$FORMAT"; then
     exit 0
 fi
 
-echo "❌ Found ${#MISSING_FILES[@]} file(s) not in Xcode project:"
-for file in "${MISSING_FILES[@]}"; do
-    echo "   - $file"
-done
-echo ""
-
 if [ "$FIX_MODE" = false ]; then
-    echo "💡 To automatically add these files, run:"
-    echo "   $0 --fix"
-    echo ""
-    echo "⚠️  Note: Auto-adding files requires manual verification in Xcode"
+    if [ "$FORMAT" = plain ]; then
+        echo ""
+        echo "💡 To add missing files and drop stale references, run:"
+        echo "   $0 --fix"
+    fi
     exit 1
 fi
 
-echo "⚠️  Auto-fix mode: Files need to be manually added to Xcode project"
-echo "   This script can only detect missing files, not automatically add them"
-echo "   Please add these files through Xcode's 'Add Files to Project' feature"
 echo ""
-echo "📝 Files to add:"
-for file in "${MISSING_FILES[@]}"; do
-    echo "   $file"
-done
-
-exit 1
-
-
+echo "🔧 Fixing the project..."
+python3 "$SCRIPT_DIR/add_missing_files_to_project.py" --reconcile "${VERBOSE_ARGS[@]}"
+echo ""
+python3 "$SCRIPT_DIR/add_missing_files_to_project.py" --check --format "$FORMAT"
@@ -4,103 +4,78 @@ Fix app icons for App Store submission by removing alpha channels.
 
 Apple requires all app icons to be opaque (no transparency/alpha channel).
 This script:
-1. Removes alpha channels from all icons by compositing onto white background
-2. Creates missing Watch icons (108x108@2x for Series 4)
+1. Removes alpha channels from all icons by compositing onto the icon's own
+   background color (detected from its opaque edge, or white)
+2. Creates every missing icon slot from the largest icon in the set
 3. Saves icons as opaque PNG files
 """
 
 import os
 import sys
-import json
-from PIL import Image
-
-def remove_alpha_channel(image_path, output_path=None, background_color=(255, 255, 255)):
+import argparse
+
+from icon_cache import IconCache, file_sha256
+from icon_jobs import add_jobs_argument, replay, run_jobs
+from icon_pipeline import apply_pipeline, parse_color, stage_params
+from icon_slots import IconSetContents, fill_missing_slots
+import output_writer
+import png_encoder
+import stage_timing
+from png_preflight import is_opaque_rgb, preflight
+
+@stage_timing.timed
+def remove_alpha_channel(image_path, output_path=None, background_color='auto', preset=None):
     """
     Remove alpha channel from an image by compositing onto a solid background.
 
+    Preset over the `flatten` pipeline stage.
+
     Args:
         image_path: Path to input image
         output_path: Path to save output (defaults to overwriting input)
-        background_color: RGB tuple for background (default white)
+        background_color: RGB tuple for background, or 'auto' to detect the
+            dominant edge color (default)
+        preset: PNG encoder preset (see png_encoder.PRESETS)
 
     Returns:
         True if successful, False otherwise
     """
     try:
-        # Open image
-        img = Image.open(image_path)
-
-        # Convert to RGB if image has alpha channel
-        if img.mode in ('RGBA', 'LA', 'P'):
-            # Create white background
-            background = Image.new('RGB', img.size, background_color)
-
-            # Composite image onto background (handles transparency)
-            if img.mode == 'P':
-                img = img.convert('RGBA')
-            if img.mode == 'LA':
-                img = img.convert('RGBA')
-
-            # Composite with alpha blending
-            background.paste(img, mask=img.split()[3] if img.mode == 'RGBA' else None)
-            img = background
-        elif img.mode != 'RGB':
-            img = img.convert('RGB')
-
-        # Save as RGB (no alpha)
+        # Already opaque 8-bit RGB: nothing to do in place, skip the decode
+        if not output_path or output_path == image_path:
+            info = preflight(image_path)
+            if info and is_opaque_rgb(info):
+                print(f"✓ Already opaque: {os.path.basename(image_path)}")
+                stage_timing.count('files_skipped')
+                return True
+
+        # Flatten onto the background and save as RGB (no alpha)
         output = output_path if output_path else image_path
-        img.save(output, 'PNG', optimize=False)
-        print(f"✓ Fixed: {os.path.basename(image_path)}")
+        context = apply_pipeline(image_path, output, ['flatten'],
+                                 {'background_color': background_color}, preset)
+        if context['written']:
+            print(f"✓ Fixed: {os.path.basename(image_path)} (background {context['background_color']})")
+        else:
+            print(f"✓ Already fixed: {os.path.basename(image_path)} (output unchanged)")
         return True
 
     except Exception as e:
         print(f"✗ Error processing {image_path}: {e}")
         return False
 
-def create_watch_108_icon(source_icon_path, output_path, size=(216, 216)):
-    """
-    Create the missing 108x108@2x (216x216) Watch icon from a source icon.
-
-    Args:
-        source_icon_path: Path to source icon (will use largest available)
-        output_path: Path to save the new 108x108@2x icon
-        size: Target size (216x216 for 108pt@2x)
-    """
-    try:
-        # Open source icon
-        img = Image.open(source_icon_path)
-
-        # Remove alpha if present
-        if img.mode in ('RGBA', 'LA', 'P'):
-            background = Image.new('RGB', img.size, (255, 255, 255))
-            if img.mode == 'P':
-                img = img.convert('RGBA')
-            if img.mode == 'LA':
-                img = img.convert('RGBA')
-            background.paste(img, mask=img.split()[3] if img.mode == 'RGBA' else None)
-            img = background
-        elif img.mode != 'RGB':
-            img = img.convert('RGB')
-
-        # Resize to target size with high-quality resampling
-        img_resized = img.resize(size, Image.Resampling.LANCZOS)
-
-        # Save
-        img_resized.save(output_path, 'PNG', optimize=False)
-        print(f"✓ Created: {os.path.basename(output_path)} (216x216)")
-        return True
-
-    except Exception as e:
-        print(f"✗ Error creating 108x108 icon: {e}")
-        return False
-
-def process_icon_set(icon_set_path, watch_set=False):
+@stage_timing.timed
+def process_icon_set(icon_set_path, watch_set=False, jobs=1, use_cache=True, background_color='auto',
+                     preset=None):
     """
     Process all icons in an icon set to remove alpha channels.
 
     Args:
         icon_set_path: Path to .appiconset directory
-        watch_set: If True, also handle missing 108x108 icon
+        watch_set: If True, also add any watchOS slots Contents.json lacks
+        jobs: Number of worker processes for the alpha pass
+        use_cache: Skip icons the catalog manifest says are already fixed
+        background_color: Flatten background RGB tuple, or 'auto'
+        preset: PNG encoder preset for fixed and created icons
     """
     if not os.path.exists(icon_set_path):
         print(f"Error: Directory not found: {icon_set_path}")
@@ -111,119 +86,113 @@ def process_icon_set(icon_set_path, watch_set=False):
         print(f"Error: Contents.json not found in {icon_set_path}")
         return False
 
-    # Read Contents.json
-    with open(contents_json, 'r') as f:
-        contents = json.load(f)
+    # Read Contents.json once; the slot planner reuses the same model
+    model = IconSetContents(icon_set_path)
+    contents = model.contents
 
     # Process all existing icons
     print(f"\nProcessing icons in: {icon_set_path}")
     print("-" * 60)
 
     fixed_count = 0
+    compliant_count = 0
     missing_icons = []
+    tasks = []
+    input_hashes = {}
+    cache = IconCache.for_path(icon_set_path) if use_cache else None
+    cache_params = dict(stage_params(['flatten'], {'background_color': background_color}),
+                        png_preset=preset or png_encoder.DEFAULT_PRESET)
 
     for image_entry in contents.get('images', []):
         filename = image_entry.get('filename')
         if not filename:
-            # Missing icon
-            size = image_entry.get('size', 'unknown')
-            role = image_entry.get('role', 'unknown')
-            missing_icons.append({
-                'entry': image_entry,
-                'size': size,
-                'role': role
-            })
+            missing_icons.append(image_entry)
             continue
 
         icon_path = os.path.join(icon_set_path, filename)
         if os.path.exists(icon_path):
-            if remove_alpha_channel(icon_path):
-                fixed_count += 1
+            if cache:
+                if cache.is_fresh(icon_path, icon_path, 'flatten', cache_params):
+                    continue
+            # Header-only check: only icons that need fixing get fully decoded
+            info = preflight(icon_path)
+            if info and is_opaque_rgb(info):
+                compliant_count += 1
+                continue
+            if cache:
+                input_hashes[icon_path] = file_sha256(icon_path)
+            tasks.append((icon_path, None, background_color, preset))
         else:
             print(f"⚠ Missing file: {filename}")
-
-    # Handle missing Watch icons
-    if watch_set and missing_icons:
-        print(f"\nCreating {len(missing_icons)} missing icon(s)...")
-
-        # Find a source icon to resize (prefer 1024x1024 or largest available)
-        source_icon = None
-        source_size = 0
-
-        for image_entry in contents.get('images', []):
-            filename = image_entry.get('filename')
-            if filename:
-                icon_path = os.path.join(icon_set_path, filename)
-                if os.path.exists(icon_path):
-                    try:
-                        img = Image.open(icon_path)
-                        if img.width * img.height > source_size:
-                            source_size = img.width * img.height
-                            source_icon = icon_path
-                    except:
-                        pass
-
-        if not source_icon:
-            print("✗ No source icon found to create missing icons")
+            missing_icons.append(image_entry)
+
+    for (icon_path, _, _, _), outcome in run_jobs(remove_alpha_channel, tasks, jobs):
+        if replay(outcome):
+            fixed_count += 1
+            if cache:
+                cache.record(input_hashes[icon_path], icon_path, icon_path,
+                             'flatten', cache_params)
+
+    stage_timing.count('files_skipped', compliant_count + (cache.skipped if cache else 0))
+    if compliant_count:
+        print(f"✓ {compliant_count} icon(s) already opaque RGB")
+    if cache:
+        if cache.skipped:
+            print(f"⏭ Skipped {cache.skipped} unchanged icon(s)")
+        cache.save()
+
+    # Fill every missing slot from one decoded master
+    created = 0
+    platforms = ('watch',) if watch_set else ()
+    if missing_icons or platforms:
+        with stage_timing.stage('fill_missing_slots'):
+            result = fill_missing_slots(icon_set_path, platforms=platforms, model=model, preset=preset)
+        if result is None:
             return False
-
-        # Create missing icons
-        for missing in missing_icons:
-            entry = missing['entry']
-            size_str = missing['size']
-            role = missing['role']
-
-            # Parse size (e.g., "108x108")
-            if 'x' in size_str:
-                try:
-                    width_pt, height_pt = map(int, size_str.split('x'))
-                    scale = entry.get('scale', '1x')
-                    scale_factor = int(scale.replace('x', ''))
-                    pixel_size = (width_pt * scale_factor, height_pt * scale_factor)
-
-                    # Generate filename
-                    filename = f"icon_watch_{pixel_size[0]}.png"
-                    output_path = os.path.join(icon_set_path, filename)
-
-                    if create_watch_108_icon(source_icon, output_path, pixel_size):
-                        # Update Contents.json
-                        entry['filename'] = filename
-
-                except ValueError as e:
-                    print(f"✗ Could not parse size '{size_str}': {e}")
-
-        # Save updated Contents.json
-        with open(contents_json, 'w') as f:
-            json.dump(contents, f, indent=2)
-        print(f"\n✓ Updated Contents.json")
+        created = result[0]
+    output_writer.report()
 
     print(f"\n{'='*60}")
     print(f"✓ Successfully processed {fixed_count} icon(s)")
-    if watch_set and missing_icons:
-        print(f"✓ Created {len(missing_icons)} missing icon(s)")
+    if created:
+        print(f"✓ Created {created} missing icon(s)")
     print(f"{'='*60}\n")
 
     return True
 
 def main():
     """Main entry point."""
-    if len(sys.argv) < 2:
-        print("Usage: python3 fix_app_store_icons.py <icon_set_path> [watch_set]")
-        print("\nExamples:")
-        print("  python3 fix_app_store_icons.py ../Plena/Assets.xcassets/AppIcon.appiconset")
-        print("  python3 fix_app_store_icons.py ../Plena\\ Watch\\ App/Assets.xcassets/AppIcon.appiconset watch")
-        print("\nThis script removes alpha channels from all icons to comply with App Store requirements.")
-        sys.exit(1)
-
-    icon_set = sys.argv[1]
-    is_watch_set = len(sys.argv) > 2 and sys.argv[2].lower() == 'watch'
+    parser = argparse.ArgumentParser(
+        description="Remove alpha channels from all icons to comply with App Store requirements.",
+        epilog=(
+            "Examples:\n"
+            "  python3 fix_app_store_icons.py ../Plena/Assets.xcassets/AppIcon.appiconset\n"
+            "  python3 fix_app_store_icons.py ../Plena\\ Watch\\ App/Assets.xcassets/AppIcon.appiconset watch"
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("icon_set_path", help="Path to .appiconset directory")
+    parser.add_argument("watch_set", nargs="?", default="", help="Pass 'watch' to also add any missing watchOS slots")
+    add_jobs_argument(parser)
+    parser.add_argument("--no-cache", action="store_true", help="Reprocess every icon, ignoring the catalog manifest")
+    parser.add_argument("--background-color", type=parse_color, default='auto',
+                        help="Flatten background as R,G,B, or 'auto' to detect it (default auto)")
+    png_encoder.add_preset_argument(parser)
+    stage_timing.add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    icon_set = args.icon_set_path
+    is_watch_set = args.watch_set.lower() == 'watch'
 
     print("=" * 60)
     print("App Store Icon Fixer")
     print("=" * 60)
     print("Removing alpha channels from all icons...")
 
-    success = process_icon_set(icon_set, watch_set=is_watch_set)
+    with stage_timing.Session(args, 'fix_app_store_icons'):
+        success = process_icon_set(icon_set, watch_set=is_watch_set, jobs=args.jobs,
+                                   use_cache=not args.no_cache, background_color=args.background_color,
+                                   preset=args.png_preset)
 
     if success:
         print("✓ All icons have been fixed!")
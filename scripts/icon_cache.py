@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Content-hash manifest that lets icon passes skip files they already processed.
+
+There is one manifest per .xcassets catalog (or per icon set / output
+directory when it is not inside a catalog). Manifests live outside the
+source tree, in $XDG_CACHE_HOME/plena-icons (default ~/.cache/plena-icons),
+named after a hash of the catalog's absolute path, so nothing is written
+into the asset catalog and nothing needs ignoring in git. For every output
+file and operation it records the parameters and the sha256/size/mtime of
+both the input and the output. On a re-run a file is skipped when the
+operation and parameters match and the output still has the recorded
+content; a size+mtime match short-circuits the hash entirely, so a no-op
+pass over a clean catalog only costs a stat() per file.
+"""
+
+import os
+import json
+import hashlib
+
+import output_writer
+
+CACHE_DIR_NAME = 'plena-icons'
+MANIFEST_VERSION = 1
+
+
+def cache_dir():
+    """Directory holding the manifests ($XDG_CACHE_HOME/plena-icons)."""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, CACHE_DIR_NAME)
+
+
+def manifest_path(catalog_root):
+    """Manifest file for a catalog, keyed by its absolute path."""
+    key = hashlib.sha256(os.path.abspath(catalog_root).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(cache_dir(), f'{key}.json')
+
+
+def file_sha256(path):
+    """Return the hex sha256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def find_catalog_root(path):
+    """
+    Find the .xcassets directory containing `path`.
+
+    Args:
+        path: File or directory inside an asset catalog
+
+    Returns:
+        The catalog directory, or the directory of `path` if it is not
+        inside a catalog
+    """
+    path = os.path.abspath(path)
+    current = path if os.path.isdir(path) else os.path.dirname(path)
+    probe = current
+    while True:
+        if probe.endswith('.xcassets'):
+            return probe
+        parent = os.path.dirname(probe)
+        if parent == probe:
+            return current
+        probe = parent
+
+
+def _signature(path, sha256=None):
+    """Build the stored signature (hash, size, mtime) for a file."""
+    st = os.stat(path)
+    return {
+        'sha256': sha256 if sha256 is not None else file_sha256(path),
+        'size': st.st_size,
+        'mtime_ns': st.st_mtime_ns,
+    }
+
+
+def _stat_matches(signature, path):
+    """True if size and mtime on disk match a stored signature."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    return st.st_size == signature.get('size') and st.st_mtime_ns == signature.get('mtime_ns')
+
+
+def _normalise_params(params):
+    """Round-trip params through JSON so tuples compare equal to stored lists."""
+    return json.loads(json.dumps(params or {}, sort_keys=True))
+
+
+class IconCache:
+    """Per-catalog manifest of processed icon files."""
+
+    def __init__(self, catalog_root):
+        self.root = catalog_root
+        self.path = manifest_path(catalog_root)
+        self.entries = {}
+        self.dirty = False
+        self.skipped = 0
+
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r') as f:
+                    data = json.load(f)
+                if data.get('version') == MANIFEST_VERSION:
+                    self.entries = data.get('entries', {})
+            except (OSError, ValueError):
+                # A corrupt manifest only costs a full re-run
+                self.entries = {}
+
+    @classmethod
+    def for_path(cls, path):
+        """Open the manifest for the catalog containing `path`."""
+        return cls(find_catalog_root(path))
+
+    def _key(self, output_path):
+        return os.path.relpath(os.path.abspath(output_path), self.root)
+
+    def is_fresh(self, input_path, output_path, operation, params):
+        """
+        Check whether `output_path` is already the result of this operation.
+
+        Args:
+            input_path: File the operation would read
+            output_path: File the operation would write
+            operation: Operation name (e.g. 'remove_alpha_channel')
+            params: Dict of parameters that affect the output
+
+        Returns:
+            True if the file can be skipped
+        """
+        entry = self.entries.get(self._key(output_path), {}).get(operation)
+        if not entry or entry.get('params') != _normalise_params(params):
+            return False
+        if not os.path.exists(output_path):
+            return False
+
+        in_place = os.path.abspath(input_path) == os.path.abspath(output_path)
+
+        # Fast path: nothing touched the files since we recorded them
+        if _stat_matches(entry['output'], output_path) and \
+                (in_place or _stat_matches(entry['input'], input_path)):
+            self.skipped += 1
+            return True
+
+        # Slow path: mtime changed (checkout, copy); compare content
+        if file_sha256(output_path) != entry['output']['sha256']:
+            return False
+        if not in_place:
+            if not os.path.exists(input_path):
+                return False
+            input_hash = file_sha256(input_path)
+            if input_hash != entry['input']['sha256']:
+                return False
+            entry['input'] = _signature(input_path, input_hash)
+        entry['output'] = _signature(output_path, entry['output']['sha256'])
+        self.dirty = True
+        self.skipped += 1
+        return True
+
+    def record(self, input_sha256, input_path, output_path, operation, params):
+        """
+        Record a successful operation.
+
+        Args:
+            input_sha256: Hash of the input taken before processing (the input
+                may have been overwritten by an in-place operation)
+            input_path: File the operation read
+            output_path: File the operation wrote
+            operation: Operation name
+            params: Dict of parameters that affect the output
+        """
+        input_signature = {'sha256': input_sha256}
+        if os.path.exists(input_path) and \
+                os.path.abspath(input_path) != os.path.abspath(output_path):
+            input_signature = _signature(input_path, input_sha256)
+
+        self.entries.setdefault(self._key(output_path), {})[operation] = {
+            'params': _normalise_params(params),
+            'input': input_signature,
+            'output': _signature(output_path),
+        }
+        self.dirty = True
+
+    def save(self):
+        """Write the manifest if anything changed."""
+        if not self.dirty:
+            return
+        data = json.dumps({'version': MANIFEST_VERSION, 'root': os.path.abspath(self.root), 'entries': self.entries},
+                          indent=2, sort_keys=True)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # The manifest is bookkeeping, not an output; keep it out of the counts
+        output_writer.write_text(self.path, data + '\n', count=False)
+        self.dirty = False
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Process-pool helper shared by the icon scripts.
+
+Icon work (decode, NumPy masking, PNG encode) is CPU-bound and splits
+cleanly per file, so the per-file functions are fanned out over a process
+pool. Workers never print directly: anything a per-file function prints is
+captured and handed back with its result, and the parent replays it in the
+original input order so the summary reads the same as a serial run.
+The output_writer written/skipped counts and the stage_timing stats of each
+task travel back the same way and are merged into the parent's counters.
+
+A caller with several batches (e.g. one per asset catalog) can open one
+job_pool() and pass it to every run_jobs() call instead of starting a
+pool per batch.
+"""
+
+import io
+import os
+import traceback
+from contextlib import contextmanager, redirect_stdout
+from concurrent.futures import ProcessPoolExecutor
+
+import output_writer
+import stage_timing
+
+
+def resolve_jobs(jobs):
+    """
+    Normalise a --jobs value.
+
+    Args:
+        jobs: Requested worker count (None or <= 0 means one per CPU)
+
+    Returns:
+        Positive worker count
+    """
+    if jobs is None or jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def add_jobs_argument(parser):
+    """Add the shared --jobs option to an argparse parser."""
+    parser.add_argument(
+        "--jobs", "-j", type=int, default=1,
+        help="Number of worker processes (0 = one per CPU, default 1)"
+    )
+
+
+def _run_task(func, args, profile_settings=None):
+    """
+    Run one task, capturing its output and any exception.
+
+    Args:
+        func: Per-file function
+        args: Its arguments
+        profile_settings: stage_timing.settings() of the parent, for workers
+
+    Returns:
+        Dict with 'result', 'output', 'error', 'writes' and 'profile' keys
+    """
+    if profile_settings is not None:
+        stage_timing.configure(*profile_settings)
+    buffer = io.StringIO()
+    result = None
+    error = None
+    before = output_writer.stats.snapshot()
+    profile_before = stage_timing.stats.snapshot()
+    try:
+        with redirect_stdout(buffer):
+            result = func(*args)
+    except Exception:
+        error = traceback.format_exc()
+    return {'result': result, 'output': buffer.getvalue(), 'error': error,
+            'writes': output_writer.stats.since(before),
+            'profile': stage_timing.stats.since(profile_before)}
+
+
+@contextmanager
+def job_pool(jobs):
+    """
+    Process pool to share between run_jobs() calls.
+
+    Yields:
+        ProcessPoolExecutor, or None when `jobs` resolves to 1
+    """
+    jobs = resolve_jobs(jobs)
+    if jobs == 1:
+        yield None
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        yield pool
+
+
+def run_jobs(func, tasks, jobs=1, pool=None):
+    """
+    Run `func(*task)` for every task and yield outcomes in input order.
+
+    At most `jobs * 2` tasks are in flight at once, so large asset trees do
+    not queue every pending file (and its arguments) up front.
+
+    Args:
+        func: Module-level (picklable) per-file function
+        tasks: Iterable of argument tuples
+        jobs: Worker count (1 runs inline without a pool)
+        pool: Pool from job_pool() to run on; by default one is started
+            for this call
+
+    Yields:
+        (task, outcome) pairs, where outcome is the dict from _run_task
+    """
+    jobs = resolve_jobs(jobs)
+    tasks = list(tasks)
+
+    if jobs == 1 or len(tasks) <= 1:
+        for task in tasks:
+            yield task, _run_task(func, task)
+        return
+
+    if pool is None:
+        with job_pool(jobs) as pool:
+            yield from run_jobs(func, tasks, jobs, pool)
+        return
+
+    window = jobs * 2
+    pending = []
+    next_index = 0
+    while next_index < len(tasks) or pending:
+        # Keep the bounded queue topped up
+        while next_index < len(tasks) and len(pending) < window:
+            task = tasks[next_index]
+            pending.append((task, pool.submit(_run_task, func, task, stage_timing.settings())))
+            next_index += 1
+
+        # Drain strictly in submission order to preserve output order
+        task, future = pending.pop(0)
+        outcome = future.result()
+        # Inline tasks already counted in this process; pooled ones didn't
+        output_writer.stats.add(outcome['writes'])
+        stage_timing.stats.add(outcome['profile'])
+        yield task, outcome
+
+
+def replay(outcome):
+    """
+    Print a worker's captured output (and error, if any) from the parent.
+
+    Returns:
+        The worker's return value, or False if it raised
+    """
+    if outcome['output']:
+        print(outcome['output'], end='')
+    if outcome['error']:
+        print(outcome['error'], end='')
+        return False
+    return outcome['result']
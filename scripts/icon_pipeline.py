@@ -0,0 +1,475 @@
+#!/usr/bin/env python3
+"""
+Fused single-pass icon pipeline.
+
+Flattening alpha, clearing white borders, cropping edges and filling the
+background used to be separate scripts, each decoding and re-encoding the
+PNG. Here they are stages that run in sequence on one in-memory uint8 RGBA
+array: every file is decoded once and encoded once, however many stages run.
+
+The existing scripts are thin presets over this module:
+    fix_app_store_icons.remove_alpha_channel  -> flatten
+    remove_icon_border.remove_white_border    -> white-clear
+    remove_edge_border.remove_edge_border     -> edge-crop
+    analyze_and_fix_icon.fix_icon_edges       -> edge-fill
+
+Usage:
+    python3 scripts/icon_pipeline.py <icon_set_path> [output_path] --stages edge-crop,white-clear,flatten
+"""
+
+import os
+import sys
+import argparse
+from PIL import Image
+import numpy as np
+
+from background_color import detect_background_color, dominant_colors
+from icon_cache import IconCache, file_sha256
+from icon_jobs import add_jobs_argument, replay, run_jobs
+import output_writer
+import png_encoder
+import stage_timing
+
+DEFAULT_PARAMS = {
+    'threshold': 240,
+    'border_width': 3,
+    'padding': 2,
+    'background_color': 'auto',
+}
+
+
+def stage_flatten(data, params, context):
+    """
+    Composite onto a solid background color; the result is fully opaque.
+
+    A background_color of 'auto' uses the dominant color of the icon's
+    opaque perimeter (falling back to its center, then white).
+    """
+    background_color = params['background_color']
+    if background_color == 'auto':
+        background_color = detect_background_color(data, regions=('perimeter', 'center'))
+    context['background_color'] = tuple(background_color[:3])
+    background = np.array(background_color[:3], dtype=np.uint16)
+    alpha = data[:, :, 3:4].astype(np.uint16)
+    rgb = data[:, :, :3].astype(np.uint16)
+    data[:, :, :3] = ((rgb * alpha + background * (255 - alpha) + 127) // 255).astype(np.uint8)
+    data[:, :, 3] = 255
+    return data
+
+
+def _white_mask(data, threshold, out=None, scratch=None):
+    """
+    Mask of pixels whose RGB channels are all above `threshold`.
+
+    With `out`/`scratch` buffers of the right shape no temporaries are
+    allocated.
+    """
+    if out is None:
+        return (data[:, :, 0] > threshold) & \
+               (data[:, :, 1] > threshold) & \
+               (data[:, :, 2] > threshold)
+    np.greater(data[:, :, 0], threshold, out=out)
+    for channel in (1, 2):
+        np.greater(data[:, :, channel], threshold, out=scratch)
+        np.logical_and(out, scratch, out=out)
+    return out
+
+
+def stage_white_clear(data, params, context):
+    """Make every near-white pixel (RGB all above threshold) transparent."""
+    data[_white_mask(data, params['threshold']), 3] = 0
+    return data
+
+
+def _edge_bands(data, border_width):
+    """Views of the top, bottom, left and right bands (corners counted once)."""
+    height, width = data.shape[:2]
+    bw = border_width
+    if bw <= 0:
+        return []
+    return [
+        data[:bw, :],
+        data[max(height - bw, 0):, :],
+        data[bw:max(height - bw, 0), :bw],
+        data[bw:max(height - bw, 0), max(width - bw, 0):],
+    ]
+
+
+def _first_nonzero(lines, count, step, out):
+    """
+    Index of the first line (row or column) with any non-zero alpha.
+
+    Args:
+        lines: Callable (start, stop) -> 2D view whose first axis is the
+            scan direction
+        count: Number of lines to scan
+        step: Lines checked per block
+        out: Reusable bool buffer of at least `step` elements
+
+    Returns:
+        Index, or None if every line is empty
+    """
+    for start in range(0, count, step):
+        stop = min(start + step, count)
+        hits = np.any(lines(start, stop), axis=1, out=out[:stop - start])
+        if hits.any():
+            return start + int(np.argmax(hits))
+    return None
+
+
+def find_content_bbox(alpha, step=8):
+    """
+    Find the bounding box of non-transparent pixels by scanning inward from
+    each edge and stopping at the first content row/column.
+
+    Only the empty margin (plus one block) is ever read, so icons whose
+    content reaches the edges cost O(perimeter) rather than O(area).
+
+    Args:
+        alpha: 2D uint8 alpha plane (a view is fine)
+        step: Rows/columns checked per block
+
+    Returns:
+        (top, bottom, left, right) with exclusive bottom/right, or None if
+        the image has no content
+    """
+    height, width = alpha.shape
+    buffer = np.empty(step, dtype=bool)
+
+    top = _first_nonzero(lambda a, b: alpha[a:b], height, step, buffer)
+    if top is None:
+        return None
+    bottom = height - _first_nonzero(lambda a, b: alpha[height - b:height - a][::-1], height - top, step, buffer)
+    rows = alpha[top:bottom]
+    left = _first_nonzero(lambda a, b: rows[:, a:b].T, width, step, buffer)
+    right = width - _first_nonzero(lambda a, b: rows[:, width - b:width - a][:, ::-1].T, width - left, step, buffer)
+    return top, bottom, left, right
+
+
+def stage_edge_crop(data, params, context):
+    """
+    Clear near-white pixels within `border_width` of the edges, then crop to
+    the remaining content (plus `padding`) and re-centre it on a transparent
+    canvas of the original size.
+
+    Works in place: the white test only runs on the edge bands (sharing one
+    mask buffer), the content box is found by scanning inward from each edge,
+    and the re-centre is a row-by-row move inside the same array.
+    """
+    height, width = data.shape[:2]
+    threshold = params['threshold']
+
+    # Make edge white pixels transparent (bands only, one reusable buffer)
+    bands = _edge_bands(data, params['border_width'])
+    if bands:
+        size = max(band.shape[0] * band.shape[1] for band in bands)
+        mask_buffer = np.empty(size, dtype=bool)
+        scratch_buffer = np.empty(size, dtype=bool)
+        for band in bands:
+            n = band.shape[0] * band.shape[1]
+            mask = _white_mask(band, threshold,
+                               out=mask_buffer[:n].reshape(band.shape[:2]),
+                               scratch=scratch_buffer[:n].reshape(band.shape[:2]))
+            band[:, :, 3][mask] = 0
+
+    # Find the actual content bounds (non-transparent)
+    bbox = find_content_bbox(data[:, :, 3])
+    if bbox is None:
+        return data
+    top, bottom, left, right = bbox
+
+    # Add small padding to avoid cutting too close
+    padding = params['padding']
+    top = max(0, top - padding)
+    bottom = min(height, bottom + padding)
+    left = max(0, left - padding)
+    right = min(width, right + padding)
+
+    crop_h, crop_w = bottom - top, right - left
+    if (crop_h, crop_w) == (height, width):
+        return data
+
+    # Center the cropped content on a transparent canvas of the original size
+    start_y = (height - crop_h) // 2
+    start_x = (width - crop_w) // 2
+    if (start_y, start_x) != (top, left):
+        # Move row by row, ordered so no source row is overwritten before it
+        # is read; only a single row is ever buffered
+        rows = range(crop_h) if start_y <= top else range(crop_h - 1, -1, -1)
+        for i in rows:
+            data[start_y + i, start_x:start_x + crop_w] = data[top + i, left:right]
+
+    # Clear everything outside the destination box
+    data[:start_y] = 0
+    data[start_y + crop_h:] = 0
+    data[start_y:start_y + crop_h, :start_x] = 0
+    data[start_y:start_y + crop_h, start_x + crop_w:] = 0
+    return data
+
+
+def stage_edge_fill(data, params, context):
+    """Fill transparent areas with the most common color around the center."""
+    colors = dominant_colors(data, regions=('center',), top_k=1)
+    if not colors:
+        # Fallback: just drop alpha
+        data[:, :, 3] = 255
+        return data
+    return stage_flatten(data, dict(params, background_color=colors[0][0]), context)
+
+
+# name -> (stage function, produces an opaque result, params it depends on)
+STAGES = {
+    'flatten': (stage_flatten, True, ('background_color',)),
+    'white-clear': (stage_white_clear, False, ('threshold',)),
+    'edge-crop': (stage_edge_crop, False, ('threshold', 'border_width', 'padding')),
+    'edge-fill': (stage_edge_fill, True, ()),
+}
+
+
+def parse_stages(spec):
+    """
+    Parse a comma-separated stage list such as 'edge-crop,white-clear,flatten'.
+
+    Raises:
+        ValueError: For unknown stage names
+    """
+    names = [name.strip() for name in spec.split(',') if name.strip()]
+    unknown = [name for name in names if name not in STAGES]
+    if unknown:
+        raise ValueError(f"unknown stage(s): {', '.join(unknown)} (available: {', '.join(STAGES)})")
+    if not names:
+        raise ValueError("no stages given")
+    return names
+
+
+def stage_params(stages, params=None):
+    """Return the subset of params the given stages depend on (for caching)."""
+    merged = dict(DEFAULT_PARAMS, **(params or {}))
+    keys = sorted({key for name in stages for key in STAGES[name][2]})
+    return {key: merged[key] for key in keys}
+
+
+def decode_rgba(image_path):
+    """Decode an image into a writable uint8 RGBA array."""
+    if stage_timing.enabled:
+        stage_timing.count('bytes_read', os.path.getsize(image_path))
+    with stage_timing.stage('decode'), Image.open(image_path) as img:
+        return np.array(img.convert('RGBA'))
+
+
+def encode_png(data, output_path, opaque=False, preset=None):
+    """
+    Encode an RGBA array to PNG in memory and write it if it changed.
+
+    Args:
+        data: uint8 RGBA array
+        output_path: Destination path
+        opaque: Drop the alpha channel and write RGB
+        preset: PNG encoder preset (see png_encoder.PRESETS)
+
+    Returns:
+        True if the file was written, False if it already had these bytes
+    """
+    if opaque:
+        data = np.ascontiguousarray(data[:, :, :3])
+    return output_writer.save_png(Image.fromarray(data), output_path, preset=preset)
+
+
+@stage_timing.timed
+def apply_pipeline(image_path, output_path, stages, params=None, preset=None):
+    """
+    Decode once, run every stage on the same array, encode once.
+
+    Args:
+        image_path: Path to input image
+        output_path: Path to save processed image
+        stages: List of stage names (see STAGES)
+        params: Optional overrides for DEFAULT_PARAMS
+        preset: PNG encoder preset (see png_encoder.PRESETS)
+
+    Returns:
+        Context dict with any values stages reported (e.g. detected color),
+        plus 'written' (False when the output already had identical bytes)
+    """
+    params = dict(DEFAULT_PARAMS, **(params or {}))
+    context = {}
+    data = decode_rgba(image_path)
+
+    opaque = False
+    for name in stages:
+        func, makes_opaque, _ = STAGES[name]
+        with stage_timing.stage(name):
+            data = func(data, params, context)
+        opaque = makes_opaque
+
+    context['written'] = encode_png(data, output_path, opaque=opaque, preset=preset)
+    stage_timing.count('files_processed')
+    return context
+
+
+def run_pipeline(image_path, output_path, stages, params=None, preset=None):
+    """
+    Worker entry point: apply the pipeline and report the outcome.
+
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        context = apply_pipeline(image_path, output_path, stages, params, preset)
+        note = "" if context['written'] else " (unchanged)"
+        print(f"✓ Processed: {os.path.basename(output_path)}{note}")
+        return True
+    except Exception as e:
+        print(f"✗ Error processing {image_path}: {e}")
+        return False
+
+
+@stage_timing.timed
+def process_icon_set(icon_set_path, output_path=None, stages=('flatten',), params=None,
+                     jobs=1, use_cache=True, preset=None):
+    """
+    Run a pipeline over all PNG files in an icon set directory.
+
+    Args:
+        icon_set_path: Path to .appiconset directory
+        output_path: Optional output directory (defaults to in place, keeping
+            the original as <file>.backup)
+        stages: List of stage names
+        params: Optional overrides for DEFAULT_PARAMS
+        jobs: Number of worker processes
+        use_cache: Skip files the catalog manifest says are already processed
+        preset: PNG encoder preset (see png_encoder.PRESETS)
+    """
+    if not os.path.exists(icon_set_path):
+        print(f"Error: Directory not found: {icon_set_path}")
+        return False
+
+    # Get all PNG files
+    png_files = sorted(f for f in os.listdir(icon_set_path) if f.endswith('.png'))
+
+    if not png_files:
+        print(f"No PNG files found in {icon_set_path}")
+        return False
+
+    print(f"Found {len(png_files)} icon files to process...")
+    print(f"Processing icons in: {icon_set_path}\n")
+
+    stages = list(stages)
+    operation = ','.join(stages)
+    # The preset changes the output bytes, so it is part of the cache key
+    cache_params = dict(stage_params(stages, params), png_preset=preset or png_encoder.DEFAULT_PRESET)
+
+    if output_path:
+        os.makedirs(output_path, exist_ok=True)
+    cache = IconCache.for_path(output_path or icon_set_path) if use_cache else None
+
+    # Plan each file (backups are made here, before any worker starts)
+    tasks = []
+    input_hashes = {}
+    with stage_timing.stage('plan'):
+        for png_file in png_files:
+            input_path = os.path.join(icon_set_path, png_file)
+
+            if output_path:
+                output_file = os.path.join(output_path, png_file)
+            else:
+                output_file = input_path
+
+            if cache and cache.is_fresh(input_path, output_file, operation, cache_params):
+                continue
+
+            if not output_path:
+                # Backup original and replace
+                backup_path = input_path + '.backup'
+                if not os.path.exists(backup_path):
+                    os.rename(input_path, backup_path)
+                    # The original now lives in the backup; read it from there
+                    input_path = backup_path
+
+            if cache:
+                input_hashes[output_file] = file_sha256(input_path)
+            tasks.append((input_path, output_file, stages, params, preset))
+
+    # Process each file, replaying worker output in the original order
+    success_count = 0
+    for (input_path, output_file, _, _, _), outcome in run_jobs(run_pipeline, tasks, jobs):
+        if replay(outcome):
+            success_count += 1
+            if cache:
+                cache.record(input_hashes[output_file], input_path, output_file,
+                             operation, cache_params)
+
+    skipped = 0
+    if cache:
+        skipped = cache.skipped
+        stage_timing.count('files_skipped', skipped)
+        if skipped:
+            print(f"⏭ Skipped {skipped} unchanged icon(s)")
+        cache.save()
+    output_writer.report()
+
+    print(f"\n✓ Successfully processed {success_count}/{len(png_files) - skipped} icons")
+    return success_count + skipped == len(png_files)
+
+
+def parse_color(value):
+    """Parse 'R,G,B' (or 'auto') into an RGB tuple (argparse type)."""
+    if value == 'auto':
+        return value
+    try:
+        parts = tuple(int(p) for p in value.split(','))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid color '{value}', expected R,G,B")
+    if len(parts) != 3 or not all(0 <= p <= 255 for p in parts):
+        raise argparse.ArgumentTypeError(f"invalid color '{value}', expected R,G,B")
+    return parts
+
+
+def add_pipeline_arguments(parser):
+    """Add the stage parameter options shared by the pipeline presets."""
+    parser.add_argument("--threshold", type=int, default=DEFAULT_PARAMS['threshold'],
+                        help="RGB threshold for \"white\" (0-255, default 240)")
+    parser.add_argument("--border-width", type=int, default=DEFAULT_PARAMS['border_width'],
+                        help="Edge band checked by edge-crop (default 3 pixels)")
+    parser.add_argument("--background-color", type=parse_color, default=DEFAULT_PARAMS['background_color'],
+                        help="Flatten background as R,G,B, or 'auto' to detect it (default auto)")
+
+
+def params_from_args(args):
+    """Build a params dict from parsed pipeline arguments."""
+    return {
+        'threshold': args.threshold,
+        'border_width': args.border_width,
+        'background_color': args.background_color,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run icon processing stages in one decode/encode pass per file",
+        epilog="Stages: " + ", ".join(STAGES),
+    )
+    parser.add_argument("icon_set_path", help="Path to .appiconset directory")
+    parser.add_argument("output_path", nargs="?", help="Optional output directory (defaults to in-place with .backup)")
+    parser.add_argument("--stages", default="flatten", help="Comma-separated stages, run in order (default: flatten)")
+    add_pipeline_arguments(parser)
+    add_jobs_argument(parser)
+    parser.add_argument("--no-cache", action="store_true", help="Reprocess every file, ignoring the catalog manifest")
+    png_encoder.add_preset_argument(parser)
+    stage_timing.add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    try:
+        stages = parse_stages(args.stages)
+    except ValueError as e:
+        parser.error(str(e))
+
+    with stage_timing.Session(args, 'icon_pipeline'):
+        success = process_icon_set(args.icon_set_path, args.output_path, stages=stages,
+                                   params=params_from_args(args), jobs=args.jobs,
+                                   use_cache=not args.no_cache, preset=args.png_preset)
+    return 0 if success else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
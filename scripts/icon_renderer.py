@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Render every iOS and watchOS app icon size from a single master image.
+
+The master is decoded and flattened onto an opaque background exactly once.
+A downscale pyramid (1024 -> 512 -> 256 ...) is then built from it, and each
+output size is resampled from the nearest pyramid level that is at least as
+large as the target. This replaces the per-size `sips -z` calls in
+generate_icons.sh / generate_watch_icons.sh and runs anywhere Pillow does.
+The marketing icons are still copied from the master file byte for byte.
+
+Usage:
+    python3 scripts/icon_renderer.py [--only ios|watch]
+"""
+
+import os
+import sys
+import argparse
+from PIL import Image
+
+import output_writer
+import png_encoder
+
+IOS_MASTER_CANDIDATES = [
+    "Plena/Assets.xcassets/PlenaRoundedAppIcon_v2.appiconset/icon_1024x1024_ios-marketing_app_1x.png",
+    "Plena/Assets.xcassets/AppIcon.appiconset/icon_ios_marketing_1024.png",
+]
+WATCH_MASTER = "Plena/Assets.xcassets/PlenaRoundedAppIcon_v2.appiconset/icon_1024x1024_watch-marketing_app_1x.png"
+
+IOS_OUTPUT_DIR = "Plena/Assets.xcassets/AppIcon.appiconset"
+WATCH_OUTPUT_DIR = "Plena Watch App/Assets.xcassets/AppIcon.appiconset"
+
+# (pixel size, filename suffix) - mirrors the tables in generate_icons.sh
+IOS_ICON_SIZES = [
+    (180, "iphone_app_3x"),     # 60pt @ 3x
+    (120, "iphone_app_2x"),     # 60pt @ 2x
+    (120, "iphone_app_3x"),     # 40pt @ 3x
+    (87, "iphone_app_3x"),      # 29pt @ 3x
+    (80, "iphone_app_2x"),      # 40pt @ 2x
+    (60, "iphone_app_3x"),      # 20pt @ 3x
+    (58, "iphone_app_2x"),      # 29pt @ 2x
+    (40, "iphone_app_2x"),      # 20pt @ 2x
+    (167, "ipad_app_2x"),       # 83.5pt @ 2x
+    (152, "ipad_app_2x"),       # 76pt @ 2x
+    (80, "ipad_app_2x"),        # 40pt @ 2x
+    (76, "ipad_app_1x"),        # 76pt @ 1x
+    (58, "ipad_app_2x"),        # 29pt @ 2x
+    (40, "ipad_app_2x"),        # 20pt @ 2x
+    (40, "ipad_app_1x"),        # 40pt @ 1x
+    (29, "ipad_app_1x"),        # 29pt @ 1x
+    (20, "ipad_app_1x"),        # 20pt @ 1x
+    (1024, "ios-marketing_app_1x"),
+]
+
+# (pixel size, filename suffix) - mirrors the tables in generate_watch_icons.sh
+WATCH_ICON_SIZES = [
+    (196, "watch_quickLook_2x"),            # 98pt @ 2x (42mm)
+    (172, "watch_quickLook_2x"),            # 86pt @ 2x (38mm)
+    (88, "watch_appLauncher_2x"),           # 44pt @ 2x (42mm)
+    (80, "watch_appLauncher_2x"),           # 40pt @ 2x (38mm)
+    (55, "watch_notificationCenter_2x"),    # 27.5pt @ 2x (42mm)
+    (48, "watch_notificationCenter_2x"),    # 24pt @ 2x (38mm)
+    (58, "watch_companionSettings_2x"),     # 29pt @ 2x
+    (1024, "watch-marketing_app_1x"),
+]
+
+
+def flatten_image(img, background_color=(255, 255, 255)):
+    """
+    Composite an image onto a solid background and return an opaque RGB image.
+
+    Args:
+        img: PIL image in any mode
+        background_color: RGB tuple for background (default white)
+
+    Returns:
+        RGB PIL image
+    """
+    if img.mode in ('RGBA', 'LA', 'P'):
+        if img.mode != 'RGBA':
+            img = img.convert('RGBA')
+        background = Image.new('RGB', img.size, background_color)
+        background.paste(img, mask=img.getchannel('A'))
+        return background
+    if img.mode != 'RGB':
+        return img.convert('RGB')
+    return img
+
+
+def load_master(image_path, background_color=(255, 255, 255)):
+    """
+    Decode a master icon once and flatten it to opaque RGB.
+
+    Args:
+        image_path: Path to master icon
+        background_color: RGB tuple used where the master is transparent
+
+    Returns:
+        RGB PIL image (fully loaded, file handle closed)
+    """
+    with Image.open(image_path) as img:
+        img.load()
+        return flatten_image(img, background_color)
+
+
+def build_pyramid(master, min_size=1):
+    """
+    Build a downscale pyramid by repeatedly halving the master.
+
+    Args:
+        master: Opaque PIL image (level 0)
+        min_size: Stop once the next level would be smaller than this
+
+    Returns:
+        List of PIL images, largest first
+    """
+    levels = [master]
+    current = master
+    while min(current.size) // 2 >= min_size:
+        current = current.reduce(2)
+        levels.append(current)
+    return levels
+
+
+def resample_from_pyramid(levels, size):
+    """
+    Resample a square icon from the smallest pyramid level not below `size`.
+
+    Args:
+        levels: Pyramid from build_pyramid (largest first)
+        size: Target edge length in pixels
+
+    Returns:
+        PIL image of size x size
+    """
+    source = levels[0]
+    for level in levels:
+        if min(level.size) >= size:
+            source = level
+        else:
+            break
+    if source.size == (size, size):
+        return source
+    return source.resize((size, size), Image.Resampling.LANCZOS)
+
+
+def render_sizes(master, sizes):
+    """
+    Render every requested pixel size from an already-decoded master.
+
+    Identical sizes are rendered once.
+
+    Args:
+        master: Opaque PIL image
+        sizes: Iterable of pixel sizes
+
+    Returns:
+        Dict mapping pixel size -> PIL image
+    """
+    unique_sizes = sorted(set(sizes), reverse=True)
+    if not unique_sizes:
+        return {}
+    levels = build_pyramid(master, min_size=min(unique_sizes))
+    return {size: resample_from_pyramid(levels, size) for size in unique_sizes}
+
+
+def write_icon_set(master, icon_sizes, output_dir, preset=None, master_path=None):
+    """
+    Render and save an icon table into an .appiconset directory.
+
+    Each distinct pixel size is resampled and encoded once; slots sharing a
+    pixel size reuse the encoded bytes. Files that already hold those bytes
+    are not rewritten.
+
+    Args:
+        master: Opaque PIL image
+        icon_sizes: List of (pixel size, filename suffix) tuples
+        output_dir: Destination .appiconset directory
+        preset: PNG encoder preset (see png_encoder.PRESETS)
+        master_path: The master's file; slots of its own size (the 1024px
+            marketing icons) get a byte-for-byte copy of it instead of a
+            re-encoded render, as generate_icons.sh and
+            generate_watch_icons.sh have always done
+
+    Returns:
+        Number of files written (unchanged files are not counted)
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    copied = master.width if master_path and master.width == master.height else None
+    rendered = render_sizes(master, [size for size, _ in icon_sizes if size != copied])
+
+    encoded = {}
+    written = 0
+    for size, suffix in icon_sizes:
+        output_file = os.path.join(output_dir, f"icon_{size}x{size}_{suffix}.png")
+        if size not in encoded:
+            if size == copied:
+                with open(master_path, 'rb') as f:
+                    encoded[size] = f.read()
+            else:
+                encoded[size] = output_writer.encode_png(rendered[size], preset=preset)
+        if output_writer.write_bytes(output_file, encoded[size]):
+            print(f"    ✅ {'Copied' if size == copied else 'Created'}: {os.path.basename(output_file)}")
+            written += 1
+        else:
+            print(f"    ✓ Unchanged: {os.path.basename(output_file)}")
+    return written
+
+
+def find_ios_master():
+    """Return the first existing iOS master icon path, or None."""
+    for candidate in IOS_MASTER_CANDIDATES:
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render all app icon sizes from the master icon")
+    parser.add_argument("--only", choices=["ios", "watch"], help="Render only one icon set")
+    parser.add_argument("--ios-master", help="Override iOS master icon path")
+    parser.add_argument("--watch-master", help="Override watch master icon path")
+    parser.add_argument("--ios-output", default=IOS_OUTPUT_DIR, help="iOS .appiconset output directory")
+    parser.add_argument("--watch-output", default=WATCH_OUTPUT_DIR, help="Watch .appiconset output directory")
+    png_encoder.add_preset_argument(parser)
+    args = parser.parse_args()
+
+    ios_master = args.ios_master or find_ios_master()
+    # As generate_watch_icons.sh always did: the watch marketing master, else
+    # the PlenaRoundedAppIcon_v2 iOS master (not the older AppIcon copy)
+    watch_master = args.watch_master or (WATCH_MASTER if os.path.exists(WATCH_MASTER) else IOS_MASTER_CANDIDATES[0])
+
+    decoded = {}
+
+    def master_for(path):
+        # Each distinct master file is decoded exactly once per run
+        key = os.path.realpath(path)
+        if key not in decoded:
+            decoded[key] = load_master(path)
+        return decoded[key]
+
+    if args.only in (None, "ios"):
+        if not ios_master or not os.path.exists(ios_master):
+            print(f"❌ Error: Master icon not found at {ios_master}")
+            return 1
+        print("📱 Generating iOS icons...")
+        print(f"Master icon: {ios_master}")
+        print(f"Output directory: {args.ios_output}")
+        write_icon_set(master_for(ios_master), IOS_ICON_SIZES, args.ios_output, preset=args.png_preset,
+                       master_path=ios_master)
+        print("")
+
+    if args.only in (None, "watch"):
+        if not watch_master or not os.path.exists(watch_master):
+            print("❌ Error: Master icon not found")
+            return 1
+        print("⌚ Generating watch app icons...")
+        print(f"Master: {watch_master}")
+        print(f"Output: {args.watch_output}")
+        write_icon_set(master_for(watch_master), WATCH_ICON_SIZES, args.watch_output, preset=args.png_preset,
+                       master_path=watch_master)
+        print("")
+
+    output_writer.report()
+    print(f"✅ Icon generation complete! ({len(decoded)} master decode(s))")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Plan and fill app icon slots from an .appiconset's Contents.json.
+
+Contents.json is loaded into an in-memory model once. Its slots are combined
+with Apple's size/idiom/scale table for the requested platforms (iOS,
+watchOS) to work out every required pixel size. Identical pixel sizes are
+deduplicated across slots, so each size is resampled and PNG-encoded only
+once from a single decoded master. Contents.json is written once at the end,
+atomically, and only if something changed.
+
+Usage:
+    python3 scripts/icon_slots.py <icon_set> [--platform ios|watch] [--master PATH] [--dry-run]
+"""
+
+import os
+import sys
+import json
+import argparse
+
+import output_writer
+import png_encoder
+from png_preflight import preflight
+
+SLOT_KEYS = ('idiom', 'size', 'scale', 'role', 'subtype')
+
+# Apple app icon slots per platform: (idiom, size in points, scale, role, subtype)
+SLOT_SPECS = {
+    'ios': [
+        ('iphone', '20x20', '2x', None, None),
+        ('iphone', '20x20', '3x', None, None),
+        ('iphone', '29x29', '2x', None, None),
+        ('iphone', '29x29', '3x', None, None),
+        ('iphone', '40x40', '2x', None, None),
+        ('iphone', '40x40', '3x', None, None),
+        ('iphone', '60x60', '2x', None, None),
+        ('iphone', '60x60', '3x', None, None),
+        ('ipad', '20x20', '1x', None, None),
+        ('ipad', '20x20', '2x', None, None),
+        ('ipad', '29x29', '1x', None, None),
+        ('ipad', '29x29', '2x', None, None),
+        ('ipad', '40x40', '1x', None, None),
+        ('ipad', '40x40', '2x', None, None),
+        ('ipad', '76x76', '1x', None, None),
+        ('ipad', '76x76', '2x', None, None),
+        ('ipad', '83.5x83.5', '2x', None, None),
+        ('ios-marketing', '1024x1024', '1x', None, None),
+    ],
+    'watch': [
+        ('watch', '24x24', '2x', 'notificationCenter', '38mm'),
+        ('watch', '27.5x27.5', '2x', 'notificationCenter', '42mm'),
+        ('watch', '29x29', '2x', 'companionSettings', None),
+        ('watch', '29x29', '3x', 'companionSettings', None),
+        ('watch', '33x33', '2x', 'notificationCenter', '45mm'),
+        ('watch', '40x40', '2x', 'appLauncher', '38mm'),
+        ('watch', '44x44', '2x', 'appLauncher', '40mm'),
+        ('watch', '46x46', '2x', 'appLauncher', '41mm'),
+        ('watch', '50x50', '2x', 'appLauncher', '44mm'),
+        ('watch', '51x51', '2x', 'appLauncher', '45mm'),
+        ('watch', '54x54', '2x', 'appLauncher', '49mm'),
+        ('watch', '86x86', '2x', 'quickLook', '38mm'),
+        ('watch', '98x98', '2x', 'quickLook', '42mm'),
+        ('watch', '108x108', '2x', 'quickLook', '44mm'),
+        ('watch', '117x117', '2x', 'quickLook', '45mm'),
+        ('watch', '129x129', '2x', 'quickLook', '49mm'),
+        ('watch-marketing', '1024x1024', '1x', None, None),
+    ],
+}
+
+
+def slot_key(entry):
+    """Identity of a slot: its idiom/size/scale/role/subtype, ignoring filename."""
+    return tuple(entry.get(key) for key in SLOT_KEYS)
+
+
+def spec_entries(platform):
+    """Return the Contents.json entries Apple expects for a platform."""
+    return [{key: value for key, value in zip(SLOT_KEYS, spec) if value is not None}
+            for spec in SLOT_SPECS[platform]]
+
+
+def pixel_size(entry):
+    """
+    Return the (width, height) in pixels for a slot, or None.
+
+    Only slots with both `size` ("83.5x83.5") and `scale` ("2x") have a
+    fixed pixel size.
+    """
+    size = entry.get('size')
+    scale = entry.get('scale')
+    if not size or not scale or 'x' not in size:
+        return None
+    try:
+        width_pt, height_pt = (float(v) for v in size.split('x'))
+        factor = float(scale.rstrip('x'))
+    except ValueError:
+        return None
+    return int(round(width_pt * factor)), int(round(height_pt * factor))
+
+
+def slot_filename(entry):
+    """
+    Build the filename for a generated slot.
+
+    Follows the icon_renderer naming: icon_{px}x{px}_{idiom}_{role}_{scale}.png,
+    with the watch subtype appended so every slot gets a distinct name.
+    """
+    width, height = pixel_size(entry)
+    parts = [entry['idiom'], entry.get('role', 'app')]
+    if entry.get('subtype'):
+        parts.append(entry['subtype'])
+    parts.append(entry['scale'])
+    return f"icon_{width}x{height}_{'_'.join(parts)}.png"
+
+
+def dump_contents(contents):
+    """Serialize Contents.json the way Xcode writes it."""
+    return json.dumps(contents, indent=2, sort_keys=True, separators=(',', ' : ')) + '\n'
+
+
+class IconSetContents:
+    """In-memory model of an .appiconset's Contents.json."""
+
+    def __init__(self, icon_set_path):
+        self.path = icon_set_path
+        self.contents_path = os.path.join(icon_set_path, 'Contents.json')
+        with open(self.contents_path, 'r') as f:
+            self.original = f.read()
+        self.contents = json.loads(self.original)
+        self.contents.setdefault('images', [])
+
+    @property
+    def images(self):
+        return self.contents['images']
+
+    def add_spec_slots(self, platform):
+        """
+        Append any slots from SLOT_SPECS[platform] that Contents.json lacks.
+
+        Returns:
+            Number of slots added
+        """
+        present = {slot_key(entry) for entry in self.images}
+        added = 0
+        for entry in spec_entries(platform):
+            if slot_key(entry) not in present:
+                self.images.append(entry)
+                present.add(slot_key(entry))
+                added += 1
+        return added
+
+    def missing_slots(self):
+        """
+        Return the slots that need a generated image.
+
+        A slot is missing when it has no filename, or its file is gone. Slots
+        without a fixed pixel size (single-size, role-only) are skipped.
+        """
+        missing = []
+        for entry in self.images:
+            if pixel_size(entry) is None:
+                continue
+            filename = entry.get('filename')
+            if not filename or not os.path.exists(os.path.join(self.path, filename)):
+                missing.append(entry)
+        return missing
+
+    def find_master(self):
+        """
+        Return the largest referenced image (by header dimensions), or None.
+
+        Dimensions come from the PNG header; nothing is decoded.
+        """
+        best = None
+        best_area = 0
+        for entry in self.images:
+            filename = entry.get('filename')
+            if not filename:
+                continue
+            info = preflight(os.path.join(self.path, filename))
+            if info and info['width'] * info['height'] > best_area:
+                best_area = info['width'] * info['height']
+                best = os.path.join(self.path, filename)
+        return best
+
+    def save(self):
+        """
+        Write Contents.json atomically if the model changed.
+
+        Returns:
+            True if the file was written
+        """
+        # Compare parsed content so hand-formatted files aren't reformatted for nothing
+        if self.contents == json.loads(self.original):
+            return False
+        data = dump_contents(self.contents)
+        written = output_writer.write_text(self.contents_path, data)
+        self.original = data
+        return written
+
+
+def plan_sizes(slots):
+    """
+    Group slots by pixel size so each size is rendered once.
+
+    Returns:
+        Dict mapping (width, height) -> list of slot entries
+    """
+    plan = {}
+    for entry in slots:
+        plan.setdefault(pixel_size(entry), []).append(entry)
+    return plan
+
+
+def fill_missing_slots(icon_set_path, platforms=(), master_path=None, dry_run=False, model=None, preset=None):
+    """
+    Generate every missing slot of an icon set from one decoded master.
+
+    Args:
+        icon_set_path: Path to .appiconset directory
+        platforms: Platforms from SLOT_SPECS whose slots must all be present
+        master_path: Source image (defaults to the largest referenced image)
+        dry_run: Only report what would be generated
+        model: Already-loaded IconSetContents for the set (loaded if None)
+        preset: PNG encoder preset (see png_encoder.PRESETS)
+
+    Returns:
+        (number of files created, number of distinct sizes rendered), or
+        None if no master could be found
+    """
+    from icon_renderer import load_master, render_sizes
+
+    model = model or IconSetContents(icon_set_path)
+    added = sum(model.add_spec_slots(platform) for platform in platforms)
+    if added:
+        print(f"\n+ Added {added} slot(s) from the Apple size table")
+
+    missing = model.missing_slots()
+    if not missing:
+        if not dry_run:
+            model.save()
+        return 0, 0
+
+    master_path = master_path or model.find_master()
+    if not master_path:
+        print("✗ No source icon found to create missing icons")
+        return None
+
+    plan = plan_sizes(missing)
+    print(f"\nCreating {len(missing)} missing icon(s) in {len(plan)} distinct size(s) from "
+          f"{os.path.basename(master_path)}...")
+    if dry_run:
+        for (width, height), entries in sorted(plan.items()):
+            for entry in entries:
+                print(f"  {width}x{height} -> {slot_filename(entry)}")
+        return 0, len(plan)
+
+    # Decode and flatten once; each distinct square size is resampled once
+    master = load_master(master_path)
+    square = [width for (width, height) in plan if width == height]
+    rendered = render_sizes(master, square)
+
+    created = 0
+    for (width, height), entries in sorted(plan.items()):
+        image = rendered.get(width) if width == height else None
+        if image is None:
+            from PIL import Image
+            image = master.resize((width, height), Image.Resampling.LANCZOS)
+        encoded = output_writer.encode_png(image, preset=preset)
+
+        for entry in entries:
+            filename = entry.get('filename') or slot_filename(entry)
+            output_writer.write_bytes(os.path.join(icon_set_path, filename), encoded)
+            entry['filename'] = filename
+            created += 1
+            print(f"✓ Created: {filename} ({width}x{height})")
+
+    if model.save():
+        print("✓ Updated Contents.json")
+    return created, len(plan)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate every missing app icon slot from one master image")
+    parser.add_argument("icon_set_path", help="Path to .appiconset directory")
+    parser.add_argument("--platform", action="append", choices=sorted(SLOT_SPECS),
+                        help="Also add any Apple-required slots for this platform (repeatable)")
+    parser.add_argument("--master", help="Source image (default: largest image in the set)")
+    parser.add_argument("--dry-run", action="store_true", help="Only list what would be generated")
+    png_encoder.add_preset_argument(parser)
+    args = parser.parse_args()
+
+    if not os.path.exists(os.path.join(args.icon_set_path, 'Contents.json')):
+        print(f"Error: Contents.json not found in {args.icon_set_path}")
+        return 1
+
+    result = fill_missing_slots(args.icon_set_path, platforms=args.platform or (),
+                                master_path=args.master, dry_run=args.dry_run, preset=args.png_preset)
+    if result is None:
+        return 1
+    created, sizes = result
+    output_writer.report()
+    print(f"\n✓ {created} icon(s) created from {sizes} rendered size(s)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
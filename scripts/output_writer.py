@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Write-if-changed output layer shared by the Python scripts.
+
+Everything is encoded to memory first and compared with what is already on
+disk (size, then sha256). Only when the content differs is it written, via a
+temp file in the same directory and an atomic rename. Unchanged files keep
+their mtime, so actool and Xcode don't see a modified asset catalog or
+project after a tooling run that had nothing to do, and incremental builds
+stay incremental.
+
+Counts of written and skipped files are kept per process; icon_jobs merges
+the counts from worker processes back into the parent.
+"""
+
+import os
+
+import stage_timing
+
+
+class WriteStats:
+    """Counters for files written vs. left untouched."""
+
+    def __init__(self):
+        self.written = 0
+        self.skipped = 0
+
+    def snapshot(self):
+        return (self.written, self.skipped)
+
+    def since(self, snapshot):
+        """Return the (written, skipped) delta since a snapshot."""
+        return (self.written - snapshot[0], self.skipped - snapshot[1])
+
+    def add(self, delta):
+        """Merge a (written, skipped) delta, e.g. from a worker process."""
+        self.written += delta[0]
+        self.skipped += delta[1]
+
+
+stats = WriteStats()
+
+
+def content_matches(path, data):
+    """
+    Check whether `path` already holds exactly `data`.
+
+    A size mismatch answers without reading the file (or importing
+    hashlib).
+    """
+    import hashlib
+
+    try:
+        if os.stat(path).st_size != len(data):
+            return False
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    except OSError:
+        return False
+    return digest.digest() == hashlib.sha256(data).digest()
+
+
+def write_bytes(path, data, count=True, fsync=False):
+    """
+    Write `data` to `path` unless the file already has that content.
+
+    Args:
+        path: Destination file
+        data: Bytes to write
+        count: Include this file in the written/skipped stats
+        fsync: Flush the temp file and the directory to disk, so a crash
+            leaves either the old or the new file, never a torn one
+
+    Returns:
+        True if the file was written, False if it was already up to date
+    """
+    with stage_timing.stage('write'):
+        return _write_bytes(os.fspath(path), data, count, fsync)
+
+
+def _write_bytes(path, data, count, fsync):
+    if content_matches(path, data):
+        if count:
+            stats.skipped += 1
+        return False
+
+    directory, name = os.path.split(path)
+    tmp_path = os.path.join(directory, f".{name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        if os.path.exists(path):
+            # Keep the permissions of the file being replaced
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o7777)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    if fsync:
+        _fsync_directory(directory)
+    if count:
+        stats.written += 1
+    stage_timing.count('bytes_written', len(data))
+    return True
+
+
+def _fsync_directory(directory):
+    """Persist a rename; not supported on every platform, so best effort."""
+    try:
+        fd = os.open(directory or '.', os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def write_text(path, text, encoding='utf-8', count=True, fsync=False):
+    """Text variant of write_bytes."""
+    return write_bytes(path, text.encode(encoding), count=count, fsync=fsync)
+
+
+def encode_png(image, preset=None):
+    """Encode a PIL image to PNG bytes in memory (see png_encoder.PRESETS)."""
+    # Imported here so the project scripts, which only write text, don't load it
+    import png_encoder
+
+    return png_encoder.encode(image, preset)
+
+
+def save_png(image, path, preset=None):
+    """Encode a PIL image and write it only if the bytes changed."""
+    return write_bytes(path, encode_png(image, preset=preset))
+
+
+def report():
+    """Print how many files were left untouched, if any."""
+    if stats.skipped:
+        print(f"⏭ {stats.skipped} output file(s) unchanged on disk, not rewritten")
@@ -0,0 +1,658 @@
+#!/usr/bin/env python3
+"""
+Object-graph model of an Xcode project.pbxproj.
+
+project.pbxproj is an OpenStep-style property list: a root dictionary whose
+`objects` entry maps 24-hex-digit IDs to dictionaries with an `isa` type.
+This module parses it into PBXObject instances indexed by ID and by isa, so
+every lookup is a dict access instead of a regex over the whole file, and
+serializes it back in Xcode's own layout:
+
+- objects grouped into `/* Begin <isa> section */` blocks, sections sorted
+  by isa
+- objects sorted by ID within a section
+- PBXBuildFile and PBXFileReference written on a single line, everything
+  else one key per line, tab-indented
+- `isa` first, remaining keys sorted
+- every object reference followed by the `/* comment */` Xcode derives from
+  the referenced object
+
+Objects that were not modified are written back from their original text,
+so a parse + serialize round trip is byte-identical even for files that
+were hand-edited into a slightly non-canonical shape. Edits are applied as
+one batch: replacements for modified objects, insertions for new objects
+(at their ID position when the section is sorted the way Xcode writes it,
+otherwise at the end of the section) and removals are collected, sorted by
+offset and spliced into the original text in a single linear pass, so
+adding hundreds of files costs one rewrite.
+
+Usage:
+    python3 scripts/pbxproj.py [project.pbxproj] [--check-roundtrip] [--canonical]
+"""
+
+import os
+import re
+import sys
+import copy
+import bisect
+
+DEFAULT_PROJECT_FILE = "Plena.xcodeproj/project.pbxproj"
+
+HEADER = "// !$*UTF8*$!\n"
+TAB = '\t'
+
+# isa types Xcode writes on a single line
+SINGLE_LINE_ISAS = {'PBXBuildFile', 'PBXFileReference'}
+
+# Keys whose ID values Xcode does not annotate with a comment
+UNANNOTATED_KEYS = {'remoteGlobalIDString', 'TargetAttributes'}
+
+# Default names of unnamed build phases (used in comments)
+PHASE_NAMES = {
+    'PBXSourcesBuildPhase': 'Sources',
+    'PBXFrameworksBuildPhase': 'Frameworks',
+    'PBXResourcesBuildPhase': 'Resources',
+    'PBXHeadersBuildPhase': 'Headers',
+    'PBXCopyFilesBuildPhase': 'CopyFiles',
+    'PBXShellScriptBuildPhase': 'ShellScript',
+    'PBXRezBuildPhase': 'Rez',
+}
+
+ID_PATTERN = re.compile(r'^[0-9A-F]{24}$')
+
+# Strings made only of these characters are written without quotes
+_UNQUOTED = re.compile(r'^[A-Za-z0-9_$/:.]+$')
+
+_TOKEN = re.compile(r'''
+      (?P<ws>\s+)
+    | (?P<comment>/\*.*?\*/|//[^\n]*)
+    | (?P<quoted>"(?:[^"\\]|\\.)*")
+    | (?P<punct>[{}()=;,])
+    | (?P<word>[^\s{}()=;,"]+)
+''', re.S | re.X)
+
+_SECTION_MARKER = re.compile(r'/\* (Begin|End) (\w+) section \*/')
+
+_ESCAPES = {'n': '\n', 't': '\t', '"': '"', '\\': '\\', "'": "'"}
+
+
+class PBXParseError(ValueError):
+    """Raised when project.pbxproj is not a well-formed OpenStep plist."""
+
+
+def _unescape(text):
+    return re.sub(r'\\(.)', lambda m: _ESCAPES.get(m.group(1), m.group(1)), text)
+
+
+def quote(value):
+    """Quote a string the way Xcode does (bare if it only has safe characters)."""
+    if value and _UNQUOTED.match(value) and '___' not in value and '//' not in value:
+        return value
+    escaped = value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n').replace('\t', '\\t')
+    return f'"{escaped}"'
+
+
+def new_id(existing=()):
+    """Generate a fresh 24-hex-digit object ID not in `existing`."""
+    while True:
+        object_id = os.urandom(12).hex().upper()
+        if object_id not in existing:
+            return object_id
+
+
+class PBXObject:
+    """One entry of the `objects` dictionary."""
+
+    __slots__ = ('id', 'fields', 'span', '_original')
+
+    def __init__(self, object_id, fields, span=None):
+        self.id = object_id
+        self.fields = fields
+        # (start, end) offsets of the definition lines in the parsed text
+        self.span = span
+        # Snapshot used to tell whether the object was modified since parsing
+        self._original = copy.deepcopy(fields) if span is not None else None
+
+    @property
+    def isa(self):
+        return self.fields.get('isa')
+
+    @property
+    def dirty(self):
+        return self.span is None or self.fields != self._original
+
+    def get(self, key, default=None):
+        return self.fields.get(key, default)
+
+    def __getitem__(self, key):
+        return self.fields[key]
+
+    def __setitem__(self, key, value):
+        self.fields[key] = value
+
+    def __contains__(self, key):
+        return key in self.fields
+
+    def __repr__(self):
+        return f"<{self.isa} {self.id}>"
+
+
+class _Parser:
+    """Recursive-descent parser over the token stream."""
+
+    def __init__(self, text):
+        self.text = text
+        self.tokens = []
+        # isa -> (Begin line start, End line start) of each section
+        self.sections = {}
+        for match in _TOKEN.finditer(text):
+            kind = match.lastgroup
+            if kind == 'comment':
+                marker = _SECTION_MARKER.fullmatch(match.group())
+                if marker:
+                    begin, end = self.sections.get(marker.group(2), (None, None))
+                    if marker.group(1) == 'Begin':
+                        begin = match.start()
+                    else:
+                        end = match.start()
+                    self.sections[marker.group(2)] = (begin, end)
+                continue
+            if kind == 'ws':
+                continue
+            self.tokens.append((kind, match.group(), match.start(), match.end()))
+        self.pos = 0
+
+    def _next(self):
+        if self.pos >= len(self.tokens):
+            raise PBXParseError("unexpected end of file")
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def _expect(self, punct):
+        kind, value, start, _ = self._next()
+        if value != punct:
+            raise PBXParseError(f"expected '{punct}' at offset {start}, got '{value}'")
+
+    def _peek(self):
+        return self.tokens[self.pos][1] if self.pos < len(self.tokens) else None
+
+    def value(self):
+        kind, value, start, _ = self._next()
+        if kind == 'quoted':
+            return _unescape(value[1:-1])
+        if kind == 'word':
+            return value
+        if value == '{':
+            return self.dictionary()
+        if value == '(':
+            return self.array()
+        raise PBXParseError(f"unexpected '{value}' at offset {start}")
+
+    def dictionary(self):
+        result = {}
+        while self._peek() != '}':
+            key = self.value()
+            if not isinstance(key, str):
+                raise PBXParseError(f"dictionary key must be a string near offset {self.tokens[self.pos - 1][2]}")
+            self._expect('=')
+            result[key] = self.value()
+            self._expect(';')
+        self._expect('}')
+        return result
+
+    def array(self):
+        result = []
+        while self._peek() != ')':
+            result.append(self.value())
+            if self._peek() == ',':
+                self._next()
+        self._expect(')')
+        return result
+
+
+class PBXProject:
+    """
+    Parsed project.pbxproj.
+
+    Attributes:
+        objects: Dict mapping object ID -> PBXObject (file order)
+        by_isa: Dict mapping isa -> list of PBXObject (file order)
+        root: Top-level keys other than `objects` (archiveVersion, ...)
+        id_source: Optional iterator of IDs handed out by new_id() before
+            random ones (reproducible output for fixtures and benchmarks)
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.id_source = None
+        self.objects = {}
+        self.by_isa = {}
+        self.root = {}
+        self._indexes = {}
+        self._sections = {}
+        self._objects_start = None
+        self._removed = []
+        self._parse(text)
+        self._root_original = copy.deepcopy(self.root)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(f.read())
+
+    # -- Parsing -------------------------------------------------------------
+
+    def _parse(self, text):
+        if not text.startswith('// !$*UTF8*$!'):
+            raise PBXParseError("missing '// !$*UTF8*$!' header")
+        parser = _Parser(text)
+        parser._expect('{')
+
+        while parser._peek() != '}':
+            key = parser.value()
+            parser._expect('=')
+            if key == 'objects':
+                self._parse_objects(parser)
+                self.root['objects'] = None
+            else:
+                self.root[key] = parser.value()
+            parser._expect(';')
+        parser._expect('}')
+        self._sections = {isa: span for isa, span in parser.sections.items() if None not in span}
+
+    def _parse_objects(self, parser):
+        text = self.text
+        parser._expect('{')
+        # New sections that sort before every existing one go right after this line
+        self._objects_start = text.find('\n', parser.tokens[parser.pos - 1][3]) + 1
+        while parser._peek() != '}':
+            kind, object_id, start, _ = parser._next()
+            parser._expect('=')
+            fields = parser.value()
+            if not isinstance(fields, dict) or 'isa' not in fields:
+                raise PBXParseError(f"object {object_id} has no isa")
+            parser._expect(';')
+            end = parser.tokens[parser.pos - 1][3]
+            # Raw text spans whole lines: leading tabs through the newline
+            line_start = text.rfind('\n', 0, start) + 1
+            line_end = text.find('\n', end)
+            line_end = len(text) if line_end == -1 else line_end + 1
+            self._register(PBXObject(object_id, fields, (line_start, line_end)))
+        parser._expect('}')
+
+    def _register(self, obj):
+        self.objects[obj.id] = obj
+        self.by_isa.setdefault(obj.isa, []).append(obj)
+        self._indexes.clear()
+
+    # -- Lookups -------------------------------------------------------------
+
+    def get(self, object_id):
+        return self.objects.get(object_id)
+
+    def __getitem__(self, object_id):
+        return self.objects[object_id]
+
+    def __contains__(self, object_id):
+        return object_id in self.objects
+
+    def isa(self, isa):
+        """All objects of one isa type, in file order."""
+        return self.by_isa.get(isa, [])
+
+    def index(self, isa, key):
+        """
+        Map field value -> list of objects of `isa` with that value.
+
+        Built on first use and cached until objects are added or removed.
+        """
+        cache_key = (isa, key)
+        if cache_key not in self._indexes:
+            index = {}
+            for obj in self.isa(isa):
+                if key in obj:
+                    index.setdefault(obj[key], []).append(obj)
+            self._indexes[cache_key] = index
+        return self._indexes[cache_key]
+
+    @property
+    def root_object(self):
+        return self.objects[self.root['rootObject']]
+
+    @property
+    def main_group(self):
+        return self.objects[self.root_object['mainGroup']]
+
+    # -- Mutation ------------------------------------------------------------
+
+    def new_id(self):
+        # Random IDs make every run's output different; a fixture that
+        # compares against a golden file supplies its own sequence instead
+        if self.id_source is not None:
+            for object_id in self.id_source:
+                if object_id not in self.objects:
+                    return object_id
+        return new_id(self.objects)
+
+    def add_object(self, isa, fields, object_id=None):
+        """
+        Create and register a new object.
+
+        Args:
+            isa: Object type (e.g. 'PBXFileReference')
+            fields: Remaining keys (isa is prepended)
+            object_id: Explicit ID (a fresh one is generated if None)
+
+        Returns:
+            The new PBXObject
+        """
+        object_id = object_id or self.new_id()
+        if object_id in self.objects:
+            raise ValueError(f"duplicate object ID {object_id}")
+        obj = PBXObject(object_id, {'isa': isa, **fields})
+        self._register(obj)
+        return obj
+
+    def remove_object(self, object_id):
+        """Unregister an object (references to it are not touched)."""
+        obj = self.objects.pop(object_id)
+        if obj.span is not None:
+            self._removed.append(obj.span)
+        self._indexes.clear()
+        self.by_isa[obj.isa].remove(obj)
+        if not self.by_isa[obj.isa]:
+            del self.by_isa[obj.isa]
+        return obj
+
+    # -- Comments ------------------------------------------------------------
+
+    def _build_phase_of(self):
+        """Map build file ID -> build phase object (for build file comments)."""
+        phases = {}
+        for isa in PHASE_NAMES:
+            for phase in self.isa(isa):
+                for build_file_id in phase.get('files', []):
+                    phases[build_file_id] = phase
+        return phases
+
+    def comment(self, object_id, _phases=None):
+        """
+        Return the comment Xcode writes after an object ID, or None.
+
+        Matches Xcode's naming: files and groups by name/path, build files as
+        "<file> in <phase>", configuration lists as 'Build configuration list
+        for <isa> "<name>"', and so on.
+        """
+        obj = self.objects.get(object_id)
+        if obj is None:
+            return None
+        isa = obj.isa
+
+        if isa == 'PBXBuildFile':
+            if 'fileRef' in obj:
+                target = self.comment(obj['fileRef'])
+            else:
+                target = obj.get('productRef') and self.comment(obj['productRef'])
+            phases = _phases if _phases is not None else self._build_phase_of()
+            phase = phases.get(object_id)
+            phase_name = self.comment(phase.id) if phase else None
+            return f"{target} in {phase_name}" if phase_name else target
+        if isa in PHASE_NAMES:
+            return obj.get('name', PHASE_NAMES[isa])
+        if isa == 'PBXProject':
+            return 'Project object'
+        if isa == 'XCConfigurationList':
+            for owner in self.objects.values():
+                if owner.get('buildConfigurationList') == object_id:
+                    name = owner.get('name') or self._project_name()
+                    return f'Build configuration list for {owner.isa} "{name}"'
+            return None
+        if isa in ('PBXContainerItemProxy', 'PBXTargetDependency'):
+            return isa
+        if isa == 'XCSwiftPackageProductDependency':
+            return obj.get('productName')
+        if isa in ('XCRemoteSwiftPackageReference', 'XCLocalSwiftPackageReference'):
+            name = obj.get('repositoryURL') or obj.get('relativePath') or ''
+            name = os.path.splitext(os.path.basename(name.rstrip('/')))[0]
+            return f'{isa} "{name}"'
+        return obj.get('name') or obj.get('path')
+
+    def _project_name(self):
+        for target in self.isa('PBXNativeTarget'):
+            return target.get('name')
+        return None
+
+    # -- Serialization -------------------------------------------------------
+
+    def _format_value(self, value, indent, key, single_line, comments):
+        if isinstance(value, dict):
+            return self._format_dict(value, indent, single_line, comments)
+        if isinstance(value, list):
+            if single_line:
+                items = ''.join(f"{self._format_value(v, indent + 1, key, True, comments)}, " for v in value)
+                return f"({items})"
+            pad = '\t' * (indent + 1)
+            items = ''.join(f"{pad}{self._format_value(v, indent + 1, key, False, comments)},\n" for v in value)
+            return f"(\n{items}{TAB * indent})"
+        text = quote(value)
+        if key not in UNANNOTATED_KEYS and value in self.objects:
+            comment = comments(value)
+            if comment:
+                text += f" /* {comment} */"
+        return text
+
+    def _format_dict(self, fields, indent, single_line, comments, sort=True):
+        keys = list(fields)
+        if sort:
+            keys = (['isa'] if 'isa' in fields else []) + sorted(k for k in keys if k != 'isa')
+        if single_line:
+            body = ''.join(f"{quote(k)} = {self._format_value(fields[k], indent, k, True, comments)}; "
+                           for k in keys)
+            return f"{{{body}}}"
+        pad = '\t' * (indent + 1)
+        body = ''.join(f"{pad}{quote(k)} = {self._format_value(fields[k], indent + 1, k, False, comments)};\n"
+                       for k in keys)
+        return f"{{\n{body}{TAB * indent}}}"
+
+    def _comment_lookup(self):
+        phases = self._build_phase_of()
+        cache = {}
+
+        def comments(object_id):
+            if object_id not in cache:
+                cache[object_id] = self.comment(object_id, phases)
+            return cache[object_id]
+        return comments
+
+    def format_object(self, obj, comments=None):
+        """Render one object definition line(s) in Xcode's layout."""
+        comments = comments or self._comment_lookup()
+        single_line = obj.isa in SINGLE_LINE_ISAS
+        comment = comments(obj.id)
+        label = f"{obj.id} /* {comment} */" if comment else obj.id
+        return f"\t\t{label} = {self._format_dict(obj.fields, 2, single_line, comments)};\n"
+
+    def raw(self, obj):
+        """Original text of a parsed object's definition lines."""
+        return self.text[obj.span[0]:obj.span[1]]
+
+    def _line_end(self, offset):
+        end = self.text.find('\n', offset)
+        return len(self.text) if end == -1 else end + 1
+
+    def _can_splice(self):
+        """True if edits can be spliced into the parsed text."""
+        if self.root != self._root_original or self._objects_start is None:
+            return False
+        # Every parsed object must sit inside its own Begin/End section markers
+        return all(isa in self._sections for isa in self.by_isa
+                   if any(obj.span is not None for obj in self.by_isa[isa]))
+
+    def _insertions(self, isa, new_objects):
+        """
+        Splices that insert new objects into an existing section.
+
+        Xcode keeps each section sorted by ID, so in a sorted section every
+        object goes before the first parsed object with a greater ID. The
+        file is then what Xcode itself would write, and its next save
+        doesn't move the lines added here into place, which would show up as
+        a second, unrelated diff. A section that isn't sorted (hand-edited,
+        or appended to by older tools) gets the new objects at its end.
+
+        Args:
+            isa: Section
+            new_objects: (id, rendered text) pairs sorted by ID
+        """
+        end = self._sections[isa][1]
+        parsed = [obj for obj in self.by_isa[isa] if obj.span is not None]
+        ids = [obj.id for obj in parsed]
+        if any(a > b for a, b in zip(ids, ids[1:])):
+            return [(end, end, ''.join(rendered for _, rendered in new_objects))]
+        edits = []
+        for object_id, rendered in new_objects:
+            index = bisect.bisect(ids, object_id)
+            offset = parsed[index].span[0] if index < len(parsed) else end
+            if edits and edits[-1][0] == offset:
+                edits[-1] = (offset, offset, edits[-1][2] + rendered)
+            else:
+                edits.append((offset, offset, rendered))
+        return edits
+
+    def _edits(self):
+        """
+        Collect every pending change as (start, end, replacement) splices.
+
+        Returns:
+            List of edits sorted by offset
+        """
+        comments = self._comment_lookup()
+        edits = []
+        removed_sections = set()
+
+        for isa, (begin, end) in self._sections.items():
+            if not self.by_isa.get(isa):
+                # Xcode drops empty sections, along with the blank line before them
+                removed_sections.add(isa)
+                edits.append((begin - 1, self._line_end(end), ''))
+
+        def in_removed_section(span):
+            return any(self._sections[isa][0] <= span[0] < self._sections[isa][1] for isa in removed_sections)
+
+        for span in self._removed:
+            if not in_removed_section(span):
+                edits.append((span[0], span[1], ''))
+
+        new_sections = []
+        for isa in sorted(self.by_isa):
+            new_objects = []
+            for obj in self.by_isa[isa]:
+                if obj.span is None:
+                    new_objects.append((obj.id, self.format_object(obj, comments)))
+                elif obj.dirty:
+                    edits.append((obj.span[0], obj.span[1], self.format_object(obj, comments)))
+            if not new_objects:
+                continue
+            new_objects.sort()
+            if isa in self._sections and isa not in removed_sections:
+                edits.extend(self._insertions(isa, new_objects))
+            else:
+                new_sections.append((isa, ''.join(rendered for _, rendered in new_objects)))
+
+        for isa, body in new_sections:
+            # After the End marker of the closest preceding section, or at the top
+            previous = [name for name in self._sections if name < isa and name not in removed_sections]
+            offset = self._line_end(self._sections[max(previous)][1]) if previous else self._objects_start
+            edits.append((offset, offset, f"\n/* Begin {isa} section */\n{body}/* End {isa} section */\n"))
+
+        # Stable sort keeps same-offset insertions in isa order
+        edits.sort(key=lambda edit: (edit[0], edit[1]))
+        return edits
+
+    def serialize(self, canonical=False):
+        """
+        Render the project file.
+
+        By default pending edits are spliced into the parsed text in one
+        linear pass; unmodified text is copied through untouched.
+
+        Args:
+            canonical: Re-render every object in ID order instead of reusing
+                the original text of unmodified objects
+
+        Returns:
+            File contents as a string
+        """
+        if not canonical and self._can_splice():
+            out = []
+            position = 0
+            for start, end, replacement in self._edits():
+                out.append(self.text[position:start])
+                out.append(replacement)
+                position = end
+            out.append(self.text[position:])
+            return ''.join(out)
+
+        comments = self._comment_lookup()
+        out = [HEADER, "{\n"]
+        for key, value in self.root.items():
+            if key == 'objects':
+                out.append("\tobjects = {\n")
+                for isa in sorted(self.by_isa):
+                    out.append(f"\n/* Begin {isa} section */\n")
+                    objects = self.by_isa[isa]
+                    if canonical:
+                        objects = sorted(objects, key=lambda obj: obj.id)
+                    for obj in objects:
+                        if canonical or obj.dirty:
+                            out.append(self.format_object(obj, comments))
+                        else:
+                            out.append(self.raw(obj))
+                    out.append(f"/* End {isa} section */\n")
+                out.append("\t};\n")
+            else:
+                out.append(f"\t{quote(key)} = {self._format_value(value, 1, key, False, comments)};\n")
+        out.append("}\n")
+        return ''.join(out)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Parse project.pbxproj and report its object graph")
+    parser.add_argument("project_file", nargs="?", default=DEFAULT_PROJECT_FILE, help="Path to project.pbxproj")
+    parser.add_argument("--check-roundtrip", action="store_true",
+                        help="Exit non-zero unless parse + serialize reproduces the file byte for byte")
+    parser.add_argument("--canonical", action="store_true",
+                        help="With --check-roundtrip, re-render every object instead of reusing unmodified text")
+    args = parser.parse_args()
+
+    try:
+        project = PBXProject.load(args.project_file)
+    except (OSError, PBXParseError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    print(f"📦 {args.project_file}: {len(project.objects)} objects")
+    for isa in sorted(project.by_isa):
+        print(f"   {len(project.by_isa[isa]):6d}  {isa}")
+
+    if args.check_roundtrip:
+        output = project.serialize(canonical=args.canonical)
+        if output == project.text:
+            print("✅ Round trip is byte-identical")
+            return 0
+        original = project.text.splitlines()
+        rendered = output.splitlines()
+        for number, (a, b) in enumerate(zip(original, rendered), 1):
+            if a != b:
+                print(f"❌ First difference at line {number}:\n   - {a!r}\n   + {b!r}")
+                break
+        else:
+            print(f"❌ Length differs: {len(original)} vs {len(rendered)} lines")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+One entry point for the Python tooling (scripts/plena-tools).
+
+Commands and the module each one runs:
+
+    icons fix       fix_app_store_icons.py
+    icons audit     audit_assets.py
+    icons analyze   analyze_and_fix_icon.py
+    borders white   remove_icon_border.py
+    borders edge    remove_edge_border.py
+    project sync    add_missing_files_to_project.py
+    project check   add_missing_files_to_project.py --check
+    project hook    project_sync_hook.py (the Xcode build phase)
+
+Only the command words are read here; the module behind a command is
+imported when that command runs and gets the remaining arguments, so
+`project sync` never loads PIL or NumPy, and `plena-tools --help` imports
+nothing but this file. `bench_import_time.py` keeps the project commands
+within an import-time budget.
+
+Usage:
+    scripts/plena-tools COMMAND [SUBCOMMAND] [ARGS ...]
+    scripts/plena-tools project sync --reconcile --dry-run
+    scripts/plena-tools icons fix "Plena/Assets.xcassets/AppIcon.appiconset" ios --jobs 0
+"""
+
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Sibling modules are imported by name
+if SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, SCRIPT_DIR)
+
+# Command words -> (module, leading arguments, summary)
+COMMANDS = {
+    ('icons', 'fix'): ('fix_app_store_icons', [], "Remove alpha channels and fill missing icon slots"),
+    ('icons', 'audit'): ('audit_assets', [], "Audit asset catalogs (JSON Lines report)"),
+    ('icons', 'analyze'): ('analyze_and_fix_icon', [], "Check the master icon for transparent edges"),
+    ('borders', 'white'): ('remove_icon_border', [], "Make white border pixels transparent"),
+    ('borders', 'edge'): ('remove_edge_border', [], "Remove white edges and re-centre the content"),
+    ('project', 'sync'): ('add_missing_files_to_project', [], "Add missing files to project.pbxproj"),
+    ('project', 'check'): ('add_missing_files_to_project', ['--check'],
+                           "Report missing files and stale references"),
+    ('project', 'hook'): ('project_sync_hook', [], "Build-phase sync with a no-op fast path"),
+}
+
+
+def usage(prefix=()):
+    """Help text listing the commands that start with `prefix`."""
+    lines = ["usage: plena-tools COMMAND [SUBCOMMAND] [ARGS ...]", "", "commands:"]
+    for words, (_, _, summary) in COMMANDS.items():
+        if words[:len(prefix)] == tuple(prefix):
+            lines.append(f"  {' '.join(words):<16}{summary}")
+    lines += ["", "Run 'plena-tools COMMAND SUBCOMMAND --help' for a command's options."]
+    return '\n'.join(lines)
+
+
+def resolve(argv):
+    """
+    Split `argv` into a command and its arguments.
+
+    Returns:
+        (command words, remaining arguments), or None if no command matches
+    """
+    for length in (2, 1):
+        words = tuple(argv[:length])
+        if len(words) == length and words in COMMANDS:
+            return words, list(argv[length:])
+    return None
+
+
+def load(words):
+    """Import and return the module behind a command."""
+    # __import__ goes through the interpreter's own import path, which
+    # -X importtime reports (importlib.import_module bypasses it)
+    return __import__(COMMANDS[words][0])
+
+
+def run(words, args):
+    """
+    Run a command's main() with `args` as its command line.
+
+    Returns:
+        Exit status
+    """
+    module = load(words)
+    saved_argv = sys.argv
+    sys.argv = [f"plena-tools {' '.join(words)}"] + COMMANDS[words][1] + args
+    try:
+        return module.main() or 0
+    finally:
+        sys.argv = saved_argv
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ('-h', '--help'):
+        print(usage())
+        return 0 if argv else 2
+
+    found = resolve(argv)
+    if found is None:
+        known = {words[0] for words in COMMANDS}
+        if argv[0] in known and (len(argv) == 1 or argv[1] in ('-h', '--help')):
+            print(usage(argv[:1]))
+            return 0 if len(argv) > 1 else 2
+        print(f"❌ Unknown command: {' '.join(argv[:2])}\n", file=sys.stderr)
+        print(usage(), file=sys.stderr)
+        return 2
+    return run(*found)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Header-only PNG preflight for app icon compliance.
+
+Reads just the PNG signature, IHDR, and the PLTE/tRNS chunks that precede
+the first IDAT - no pixel data is ever inflated. That is enough to learn an
+icon's dimensions, color type, bit depth and whether it can carry alpha, so
+the full-decode passes only need to run on files that actually need fixing.
+
+Usage:
+    python3 scripts/png_preflight.py <path> [<path> ...] [--json] [--all]
+
+Exits non-zero if any icon inside an .appiconset has an alpha channel, so it
+can gate a build cheaply.
+"""
+
+import os
+import sys
+import json
+import struct
+import argparse
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# PNG color type -> (PIL-style mode, has alpha channel)
+COLOR_TYPES = {
+    0: ('L', False),
+    2: ('RGB', False),
+    3: ('P', False),
+    4: ('LA', True),
+    6: ('RGBA', True),
+}
+
+
+class PNGHeaderError(ValueError):
+    """Raised when a file is not a well-formed PNG header."""
+
+
+def read_png_header(path):
+    """
+    Read the PNG header chunks of a file without decoding pixel data.
+
+    Args:
+        path: Path to a PNG file
+
+    Returns:
+        Dict with width, height, bit_depth, color_type, mode, interlaced,
+        palette_size, has_trns and has_alpha
+
+    Raises:
+        PNGHeaderError: If the file is not a PNG or IHDR is malformed
+    """
+    with open(path, 'rb') as f:
+        if f.read(8) != PNG_SIGNATURE:
+            raise PNGHeaderError(f"not a PNG file: {path}")
+
+        header = f.read(8)
+        if len(header) < 8:
+            raise PNGHeaderError(f"truncated PNG header: {path}")
+        length, chunk_type = struct.unpack('>I4s', header)
+        if chunk_type != b'IHDR' or length != 13:
+            raise PNGHeaderError(f"missing IHDR chunk: {path}")
+        ihdr = f.read(13)
+        if len(ihdr) < 13:
+            raise PNGHeaderError(f"truncated IHDR chunk: {path}")
+        width, height, bit_depth, color_type, _, _, interlace = struct.unpack('>IIBBBBB', ihdr)
+        f.seek(4, os.SEEK_CUR)  # CRC
+
+        if color_type not in COLOR_TYPES:
+            raise PNGHeaderError(f"invalid color type {color_type}: {path}")
+
+        palette_size = 0
+        has_trns = False
+        # Ancillary chunks that affect alpha all come before the first IDAT
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                break
+            length, chunk_type = struct.unpack('>I4s', header)
+            if chunk_type in (b'IDAT', b'IEND'):
+                break
+            if chunk_type == b'PLTE':
+                palette_size = length // 3
+            elif chunk_type == b'tRNS':
+                has_trns = True
+                if color_type == 3:
+                    # Palette alpha only matters if some entry is not opaque
+                    has_trns = any(b != 255 for b in f.read(length))
+                    f.seek(4, os.SEEK_CUR)
+                    continue
+            f.seek(length + 4, os.SEEK_CUR)
+
+    mode, alpha_channel = COLOR_TYPES[color_type]
+    return {
+        'width': width,
+        'height': height,
+        'bit_depth': bit_depth,
+        'color_type': color_type,
+        'mode': mode,
+        'interlaced': interlace == 1,
+        'palette_size': palette_size,
+        'has_trns': has_trns,
+        'has_alpha': alpha_channel or has_trns,
+    }
+
+
+def is_opaque_rgb(info):
+    """True if the header describes 8-bit RGB with no transparency."""
+    return info['color_type'] == 2 and info['bit_depth'] == 8 and not info['has_trns']
+
+
+def preflight(path):
+    """
+    Read a PNG header, returning None instead of raising for unreadable files.
+
+    Callers treat None as "unknown - do the full decode".
+    """
+    try:
+        return read_png_header(path)
+    except (OSError, PNGHeaderError, struct.error):
+        return None
+
+
+def iter_pngs(paths):
+    """Yield every .png file under the given files/directories, sorted."""
+    for root in paths:
+        if os.path.isfile(root):
+            yield root
+            continue
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if filename.lower().endswith('.png'):
+                    yield os.path.join(dirpath, filename)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Classify PNG icons by size, color type and alpha without decoding them")
+    parser.add_argument("paths", nargs="+", help="PNG files or directories (e.g. .xcassets catalogs)")
+    parser.add_argument("--json", action="store_true", help="Emit one JSON object per file")
+    parser.add_argument("--all", action="store_true", help="List compliant files too")
+    args = parser.parse_args()
+
+    total = 0
+    failing = []
+    for path in iter_pngs(args.paths):
+        total += 1
+        info = preflight(path)
+        in_app_icon = '.appiconset' in path
+        bad = info is None or (in_app_icon and info['has_alpha'])
+        if bad:
+            failing.append(path)
+
+        if args.json:
+            print(json.dumps({'path': path, 'app_icon': in_app_icon, 'ok': not bad, **(info or {'error': 'unreadable'})}))
+        elif bad or args.all:
+            if info is None:
+                print(f"✗ {path}: unreadable PNG header")
+            else:
+                marker = "✗" if bad else "✓"
+                alpha = "alpha" if info['has_alpha'] else "opaque"
+                print(f"{marker} {path}: {info['width']}x{info['height']} {info['mode']} "
+                      f"{info['bit_depth']}-bit {alpha}")
+
+    if not args.json:
+        print(f"\n{total} PNG(s) checked, {len(failing)} need fixing")
+    return 1 if failing else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
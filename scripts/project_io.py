@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Safe read-modify-write of project.pbxproj.
+
+The build-phase hook, the watcher and manual runs can edit the project at
+the same time, and Xcode rewrites it too. Every write goes through here:
+
+- an exclusive fcntl lock on a sidecar file (project.pbxproj.lock)
+  serializes the tools' read-modify-write cycles; the project file itself
+  can't carry the lock because an atomic rename replaces its inode
+- before writing, the file's (mtime, size, inode) signature is compared
+  with the one that was read; if another writer (e.g. Xcode, which doesn't
+  take the lock) changed it, the file is re-read and the edit redone
+- the new content goes to a temp file that is fsynced and renamed over
+  the project, so readers see the old or the new file, never a torn one
+- the previous content is kept in rotating backups: project.pbxproj.backup
+  is the newest, then .backup.1 ... .backup.N-1
+
+Where fcntl is unavailable the lock is skipped; the signature check still
+catches concurrent changes.
+"""
+
+import os
+import time
+
+import output_writer
+import stage_timing
+
+DEFAULT_BACKUPS = 5
+DEFAULT_RETRIES = 3
+LOCK_TIMEOUT = 30.0
+
+
+class ProjectBusyError(RuntimeError):
+    """The project lock could not be taken, or the file kept changing."""
+
+
+def signature(path):
+    """Return (mtime_ns, size, inode) of `path`, or None if it is missing."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class ProjectLock:
+    """Exclusive advisory lock for editing `path` (a context manager)."""
+
+    def __init__(self, path, timeout=LOCK_TIMEOUT):
+        self.lock_path = os.fspath(path) + '.lock'
+        self.timeout = timeout
+        self.fd = None
+
+    def __enter__(self):
+        try:
+            import fcntl
+        except ImportError:
+            return self
+        self.fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                fcntl.flock(self.fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return self
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    os.close(self.fd)
+                    self.fd = None
+                    raise ProjectBusyError(f"{self.lock_path} is held by another process")
+                time.sleep(0.05)
+
+    def __exit__(self, *exc):
+        if self.fd is not None:
+            import fcntl
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+            os.close(self.fd)
+            self.fd = None
+        return False
+
+
+def backup_path(path, index=0):
+    """Path of backup number `index` (0 = newest)."""
+    path = os.fspath(path)
+    return f"{path}.backup" if index == 0 else f"{path}.backup.{index}"
+
+
+def rotate_backups(path, text, keep=DEFAULT_BACKUPS):
+    """
+    Save `text` as the newest backup, shifting older ones and dropping the
+    oldest beyond `keep`. Nothing rotates if the newest backup already
+    holds `text`.
+
+    Returns:
+        Path of the newest backup
+    """
+    newest = backup_path(path)
+    data = text.encode('utf-8')
+    if keep <= 0 or output_writer.content_matches(newest, data):
+        return newest
+    for index in range(keep - 1, 0, -1):
+        older = backup_path(path, index - 1)
+        if os.path.exists(older):
+            os.replace(older, backup_path(path, index))
+    output_writer.write_bytes(newest, data, count=False)
+    return newest
+
+
+def read_project(path):
+    """Return (text, signature) of the project file."""
+    with stage_timing.stage('read'), open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    stage_timing.count('bytes_read', len(text))
+    # A rename between open() and stat() is caught by the next comparison
+    return text, signature(path)
+
+
+def write_project(path, text, original, expected, backups=DEFAULT_BACKUPS):
+    """
+    Replace the project with `text` if it still matches `expected`.
+
+    Call with the ProjectLock held.
+
+    Args:
+        path: project.pbxproj
+        text: New content
+        original: Content the edit started from (goes to the backups)
+        expected: Signature read together with `original`
+        backups: Number of rotating backups to keep
+
+    Returns:
+        True if written, False if unchanged, None if the file changed on
+        disk since it was read (nothing written)
+    """
+    if signature(path) != expected:
+        return None
+    if text == original:
+        return False
+    rotate_backups(path, original, keep=backups)
+    return output_writer.write_text(path, text, fsync=True)
+
+
+def update_project(path, edit, dry_run=False, retries=DEFAULT_RETRIES, backups=DEFAULT_BACKUPS):
+    """
+    Locked read-modify-write of a project file.
+
+    Args:
+        path: project.pbxproj
+        edit: Called with a freshly parsed PBXProject; edits it in place and
+            returns a result (falsy means nothing to write)
+        dry_run: Parse and call `edit`, never write
+        retries: Attempts when the file changes under us
+        backups: Number of rotating backups to keep
+
+    Returns:
+        (edit result, True if the file was written)
+    """
+    from pbxproj import PBXProject
+
+    with ProjectLock(path):
+        for attempt in range(retries):
+            text, expected = read_project(path)
+            with stage_timing.stage('parse'):
+                project = PBXProject(text)
+            with stage_timing.stage('edit'):
+                result = edit(project)
+            if dry_run or not result:
+                return result, False
+            with stage_timing.stage('serialize'):
+                output = project.serialize()
+            written = write_project(path, output, text, expected, backups=backups)
+            if written is not None:
+                return result, written
+            print(f"🔄 {path} changed while it was being edited, retrying ({attempt + 1}/{retries})")
+    raise ProjectBusyError(f"{path} kept changing during {retries} attempts")
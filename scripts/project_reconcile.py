@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Two-way reconcile between the source tree on disk and project.pbxproj.
+
+The scanned files are diffed against the project's resolved group tree into
+one changeset:
+
+- adds: supported files on disk that the project doesn't reference (files
+  named by a group-less reference are left out, see split_orphaned())
+- removes: references to files that no longer exist, with their build files
+  (the Sources/Resources rows) and any groups left empty
+- moves: a removed and an added path with the same, unique file name; the
+  file reference is re-parented and keeps its ID, so its build files stay
+
+The changeset is applied to the in-memory graph and written once.
+
+Only references the scanner could have found are candidates for removal:
+files with a supported extension under a scanned root, outside pruned
+directories. Everything else in the project is left alone.
+
+diff() is the read-only half: the missing and stale sets alone, which the
+--check mode reports. Files that match a reference sitting in no group
+(e.g. left behind when a test target was removed), in a directory that has
+no group either, are reported apart as orphaned by split_orphaned(): the
+project does reference them, only not at a path that can be resolved.
+
+Usage:
+    python3 scripts/add_missing_files_to_project.py --reconcile [--dry-run]
+    python3 scripts/add_missing_files_to_project.py --check [--format json]
+"""
+
+import os
+import posixpath
+
+from project_targets import FILE_TYPES, file_type
+from source_scanner import is_pruned
+
+
+class Changeset:
+    """Adds, removes and moves found by plan()."""
+
+    def __init__(self, adds=(), removes=(), moves=()):
+        self.adds = list(adds)
+        self.removes = list(removes)
+        self.moves = list(moves)
+
+    def __bool__(self):
+        return bool(self.adds or self.removes or self.moves)
+
+    def __len__(self):
+        return len(self.adds) + len(self.removes) + len(self.moves)
+
+    def summary(self):
+        return f"{len(self.adds)} add(s), {len(self.removes)} remove(s), {len(self.moves)} move(s)"
+
+
+def is_managed(path, roots):
+    """
+    Check whether the scanner could have found `path`.
+
+    True for a supported extension under one of `roots`, with no pruned
+    directory on the way.
+    """
+    if file_type(path) is None:
+        return False
+    parts = path.split('/')
+    if parts[0] not in roots:
+        return False
+    return not any(is_pruned(part) for part in parts[1:-1])
+
+
+def _unique_by_name(paths):
+    by_name = {}
+    for path in paths:
+        by_name.setdefault(posixpath.basename(path), []).append(path)
+    return {name: found[0] for name, found in by_name.items() if len(found) == 1}
+
+
+def diff(tree, on_disk, roots, directories=None):
+    """
+    Set difference between the scanned files and the project's references.
+
+    Args:
+        tree: ProjectTree of the project
+        on_disk: Scanned file paths (relative to the project directory)
+        roots: The scanned top-level directories
+        directories: Only consider these directories (e.g. from a watcher
+            batch); None compares everything
+
+    Returns:
+        (missing, stale): sorted files on disk the project doesn't
+        reference, and sorted managed references whose file is gone
+    """
+    roots = set(roots)
+    on_disk = set(on_disk)
+    extensions = tuple(FILE_TYPES)
+
+    if directories is not None:
+        directories = set(directories)
+        in_scope = lambda path: posixpath.dirname(path) in directories
+    else:
+        in_scope = lambda path: True
+
+    missing = sorted(path for path in on_disk if path not in tree and in_scope(path))
+    stale = []
+    for path, obj in tree.files.items():
+        if path in on_disk or not in_scope(path) or not is_managed(path, roots):
+            continue
+        # Skip files inside a referenced bundle (e.g. model versions)
+        if posixpath.dirname(path).endswith(extensions):
+            continue
+        if not os.path.lexists(path):
+            stale.append(path)
+    stale.sort()
+    return missing, stale
+
+
+def split_orphaned(tree, missing):
+    """
+    Separate missing files that a group-less file reference names.
+
+    A path counts as orphaned only if it ends with the reference's own
+    `path`/`name` (directories included) and what is left in front is a
+    directory the lost parent group could have had: one with no group at or
+    above it (for a "<group>" reference), or the project directory (for a
+    "SOURCE_ROOT" one). Any other file of the same name is still missing.
+
+    Args:
+        tree: ProjectTree of the project
+        missing: Missing paths from diff()
+
+    Returns:
+        (missing, orphaned): the paths with no reference at all, and those
+        matching a file reference that no group contains
+    """
+    orphans = tree.orphans()
+    if not orphans:
+        return missing, []
+    remaining, orphaned = [], []
+    for path in missing:
+        (orphaned if _is_orphaned(tree, orphans, path) else remaining).append(path)
+    return remaining, orphaned
+
+
+def _is_orphaned(tree, orphans, path):
+    # Try each suffix of `path` as a reference's own path: O(depth) lookups
+    directory, own_path = path, ''
+    while directory:
+        directory, name = posixpath.dirname(directory), posixpath.basename(directory)
+        own_path = posixpath.join(name, own_path) if own_path else name
+        for ref in orphans.get(own_path, ()):
+            source_tree = ref.get('sourceTree', '<group>')
+            if source_tree == '<group>' and tree.ungrouped(directory):
+                return True
+            if source_tree == 'SOURCE_ROOT' and not directory:
+                return True
+    return False
+
+
+def plan(tree, on_disk, roots, directories=None):
+    """
+    Diff the scanned files against the project's group tree.
+
+    Arguments are those of diff().
+
+    Returns:
+        Changeset
+    """
+    added, stale = diff(tree, on_disk, roots, directories)
+    # A second reference next to a group-less one would only hide the problem
+    added, _ = split_orphaned(tree, added)
+
+    # A unique name that disappeared in one place and appeared in another is a move
+    stale_by_name = _unique_by_name(stale)
+    added_by_name = _unique_by_name(added)
+    moves = [(stale_by_name[name], added_by_name[name])
+             for name in sorted(stale_by_name.keys() & added_by_name.keys())]
+    moved_from = {old for old, _ in moves}
+    moved_to = {new for _, new in moves}
+
+    return Changeset(
+        adds=[path for path in added if path not in moved_to],
+        removes=[path for path in stale if path not in moved_from],
+        moves=moves,
+    )
+
+
+def apply(changeset, project, tree, targets, verbose=False):
+    """
+    Apply a changeset to the in-memory project graph (nothing is written).
+
+    Moves keep the file reference ID; if the new location's path rules ask
+    for different targets, the build files are adjusted to match.
+
+    Returns:
+        Dict with 'added', 'removed', 'moved' and 'groups_removed' counts
+    """
+    from pathlib import Path
+    from add_missing_files_to_project import add_file_to_project
+
+    counts = {'added': 0, 'removed': 0, 'moved': 0, 'groups_removed': 0}
+    emptied = []
+
+    for path in changeset.removes:
+        obj, group = tree.remove_file(path)
+        build_files = targets.remove_member(obj.id)
+        emptied.append(group)
+        counts['removed'] += 1
+        print(f"  🗑  Removed {path}" + (f" ({build_files} build file(s))" if verbose else ""))
+
+    for old_path, new_path in changeset.moves:
+        result = tree.move_file(old_path, new_path)
+        if result is None:
+            print(f"  ⚠️  Could not determine group for {new_path}, leaving {old_path} in place")
+            continue
+        obj, group = result
+        emptied.append(group)
+
+        wanted = targets.targets_for(new_path)
+        if wanted:
+            current = targets.members.get(obj.id, set())
+            wanted_ids = {target.id for target in wanted}
+            targets.remove_member(obj.id, current - wanted_ids)
+            targets.add_member(obj, [t for t in wanted if t.id not in current], file_type(new_path)[1])
+        counts['moved'] += 1
+        print(f"  🔀 Moved {old_path} → {new_path}")
+
+    for path in changeset.adds:
+        if add_file_to_project(Path(path), project, verbose=verbose, tree=tree, targets=targets):
+            counts['added'] += 1
+            print(f"  ✅ Added {path}")
+
+    for group in emptied:
+        if group.id in project:
+            removed = tree.prune_empty_group(group)
+            counts['groups_removed'] += len(removed)
+            for path in removed:
+                print(f"  🗑  Removed empty group {path}")
+    return counts
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Build-phase entry point for add_missing_files_to_project.py with a no-op fast path.
+
+Most builds don't add, remove or rename a source file, so the hook records a
+small state file after every successful sync:
+
+- project.pbxproj mtime, size and sha256
+- the mtime of every directory under the project source roots (adding,
+  removing or renaming a file or subdirectory bumps its parent's mtime)
+
+On the next run, if the project file and every recorded directory still
+match, the hook exits after a handful of stat() calls - before importing
+`re`, `uuid`, `json`, `argparse` or the project parser, and without walking
+the tree. Otherwise it runs the full sync and records a fresh state.
+
+The state file is plain `kind<TAB>value...` lines so reading it needs no
+imports. Timing is reported on every run.
+
+Usage:
+    python3 scripts/project_sync_hook.py [--force] [--state PATH] [--verbose]
+"""
+
+import os
+import sys
+import time
+
+STATE_VERSION = "1"
+DEFAULT_STATE_FILE = ".project_sync_state"
+PROJECT_FILE = "Plena.xcodeproj/project.pbxproj"
+
+# The sync tooling itself: a change here invalidates the recorded state
+TOOL_DIR = os.path.dirname(os.path.abspath(__file__))
+TOOL_FILES = ("add_missing_files_to_project.py", "output_writer.py", "pbxproj.py", "stage_timing.py", "project_io.py",
+              "project_sync_hook.py", "project_targets.py", "project_tree.py", "source_scanner.py")
+
+# Sibling modules are imported lazily; keep them importable under -I/-S too
+if TOOL_DIR not in sys.path:
+    sys.path.insert(0, TOOL_DIR)
+
+
+def _elapsed_ms(start):
+    return (time.perf_counter() - start) * 1000
+
+
+def read_state(path):
+    """
+    Read the state file.
+
+    Returns:
+        Dict with 'project' (mtime_ns, size, sha256) and 'paths'
+        {path: mtime_ns or None}, or None if missing or unreadable
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = f.read().split('\n')
+    except OSError:
+        return None
+    if not lines or lines[0] != f"version\t{STATE_VERSION}":
+        return None
+
+    state = {'project': None, 'paths': {}}
+    for line in lines[1:]:
+        if not line:
+            continue
+        fields = line.split('\t')
+        if fields[0] == 'project' and len(fields) == 4:
+            state['project'] = (int(fields[1]), int(fields[2]), fields[3])
+        elif fields[0] == 'path' and len(fields) == 3:
+            state['paths'][fields[2]] = None if fields[1] == '-' else int(fields[1])
+    return state if state['project'] else None
+
+
+def _mtime_ns(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _sha256(path):
+    import hashlib
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def is_unchanged(state, project_file):
+    """
+    Check the recorded state against the filesystem using stat() only.
+
+    The project file is hashed only when its mtime moved but its size did
+    not (e.g. a checkout that rewrote identical bytes).
+
+    Returns:
+        (unchanged, refreshed project signature or None)
+    """
+    try:
+        st = os.stat(project_file)
+    except OSError:
+        return False, None
+
+    mtime_ns, size, sha256 = state['project']
+    refreshed = None
+    if st.st_size != size:
+        return False, None
+    if st.st_mtime_ns != mtime_ns:
+        if _sha256(project_file) != sha256:
+            return False, None
+        refreshed = (st.st_mtime_ns, size, sha256)
+
+    for path, recorded in state['paths'].items():
+        if _mtime_ns(path) != recorded:
+            return False, None
+    return True, refreshed
+
+
+def collect_paths(roots, tool_dir):
+    """
+    Record the mtime of every directory under `roots` plus the tool files.
+
+    Roots that don't exist are recorded as missing, so creating one later
+    invalidates the state. Directories the scanner prunes (build output,
+    asset catalogs) are not recorded, so churn there doesn't force a sync.
+    """
+    from source_scanner import is_pruned
+
+    paths = {}
+    stack = list(roots)
+    while stack:
+        directory = stack.pop()
+        paths[directory] = _mtime_ns(directory)
+        if paths[directory] is None:
+            continue
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False) and not is_pruned(entry.name):
+                        stack.append(entry.path)
+        except OSError:
+            continue
+    for name in TOOL_FILES:
+        path = os.path.join(tool_dir, name)
+        paths[path] = _mtime_ns(path)
+    return paths
+
+
+def _write_state_file(path, signature, paths):
+    import output_writer
+
+    lines = [f"version\t{STATE_VERSION}", "project\t%d\t%d\t%s" % signature]
+    for entry, mtime_ns in sorted(paths.items()):
+        lines.append(f"path\t{'-' if mtime_ns is None else mtime_ns}\t{entry}")
+    output_writer.write_text(path, '\n'.join(lines) + '\n', count=False)
+
+
+def write_state(path, project_file, roots, tool_dir):
+    """Record the current project signature and directory mtimes."""
+    st = os.stat(project_file)
+    signature = (st.st_mtime_ns, st.st_size, _sha256(project_file))
+    _write_state_file(path, signature, collect_paths(roots, tool_dir))
+
+
+USAGE = """usage: project_sync_hook.py [-h] [--force] [--state PATH] [--verbose]
+
+Build-phase project sync with a no-op fast path.
+
+options:
+  -h, --help     show this help message and exit
+  --force        Ignore the recorded state and run the full sync
+  --state PATH   State file (default: %s)
+  --verbose, -v  Verbose sync output""" % DEFAULT_STATE_FILE
+
+
+def parse_args(argv):
+    """
+    Parse the hook's options without argparse (which would import `re`).
+
+    Returns:
+        (force, verbose, state file), or an exit status for --help and
+        usage errors
+    """
+    force = verbose = False
+    state_file = DEFAULT_STATE_FILE
+    args = iter(argv)
+    for arg in args:
+        if arg in ('-h', '--help'):
+            print(USAGE)
+            return 0
+        elif arg == '--force':
+            force = True
+        elif arg in ('--verbose', '-v'):
+            verbose = True
+        elif arg == '--state' or arg.startswith('--state='):
+            state_file = arg[len('--state='):] if '=' in arg else next(args, None)
+            if not state_file:
+                print("❌ Error: --state needs a path", file=sys.stderr)
+                return 2
+        else:
+            print(f"❌ Error: unrecognized argument: {arg}\n", file=sys.stderr)
+            print(USAGE, file=sys.stderr)
+            return 2
+    return force, verbose, state_file
+
+
+def main(argv=None):
+    start = time.perf_counter()
+    parsed = parse_args(sys.argv[1:] if argv is None else argv)
+    if isinstance(parsed, int):
+        return parsed
+    force, verbose, state_file = parsed
+
+    state = None if force else read_state(state_file)
+    if state is not None:
+        unchanged, refreshed = is_unchanged(state, PROJECT_FILE)
+        if unchanged:
+            if refreshed:
+                # Content-identical touch: remember the new mtime
+                _write_state_file(state_file, refreshed, state['paths'])
+            print(f"⏱ Project sync: no changes ({_elapsed_ms(start):.1f} ms, "
+                  f"{len(state['paths'])} paths checked)")
+            return 0
+
+    # Something changed (or first run): do the full sync
+    import add_missing_files_to_project as sync
+
+    sync_argv = ['add_missing_files_to_project.py'] + (['--verbose'] if verbose else [])
+    saved_argv = sys.argv
+    sys.argv = sync_argv
+    try:
+        exit_code = sync.main() or 0
+    except SystemExit as e:
+        exit_code = e.code if isinstance(e.code, int) else 1
+    finally:
+        sys.argv = saved_argv
+
+    if exit_code == 0 and os.path.exists(PROJECT_FILE):
+        write_state(state_file, PROJECT_FILE, sync.PROJECT_DIRS, TOOL_DIR)
+
+    print(f"⏱ Project sync: full run ({_elapsed_ms(start):.1f} ms)")
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Target membership for files added by the project sync tooling.
+
+Targets, their build phases and their fileSystemSynchronizedGroups are read
+from the parsed project (PBXNativeTarget) instead of hardcoded phase IDs. A
+membership index (file reference -> targets) is built once from the build
+phases, and each new file is routed by path rules:
+
+- a file inside a folder Xcode keeps in sync (PBXFileSystemSynchronizedRootGroup)
+  belongs to the targets listing that folder in fileSystemSynchronizedGroups,
+  minus those whose exception set (membershipExceptions) names the file
+- otherwise the first rule whose path prefix matches decides the targets; a
+  target is named directly ("Plena") or selected by product type
+  ("@application" matches every app target, "@bundle.unit-test" every
+  unit-test bundle)
+- with no matching rule, the file joins the targets of the files already
+  in its folder (nearest ancestor group with built members)
+
+The file's extension picks the build phase: sources (.swift, Core Data
+models) or resources (.json, .storekit). A missing Resources phase is
+created on the target. Adding a target to the project needs no change here.
+
+Usage:
+    python3 scripts/project_targets.py [PATH ...] [--rules rules.json]
+"""
+
+import os
+import sys
+import posixpath
+
+from pbxproj import DEFAULT_PROJECT_FILE, PBXProject
+
+# Extension -> (lastKnownFileType, build phase kind)
+FILE_TYPES = {
+    '.swift': ('sourcecode.swift', 'sources'),
+    # Xcode compiles Core Data models (momc) in the Sources phase
+    '.xcdatamodeld': ('wrapper.xcdatamodel', 'sources'),
+    '.json': ('text.json', 'resources'),
+    '.storekit': ('text', 'resources'),
+}
+
+PHASE_ISAS = {
+    'sources': 'PBXSourcesBuildPhase',
+    'resources': 'PBXResourcesBuildPhase',
+}
+
+# (path prefix, targets); first match wins
+DEFAULT_RULES = [
+    ('Tests/', ['@bundle.unit-test']),
+    ('PlenaShared/', ['@application']),
+    ('Plena Watch App/', ['Plena Watch App']),
+    ('Plena/', ['Plena']),
+]
+
+PRODUCT_TYPE_PREFIX = 'com.apple.product-type.'
+
+EXCEPTION_SET_ISA = 'PBXFileSystemSynchronizedBuildFileExceptionSet'
+
+
+def load_rules(path):
+    """
+    Load path rules from a JSON file.
+
+    The file holds a list of {"path": "Folder/", "targets": ["Name", "@type"]}.
+    """
+    import json
+
+    with open(path, 'r', encoding='utf-8') as f:
+        return [(rule['path'], list(rule['targets'])) for rule in json.load(f)]
+
+
+def file_type(path):
+    """Return (lastKnownFileType, phase kind) for a path, or None if unsupported."""
+    return FILE_TYPES.get(posixpath.splitext(path)[1])
+
+
+class TargetIndex:
+    """Targets of a project and which file references each one builds."""
+
+    def __init__(self, project, tree, rules=None):
+        self.project = project
+        self.tree = tree
+        self.rules = DEFAULT_RULES if rules is None else rules
+        self.targets = list(project.isa('PBXNativeTarget'))
+        # file ref id -> target ids, file ref id -> [(build file id, phase id, target id)]
+        self.members = {}
+        self.build_files = {}
+        for target in self.targets:
+            for phase_id in target.get('buildPhases') or ():
+                for build_file_id in self.project[phase_id].get('files') or ():
+                    build_file = self.project.get(build_file_id)
+                    file_ref = build_file.get('fileRef') if build_file else None
+                    if file_ref:
+                        self.members.setdefault(file_ref, set()).add(target.id)
+                        self.build_files.setdefault(file_ref, []).append((build_file_id, phase_id, target.id))
+
+        # synchronized folder path -> target ids, (folder path, relative path) -> excluded target ids
+        self.synchronized = {}
+        self.exceptions = {}
+        for target in self.targets:
+            for group_id in target.get('fileSystemSynchronizedGroups') or ():
+                folder = tree.paths.get(group_id)
+                if folder is not None:
+                    self.synchronized.setdefault(folder, set()).add(target.id)
+        for folder, group in tree.synchronized.items():
+            for exception_id in group.get('exceptions') or ():
+                exception = self.project.get(exception_id)
+                if exception is None or exception.isa != EXCEPTION_SET_ISA:
+                    continue
+                for relative in exception.get('membershipExceptions') or ():
+                    self.exceptions.setdefault((folder, relative), set()).add(exception.get('target'))
+
+    def select(self, selector):
+        """Return the targets a rule entry names ("Name" or "@product-type")."""
+        if selector.startswith('@'):
+            product_type = PRODUCT_TYPE_PREFIX + selector[1:]
+            return [t for t in self.targets if t.get('productType') == product_type]
+        return [t for t in self.targets if t.get('name') == selector]
+
+    def _inferred(self, path):
+        """Targets of the files already in the nearest ancestor group."""
+        directory = posixpath.dirname(path)
+        while True:
+            group = self.tree.group(directory)
+            if group is not None:
+                found = set()
+                for child_id in group.get('children') or ():
+                    found |= self.members.get(child_id, set())
+                if found:
+                    return [t for t in self.targets if t.id in found]
+            if not directory:
+                return []
+            directory = posixpath.dirname(directory)
+
+    def _synchronized(self, path):
+        """Targets building `path` through a synchronized folder, or None if it is in none."""
+        directory = posixpath.dirname(path)
+        while directory:
+            if directory in self.synchronized:
+                excluded = self.exceptions.get((directory, path[len(directory) + 1:]), ())
+                return [t for t in self.targets if t.id in self.synchronized[directory] and t.id not in excluded]
+            directory = posixpath.dirname(directory)
+        return None
+
+    def targets_for(self, path):
+        """
+        Decide which targets a new file at `path` belongs to.
+
+        Returns:
+            List of PBXNativeTarget objects (empty if none applies)
+        """
+        if self.synchronized:
+            targets = self._synchronized(path)
+            if targets is not None:
+                return targets
+        for prefix, selectors in self.rules:
+            if path.startswith(prefix):
+                targets = []
+                for selector in selectors:
+                    targets.extend(t for t in self.select(selector) if t not in targets)
+                return targets
+        return self._inferred(path)
+
+    def phase(self, target, kind, create=True):
+        """
+        Return the target's build phase of `kind` ('sources' or 'resources').
+
+        A missing phase is created and appended to the target when `create`.
+        """
+        isa = PHASE_ISAS[kind]
+        for phase_id in target.get('buildPhases') or ():
+            if self.project[phase_id].isa == isa:
+                return self.project[phase_id]
+        if not create:
+            return None
+        phase = self.project.add_object(isa, {
+            'buildActionMask': '2147483647',
+            'files': [],
+            'runOnlyForDeploymentPostprocessing': '0',
+        })
+        target['buildPhases'].append(phase.id)
+        return phase
+
+    def add_member(self, file_ref, targets, kind):
+        """Add a PBXBuildFile for `file_ref` to each target's `kind` phase."""
+        for target in targets:
+            build_file = self.project.add_object('PBXBuildFile', {'fileRef': file_ref.id})
+            phase = self.phase(target, kind)
+            phase['files'].append(build_file.id)
+            self.members.setdefault(file_ref.id, set()).add(target.id)
+            self.build_files.setdefault(file_ref.id, []).append((build_file.id, phase.id, target.id))
+
+    def remove_member(self, file_ref_id, target_ids=None):
+        """
+        Remove the build files of `file_ref_id` from its targets' phases.
+
+        Args:
+            file_ref_id: File reference whose build files go
+            target_ids: Only these targets (default: all)
+
+        Returns:
+            Number of build files removed
+        """
+        kept = []
+        removed = 0
+        for build_file_id, phase_id, target_id in self.build_files.pop(file_ref_id, ()):
+            if target_ids is not None and target_id not in target_ids:
+                kept.append((build_file_id, phase_id, target_id))
+                continue
+            self.project[phase_id]['files'].remove(build_file_id)
+            self.project.remove_object(build_file_id)
+            removed += 1
+        if kept:
+            self.build_files[file_ref_id] = kept
+            self.members[file_ref_id] = {target_id for _, _, target_id in kept}
+        else:
+            self.members.pop(file_ref_id, None)
+        return removed
+
+
+def main():
+    import argparse
+    from project_tree import ProjectTree
+
+    parser = argparse.ArgumentParser(description="Show targets and where new files would be routed")
+    parser.add_argument("paths", nargs="*", help="File paths to route (relative to the project directory)")
+    parser.add_argument("--project", default=DEFAULT_PROJECT_FILE, help="Path to project.pbxproj")
+    parser.add_argument("--rules", help="JSON file with path rules (default: built-in rules)")
+    args = parser.parse_args()
+
+    project = PBXProject.load(args.project)
+    index = TargetIndex(project, ProjectTree(project), load_rules(args.rules) if args.rules else None)
+    for target in index.targets:
+        count = sum(1 for targets in index.members.values() if target.id in targets)
+        product_type = target.get('productType', '').replace(PRODUCT_TYPE_PREFIX, '')
+        folders = sorted(f for f, target_ids in index.synchronized.items() if target.id in target_ids)
+        synced = f", synchronized: {', '.join(folders)}" if folders else ''
+        print(f"{target.get('name')} (@{product_type}): {count} file(s){synced}")
+    for path in args.paths:
+        path = path.replace(os.sep, '/')
+        kind = (file_type(path) or (None, None))[1]
+        names = [t.get('name') for t in index.targets_for(path)]
+        print(f"  {path} -> {', '.join(names) or 'no target'} ({kind or 'unsupported type'})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+Resolved group tree of a parsed project.pbxproj.
+
+Walks the mainGroup tree once and resolves every PBXFileReference, group
+(PBXGroup, PBXVariantGroup) and versioned bundle (XCVersionGroup, indexed
+as a file) to its real path relative to the project directory, following
+Xcode's rules:
+
+- sourceTree "<group>": the object's `path` is relative to its parent's
+  real path; a group without a `path` (name only) sits at its parent's path
+- sourceTree "SOURCE_ROOT": `path` is relative to the project directory
+- sourceTree "<absolute>": `path` is absolute
+- any other sourceTree (BUILT_PRODUCTS_DIR, SDKROOT, ...) is outside the
+  source tree and is indexed as "$(TREE)/path"
+
+Folders synchronized by Xcode 16 (PBXFileSystemSynchronizedRootGroup) count
+as containing every file below them.
+
+Membership checks and group lookups are then dict lookups by real path, and
+ensure_group() creates missing intermediate groups in O(depth).
+
+Usage:
+    python3 scripts/project_tree.py [project.pbxproj] [--groups]
+"""
+
+import os
+import sys
+import posixpath
+
+from pbxproj import DEFAULT_PROJECT_FILE, PBXProject
+
+GROUP_ISAS = ('PBXGroup', 'PBXVariantGroup')
+SYNCHRONIZED_ISA = 'PBXFileSystemSynchronizedRootGroup'
+
+
+def resolve_path(obj, parent_path):
+    """
+    Return the real path of a file reference or group.
+
+    Args:
+        obj: PBXFileReference or group object
+        parent_path: Real path of the containing group ('' = project directory)
+    """
+    path = obj.get('path')
+    tree = obj.get('sourceTree', '<group>')
+    if path is None:
+        return parent_path
+    if tree == '<group>':
+        joined = posixpath.normpath(posixpath.join(parent_path, path))
+        return '' if joined == '.' else joined
+    if tree == 'SOURCE_ROOT':
+        return posixpath.normpath(path)
+    if tree == '<absolute>':
+        return path
+    return f"$({tree})/{path}"
+
+
+class ProjectTree:
+    """Real-path index of a project's file references and groups."""
+
+    def __init__(self, project):
+        self.project = project
+        # real path -> PBXFileReference / group object
+        self.files = {}
+        self.groups = {}
+        self.synchronized = {}
+        # object id -> containing group id, object id -> real path
+        self.parents = {}
+        self.paths = {}
+
+        main_group = project.main_group
+        root_path = project.root_object.get('projectDirPath') or ''
+        self.root_id = main_group.id
+        self._walk(main_group, root_path)
+
+    def _walk(self, group, path):
+        self.paths[group.id] = path
+        # A name-only group shares its parent's path; keep the one with a real `path`
+        if path not in self.groups or 'path' in group:
+            self.groups[path] = group
+        stack = [group]
+        while stack:
+            container = stack.pop()
+            base = self.paths[container.id]
+            for child_id in container.get('children') or ():
+                child = self.project.get(child_id)
+                if child is None:
+                    continue
+                self.parents[child_id] = container.id
+                child_path = resolve_path(child, base)
+                self.paths[child_id] = child_path
+                if child.isa == SYNCHRONIZED_ISA:
+                    self.synchronized[child_path] = child
+                elif child.isa in GROUP_ISAS:
+                    if child_path not in self.groups or 'path' in child:
+                        self.groups[child_path] = child
+                    stack.append(child)
+                else:
+                    # File references, and versioned bundles (XCVersionGroup,
+                    # e.g. .xcdatamodeld) which are one item on disk
+                    self.files.setdefault(child_path, child)
+                    if 'children' in child:
+                        stack.append(child)
+
+    def __contains__(self, path):
+        if path in self.files:
+            return True
+        if self.synchronized:
+            directory = posixpath.dirname(path)
+            while directory:
+                if directory in self.synchronized:
+                    return True
+                directory = posixpath.dirname(directory)
+        return False
+
+    def file(self, path):
+        """Return the file reference at `path`, or None."""
+        return self.files.get(path)
+
+    def group(self, path):
+        """Return the group whose real path is `path`, or None."""
+        return self.groups.get(path)
+
+    def parent(self, object_id):
+        """Return the id of the group containing `object_id`, or None."""
+        return self.parents.get(object_id)
+
+    def orphans(self):
+        """
+        File references that no group contains, by their own path.
+
+        The key is the reference's `path` (or `name`) as written, which may
+        include directories. Their real path is unknown: a "<group>"-relative
+        path only means something under a parent group.
+        """
+        found = {}
+        for obj in self.project.isa('PBXFileReference'):
+            if obj.id not in self.parents:
+                own_path = posixpath.normpath(obj.get('path') or obj.get('name') or '.')
+                found.setdefault(own_path, []).append(obj)
+        return found
+
+    def ungrouped(self, directory):
+        """
+        True if neither `directory` nor any directory above it has a group.
+
+        Only such a directory can have held the lost parent group of an
+        orphaned "<group>"-relative reference.
+        """
+        while directory:
+            if directory in self.groups or directory in self.synchronized:
+                return False
+            directory = posixpath.dirname(directory)
+        return True
+
+    def ensure_group(self, directory, create_top_level=False, dry_run=False):
+        """
+        Return the group for `directory`, creating missing groups on the way.
+
+        Walks up from `directory` to the nearest existing group (O(depth))
+        and creates one "<group>"-relative PBXGroup per missing level.
+
+        Args:
+            directory: Real directory path relative to the project directory
+            create_top_level: Also create groups directly under the main
+                group; off by default so a source root has to be added in
+                Xcode first
+            dry_run: Don't create anything, just report whether it's possible
+
+        Returns:
+            The group object, True in dry-run mode if groups would be
+            created, or None if no group can be used
+        """
+        directory = posixpath.normpath(directory) if directory else ''
+        if directory == '.':
+            directory = ''
+        missing = []
+        current = directory
+        while current not in self.groups:
+            if not current:
+                return None
+            missing.append(current)
+            current = posixpath.dirname(current)
+        if not missing:
+            return self.groups[directory]
+
+        parent = self.groups[current]
+        if parent.id == self.root_id and not create_top_level:
+            return None
+        if dry_run:
+            return True
+        for path in reversed(missing):
+            group = self.project.add_object('PBXGroup', {
+                'children': [],
+                'path': posixpath.basename(path),
+                'sourceTree': '<group>',
+            })
+            self._link(group, parent, path)
+            self.groups[path] = group
+            parent = group
+        return parent
+
+    def add_file(self, path, fields, group=None):
+        """
+        Add a "<group>"-relative PBXFileReference for `path`.
+
+        Args:
+            path: Real file path relative to the project directory
+            fields: Extra PBXFileReference fields (e.g. lastKnownFileType)
+            group: Containing group (default: ensure_group(dirname(path)))
+
+        Returns:
+            The new file reference, or None if no group could be used
+        """
+        if group is None:
+            group = self.ensure_group(posixpath.dirname(path))
+        if group is None:
+            return None
+        file_ref = self.project.add_object('PBXFileReference', dict(
+            fields, path=posixpath.basename(path), sourceTree='<group>'))
+        self._link(file_ref, group, path)
+        self.files[path] = file_ref
+        return file_ref
+
+    def add_data_model(self, path, group=None):
+        """
+        Add a Core Data model bundle (.xcdatamodeld) as an XCVersionGroup.
+
+        Each .xcdatamodel inside the bundle becomes a child reference; the
+        current version comes from the bundle's .xccurrentversion, falling
+        back to the last version by name.
+
+        Returns:
+            The new XCVersionGroup, or None if no group could be used
+        """
+        import plistlib
+
+        if group is None:
+            group = self.ensure_group(posixpath.dirname(path))
+        if group is None:
+            return None
+        versions = sorted(name for name in os.listdir(path) if name.endswith('.xcdatamodel'))
+        current = versions[-1] if versions else None
+        try:
+            with open(os.path.join(path, '.xccurrentversion'), 'rb') as f:
+                current = plistlib.load(f).get('_XCCurrentVersionName', current)
+        except (OSError, plistlib.InvalidFileException):
+            pass
+
+        model = self.project.add_object('XCVersionGroup', {
+            'children': [],
+            'path': posixpath.basename(path),
+            'sourceTree': '<group>',
+            'versionGroupType': 'wrapper.xcdatamodel',
+        })
+        self._link(model, group, path)
+        self.files[path] = model
+        for name in versions:
+            version = self.project.add_object('PBXFileReference', {
+                'lastKnownFileType': 'wrapper.xcdatamodel',
+                'path': name,
+                'sourceTree': '<group>',
+            })
+            self._link(version, model, posixpath.join(path, name))
+            self.files[posixpath.join(path, name)] = version
+            if name == current:
+                model['currentVersion'] = version.id
+        return model
+
+    def detach(self, object_id):
+        """Remove an object from its group's children; return that group."""
+        parent = self.project[self.parents.pop(object_id)]
+        parent['children'].remove(object_id)
+        return parent
+
+    def _contained(self, obj):
+        """
+        Objects inside a bundle reference (e.g. model versions).
+
+        Walks the bundle's own children, so the cost depends on the bundle,
+        not on the number of files in the project.
+        """
+        contained = []
+        stack = list(obj.get('children') or ())
+        while stack:
+            child = self.project.get(stack.pop())
+            if child is None:
+                continue
+            contained.append(child)
+            stack.extend(child.get('children') or ())
+        return contained
+
+    def remove_file(self, path):
+        """
+        Remove the reference at `path` (and a version group's children).
+
+        Build files pointing at it are left to the caller (TargetIndex).
+
+        Returns:
+            (removed object, group it was removed from)
+        """
+        obj = self.files[path]
+        for child in self._contained(obj):
+            child_path = self.paths.pop(child.id, None)
+            if self.files.get(child_path) is child:
+                del self.files[child_path]
+            self.parents.pop(child.id, None)
+            self.project.remove_object(child.id)
+        del self.files[path]
+        group = self.detach(obj.id)
+        self.paths.pop(obj.id, None)
+        self.project.remove_object(obj.id)
+        return obj, group
+
+    def move_file(self, path, new_path, group=None):
+        """
+        Move the reference at `path` to `new_path`, keeping its object ID.
+
+        Returns:
+            (moved object, group it was moved out of), or None if no group
+            could be used for `new_path`
+        """
+        if group is None:
+            group = self.ensure_group(posixpath.dirname(new_path))
+        if group is None:
+            return None
+        obj = self.files.pop(path)
+        old_group = self.detach(obj.id)
+        if obj.get('name') == posixpath.basename(path):
+            del obj.fields['name']
+        obj['path'] = posixpath.basename(new_path)
+        obj['sourceTree'] = '<group>'
+        self._link(obj, group, new_path)
+        self.files[new_path] = obj
+
+        for child in self._contained(obj):
+            child_path = self.paths[child.id]
+            moved_path = new_path + child_path[len(path):]
+            if self.files.get(child_path) is child:
+                del self.files[child_path]
+                self.files[moved_path] = child
+            self.paths[child.id] = moved_path
+        return obj, old_group
+
+    def prune_empty_group(self, group):
+        """
+        Remove `group` and then its ancestors while they are empty.
+
+        Only groups with their own `path` whose folder no longer exists on
+        disk are removed; top-level groups are always kept.
+
+        Returns:
+            Real paths of the removed groups
+        """
+        removed = []
+        while (not group.get('children') and 'path' in group and group.get('sourceTree') == '<group>'
+               and group.id in self.parents and self.parents[group.id] != self.root_id):
+            path = self.paths[group.id]
+            if os.path.isdir(path):
+                break
+            parent = self.detach(group.id)
+            if self.groups.get(path) is group:
+                del self.groups[path]
+            self.paths.pop(group.id, None)
+            self.project.remove_object(group.id)
+            removed.append(path)
+            group = parent
+        return removed
+
+    def _link(self, obj, group, path):
+        group['children'].append(obj.id)
+        self.parents[obj.id] = group.id
+        self.paths[obj.id] = path
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Print the real path of every file reference in a project")
+    parser.add_argument("project_file", nargs="?", default=DEFAULT_PROJECT_FILE, help="Path to project.pbxproj")
+    parser.add_argument("--groups", action="store_true", help="Print groups instead of file references")
+    args = parser.parse_args()
+
+    tree = ProjectTree(PBXProject.load(args.project_file))
+    index = tree.groups if args.groups else tree.files
+    for path, obj in sorted(index.items()):
+        print(f"{obj.id}  {path or '.'}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
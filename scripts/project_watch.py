@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Resident watch mode for add_missing_files_to_project.py.
+
+Replaces the fswatch loop in watch_for_new_files.sh. The project file is
+parsed once and kept in memory together with its group tree; file system
+events are debounced, coalesced into one batch per burst, and only the
+directories named in the batch are rescanned. Missing files found there are
+added to the in-memory graph and written in one splice - no process spawn
+and no re-parse per event. The project is only re-parsed when something
+other than this process rewrote project.pbxproj (e.g. Xcode). A file that
+can't be added (no target, unsupported type) is reported once, not on every
+batch, until the file itself or the project changes.
+
+Events come from inotify on Linux (via ctypes, no extra packages) and from
+periodic directory-mtime polling everywhere else.
+
+Usage:
+    python3 scripts/add_missing_files_to_project.py --watch [--poll] [--debounce SECONDS]
+"""
+
+import os
+import sys
+import time
+import errno
+import select
+import struct
+from pathlib import Path
+
+import project_io
+from source_scanner import is_pruned
+
+# inotify event masks (from <sys/inotify.h>)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE |
+              IN_DELETE | IN_DELETE_SELF | IN_ONLYDIR)
+
+_EVENT_HEADER = struct.Struct('iIII')
+
+DEFAULT_DEBOUNCE = 0.3
+DEFAULT_POLL_INTERVAL = 1.0
+
+
+def walk_dirs(root):
+    """Yield `root` and every directory below it (source_scanner pruning applies)."""
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        yield directory
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False) and not is_pruned(entry.name):
+                        stack.append(entry.path)
+        except OSError:
+            continue
+
+
+class InotifyWatcher:
+    """Recursive directory watcher on Linux inotify."""
+
+    def __init__(self, roots):
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self.fd = libc.inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.paths = {}
+        for root in roots:
+            self.add_tree(root)
+
+    def add_tree(self, root):
+        """Watch `root` and all of its subdirectories."""
+        for directory in walk_dirs(root):
+            wd = self._add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+            if wd >= 0:
+                self.paths[wd] = directory
+
+    def wait(self, timeout):
+        """
+        Wait up to `timeout` seconds for events.
+
+        Returns:
+            Set of directories whose contents changed (empty on timeout)
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except OSError as e:
+            if e.errno == errno.EINTR:
+                return set()
+            raise
+
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0').decode('utf-8', 'surrogateescape')
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # Kernel dropped events: treat every watched directory as changed
+                changed.update(self.paths.values())
+                continue
+            directory = self.paths.get(wd)
+            if directory is None:
+                continue
+            if mask & IN_IGNORED:
+                del self.paths[wd]
+                continue
+            changed.add(directory)
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO) and not is_pruned(name):
+                # New subtree: watch it and report everything already inside
+                subtree = os.path.join(directory, name)
+                self.add_tree(subtree)
+                changed.update(walk_dirs(subtree))
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Portable fallback: compare directory mtimes every `interval` seconds."""
+
+    def __init__(self, roots, interval=DEFAULT_POLL_INTERVAL):
+        self.roots = list(roots)
+        self.interval = interval
+        self.mtimes = self._snapshot()
+
+    def _snapshot(self):
+        mtimes = {}
+        for root in self.roots:
+            for directory in walk_dirs(root):
+                try:
+                    mtimes[directory] = os.stat(directory).st_mtime_ns
+                except OSError:
+                    continue
+        return mtimes
+
+    def wait(self, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            current = self._snapshot()
+            changed = {d for d, m in current.items() if self.mtimes.get(d) != m}
+            changed.update(d for d in self.mtimes if d not in current)
+            self.mtimes = current
+            if changed:
+                return changed
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return set()
+            time.sleep(min(self.interval, remaining))
+
+    def close(self):
+        pass
+
+
+def make_watcher(roots, poll=False, interval=DEFAULT_POLL_INTERVAL):
+    """Return an InotifyWatcher on Linux, else (or if it fails) a PollingWatcher."""
+    if not poll and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(roots)
+        except OSError as e:
+            print(f"⚠️  inotify unavailable ({e}), falling back to polling")
+    return PollingWatcher(roots, interval)
+
+
+def batches(watcher, debounce=DEFAULT_DEBOUNCE, idle_timeout=None):
+    """
+    Yield one coalesced set of changed directories per burst of events.
+
+    After the first event, events keep being collected until `debounce`
+    seconds pass without a new one.
+
+    Args:
+        watcher: InotifyWatcher or PollingWatcher
+        debounce: Quiet period that ends a burst
+        idle_timeout: Stop after this many seconds without events (None = never)
+    """
+    while True:
+        changed = watcher.wait(idle_timeout if idle_timeout is not None else 3600)
+        if not changed:
+            if idle_timeout is not None:
+                return
+            continue
+        while True:
+            more = watcher.wait(debounce)
+            if not more:
+                break
+            changed |= more
+        yield changed
+
+
+class ProjectSync:
+    """The parsed project and its group tree, kept resident between events."""
+
+    def __init__(self, project_file, verbose=False, rules=None):
+        self.project_file = project_file
+        self.verbose = verbose
+        self.rules = rules
+        self.load()
+
+    def load(self):
+        from pbxproj import PBXProject
+        from project_targets import TargetIndex
+        from project_tree import ProjectTree
+
+        # What is on disk: the parsed text at first, then each write
+        self.text, self.signature = project_io.read_project(self.project_file)
+        self.project = PBXProject(self.text)
+        self.tree = ProjectTree(self.project)
+        self.targets = TargetIndex(self.project, self.tree, self.rules)
+        # path -> file signature when it was skipped; a new project may route it
+        self.skipped = {}
+
+    def reload_if_changed(self):
+        """Re-parse only if someone else rewrote the project file."""
+        if project_io.signature(self.project_file) != self.signature:
+            print("🔄 project.pbxproj changed on disk, reloading")
+            self.load()
+
+    def missing_in(self, directories):
+        """
+        Supported files directly inside `directories` that the project lacks.
+
+        Files named by a reference outside any group are reported, like
+        --check does, and then skipped like any other file that can't be
+        added.
+        """
+        from add_missing_files_to_project import report_orphaned
+        from project_reconcile import split_orphaned
+        from project_targets import FILE_TYPES
+
+        extensions = tuple(FILE_TYPES)
+        missing = []
+        for directory in sorted(directories):
+            try:
+                with os.scandir(directory) as entries:
+                    names = sorted(e.name for e in entries if e.name.endswith(extensions))
+            except OSError:
+                continue
+            for name in names:
+                path = os.path.join(directory, name)
+                if path in self.tree:
+                    continue
+                if path in self.skipped:
+                    if self.skipped[path] == project_io.signature(path):
+                        continue
+                    del self.skipped[path]
+                missing.append(path)
+        missing, orphaned = split_orphaned(self.tree, missing)
+        report_orphaned(orphaned)
+        for path in orphaned:
+            self.skipped[path] = project_io.signature(path)
+        return [Path(path) for path in missing]
+
+    def apply(self, directories):
+        """
+        Add the missing files under `directories` and write the project once.
+
+        Runs under the project lock; if another writer changed the file
+        since it was loaded, the project is reloaded and the batch redone.
+
+        Returns:
+            Number of files added
+        """
+        from add_missing_files_to_project import add_file_to_project
+
+        with project_io.ProjectLock(self.project_file):
+            for _ in range(project_io.DEFAULT_RETRIES):
+                self.reload_if_changed()
+                missing = self.missing_in(directories)
+                if not missing:
+                    return 0
+
+                added = 0
+                for file_path in missing:
+                    try:
+                        if add_file_to_project(file_path, self.project, verbose=self.verbose,
+                                               tree=self.tree, targets=self.targets):
+                            added += 1
+                            print(f"  ✅ Added {file_path}")
+                        else:
+                            # Already warned; stay quiet until the file changes
+                            self.skipped[str(file_path)] = project_io.signature(file_path)
+                    except Exception as e:
+                        print(f"  ❌ Error adding {file_path}: {e}")
+                if not added:
+                    return 0
+
+                # The graph keeps every edit since load(); serialize() splices
+                # them all into the originally parsed text, so no re-parse here
+                text = self.project.serialize()
+                if project_io.write_project(self.project_file, text, self.text, self.signature) is None:
+                    print("🔄 project.pbxproj changed while it was being edited, reloading")
+                    self.load()
+                    continue
+                self.text = text
+                self.signature = project_io.signature(self.project_file)
+                return added
+        raise project_io.ProjectBusyError(f"{self.project_file} kept changing")
+
+
+def run_watch(roots, project_file, poll=False, debounce=DEFAULT_DEBOUNCE,
+              interval=DEFAULT_POLL_INTERVAL, idle_timeout=None, verbose=False, rules=None):
+    """
+    Watch `roots` and keep `project_file` in sync until interrupted.
+
+    Args:
+        roots: Source directories to watch
+        project_file: Path to project.pbxproj
+        poll: Force the polling watcher
+        debounce: Seconds of quiet that end a burst of events
+        interval: Polling interval for the fallback watcher
+        idle_timeout: Exit after this many idle seconds (None = run forever)
+        verbose: Verbose add output
+        rules: Target path rules (default: project_targets.DEFAULT_RULES)
+
+    Returns:
+        Total number of files added
+    """
+    roots = [str(root) for root in roots if os.path.isdir(root)]
+    sync = ProjectSync(project_file, verbose=verbose, rules=rules)
+
+    # Catch anything that went missing while nobody was watching
+    total = sync.apply([d for root in roots for d in walk_dirs(root)])
+
+    watcher = make_watcher(roots, poll=poll, interval=interval)
+    kind = 'polling' if isinstance(watcher, PollingWatcher) else 'inotify'
+    print(f"👀 Watching {', '.join(roots)} ({kind}, {debounce:.1f}s debounce)")
+    print("   Press Ctrl+C to stop")
+    try:
+        for changed in batches(watcher, debounce=debounce, idle_timeout=idle_timeout):
+            started = time.perf_counter()
+            added = sync.apply(changed)
+            total += added
+            if added:
+                elapsed = (time.perf_counter() - started) * 1000
+                print(f"📝 {len(changed)} changed dir(s), added {added} file(s) in {elapsed:.1f} ms")
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+    finally:
+        watcher.close()
+    return total
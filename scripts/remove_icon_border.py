@@ -6,44 +6,29 @@ Removes white pixels around the edges of the head silhouette.
 
 import os
 import sys
-from PIL import Image
-import numpy as np
+import argparse
 
-def remove_white_border(image_path, output_path, threshold=240):
+import icon_pipeline
+import png_encoder
+import stage_timing
+from icon_jobs import add_jobs_argument
+
+@stage_timing.timed
+def remove_white_border(image_path, output_path, threshold=240, preset=None):
     """
     Remove white borders from an image by making white pixels transparent
     or removing them if they're on the edge of the design element.
 
+    Preset over the `white-clear` pipeline stage.
+
     Args:
         image_path: Path to input image
         output_path: Path to save processed image
         threshold: RGB threshold for "white" (0-255, default 240)
+        preset: PNG encoder preset (see png_encoder.PRESETS)
     """
     try:
-        # Open image
-        img = Image.open(image_path)
-
-        # Convert to RGBA if not already
-        if img.mode != 'RGBA':
-            img = img.convert('RGBA')
-
-        # Convert to numpy array for processing
-        data = np.array(img)
-
-        # Create mask for white pixels (RGB all above threshold)
-        # We'll make white pixels transparent
-        white_mask = (data[:, :, 0] > threshold) & \
-                    (data[:, :, 1] > threshold) & \
-                    (data[:, :, 2] > threshold)
-
-        # Make white pixels transparent
-        data[white_mask, 3] = 0  # Set alpha to 0 for white pixels
-
-        # Convert back to PIL Image
-        result = Image.fromarray(data)
-
-        # Save result
-        result.save(output_path, 'PNG', optimize=True)
+        icon_pipeline.apply_pipeline(image_path, output_path, ['white-clear'], {'threshold': threshold}, preset)
         print(f"✓ Processed: {os.path.basename(image_path)}")
         return True
 
@@ -51,60 +36,44 @@ def remove_white_border(image_path, output_path, threshold=240):
         print(f"✗ Error processing {image_path}: {e}")
         return False
 
-def process_icon_set(icon_set_path, output_path=None):
+def process_icon_set(icon_set_path, output_path=None, jobs=1, use_cache=True, threshold=240, preset=None):
     """
     Process all PNG files in an icon set directory.
 
     Args:
         icon_set_path: Path to .appiconset directory
         output_path: Optional output directory (defaults to same location with _noborder suffix)
+        jobs: Number of worker processes
+        use_cache: Skip files the catalog manifest says are already processed
+        threshold: RGB threshold for "white" (0-255, default 240)
+        preset: PNG encoder preset (see png_encoder.PRESETS)
     """
-    if not os.path.exists(icon_set_path):
-        print(f"Error: Directory not found: {icon_set_path}")
-        return False
-
-    # Get all PNG files
-    png_files = [f for f in os.listdir(icon_set_path) if f.endswith('.png')]
-
-    if not png_files:
-        print(f"No PNG files found in {icon_set_path}")
-        return False
-
-    print(f"Found {len(png_files)} icon files to process...")
-    print(f"Processing icons in: {icon_set_path}\n")
-
-    # Process each file
-    success_count = 0
-    for png_file in png_files:
-        input_path = os.path.join(icon_set_path, png_file)
-
-        if output_path:
-            os.makedirs(output_path, exist_ok=True)
-            output_file = os.path.join(output_path, png_file)
-        else:
-            # Backup original and replace
-            backup_path = input_path + '.backup'
-            if not os.path.exists(backup_path):
-                os.rename(input_path, backup_path)
-            output_file = input_path
-
-        if remove_white_border(input_path if not output_path else input_path, output_file):
-            success_count += 1
-
-    print(f"\n✓ Successfully processed {success_count}/{len(png_files)} icons")
-    return success_count == len(png_files)
+    return icon_pipeline.process_icon_set(
+        icon_set_path, output_path, stages=['white-clear'], params={'threshold': threshold},
+        jobs=jobs, use_cache=use_cache, preset=preset
+    )
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().splitlines()[0],
+        epilog=("Example:\n"
+                "  python3 remove_icon_border.py ../PlenaRoundedAppIcon_v2.appiconset\n"
+                "  python3 remove_icon_border.py ../PlenaRoundedAppIcon_v2.appiconset ./output"),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("icon_set_path", help="Path to .appiconset directory")
+    parser.add_argument("output_path", nargs="?", help="Optional output directory (defaults to in-place with .backup)")
+    parser.add_argument("--threshold", type=int, default=240, help="RGB threshold for \"white\" (0-255, default 240)")
+    add_jobs_argument(parser)
+    parser.add_argument("--no-cache", action="store_true", help="Reprocess every file, ignoring the catalog manifest")
+    png_encoder.add_preset_argument(parser)
+    stage_timing.add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    with stage_timing.Session(args, 'remove_icon_border'):
+        process_icon_set(args.icon_set_path, args.output_path, jobs=args.jobs, use_cache=not args.no_cache,
+                         threshold=args.threshold, preset=args.png_preset)
+    return 0
 
 if __name__ == '__main__':
-    if len(sys.argv) < 2:
-        print("Usage: python3 remove_icon_border.py <icon_set_path> [output_path]")
-        print("\nExample:")
-        print("  python3 remove_icon_border.py ../PlenaRoundedAppIcon_v2.appiconset")
-        print("  python3 remove_icon_border.py ../PlenaRoundedAppIcon_v2.appiconset ./output")
-        sys.exit(1)
-
-    icon_set = sys.argv[1]
-    output_dir = sys.argv[2] if len(sys.argv) > 2 else None
-
-    process_icon_set(icon_set, output_dir)
-
-
+    sys.exit(main())
@@ -50,28 +50,8 @@ case $choice in
         echo "===================="
         echo ""
 
-        # Check if fswatch is installed
-        if ! command -v fswatch &> /dev/null; then
-            echo "❌ fswatch is not installed"
-            echo ""
-            read -p "Install fswatch with Homebrew? (y/n) " -n 1 -r
-            echo ""
-            if [[ $REPLY =~ ^[Yy]$ ]]; then
-                if command -v brew &> /dev/null; then
-                    brew install fswatch
-                    echo "✅ fswatch installed"
-                else
-                    echo "❌ Homebrew not found. Install fswatch manually:"
-                    echo "   Visit: https://github.com/emcrisostomo/fswatch"
-                    exit 1
-                fi
-            else
-                echo "⚠️  File watcher requires fswatch. Install it manually."
-                exit 1
-            fi
-        else
-            echo "✅ fswatch is installed"
-        fi
+        # The watcher is built into add_missing_files_to_project.py (--watch)
+        echo "✅ No extra tools needed (inotify on Linux, polling elsewhere)"
 
         echo ""
         echo "To start the file watcher:"
@@ -126,17 +106,12 @@ EOF
         echo ""
 
         # File watcher
-        if command -v fswatch &> /dev/null; then
-            echo "2️⃣  File Watcher:"
-            read -p "   Start file watcher now? (y/n) " -n 1 -r
-            echo ""
-            if [[ $REPLY =~ ^[Yy]$ ]]; then
-                nohup "$SCRIPT_DIR/watch_for_new_files.sh" > /dev/null 2>&1 &
-                echo "   ✅ File watcher started (PID: $!)"
-            fi
-        else
-            echo "2️⃣  File Watcher:"
-            echo "   ⚠️  fswatch not installed. Install with: brew install fswatch"
+        echo "2️⃣  File Watcher:"
+        read -p "   Start file watcher now? (y/n) " -n 1 -r
+        echo ""
+        if [[ $REPLY =~ ^[Yy]$ ]]; then
+            nohup "$SCRIPT_DIR/watch_for_new_files.sh" > /dev/null 2>&1 &
+            echo "   ✅ File watcher started (PID: $!)"
         fi
         echo ""
 
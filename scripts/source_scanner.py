@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Fast source file scanner for the project sync tooling.
+
+Walks the source roots with os.scandir on plain strings (no Path objects),
+pruning directories that never hold project sources: build output
+(.build, DerivedData), asset catalogs and icon bundles (*.xcassets, *.icon),
+the archive/ tree, hidden directories, and anything passed in `exclude`.
+Each top-level root is walked in its own thread; results are merged and
+sorted once at the end.
+
+Directory bundles whose name carries a wanted extension (e.g. a
+.xcdatamodeld model) are reported as files and not descended into.
+
+Usage:
+    python3 scripts/source_scanner.py [ROOT ...] [--ext .swift] [--exclude NAME] [--time]
+"""
+
+import os
+import sys
+
+DEFAULT_EXTENSIONS = ('.swift',)
+
+# Directory names that are never walked
+PRUNED_DIRS = frozenset({
+    '.build', '.git', '.swiftpm', 'DerivedData', 'build', 'archive',
+    'Pods', 'Carthage', 'node_modules', 'xcuserdata', '__pycache__',
+})
+
+# Directory suffixes that are never walked (bundles Xcode treats as one item)
+PRUNED_SUFFIXES = ('.xcassets', '.icon', '.appiconset', '.xcodeproj', '.xcworkspace',
+                   '.framework', '.xcframework', '.app', '.bundle')
+
+
+def make_pruner(exclude=()):
+    """
+    Build the directory filter used by the walkers.
+
+    Args:
+        exclude: Extra directory names, or '*.suffix' patterns, to prune
+
+    Returns:
+        Function taking a directory name and returning True to skip it
+    """
+    names = set(PRUNED_DIRS)
+    suffixes = list(PRUNED_SUFFIXES)
+    for pattern in exclude:
+        if pattern.startswith('*.'):
+            suffixes.append(pattern[1:])
+        else:
+            names.add(pattern.rstrip('/'))
+    suffixes = tuple(suffixes)
+
+    def pruned(name):
+        return name[0] == '.' or name in names or name.endswith(suffixes)
+    return pruned
+
+
+is_pruned = make_pruner()
+
+
+def walk_root(root, extensions=DEFAULT_EXTENSIONS, pruned=is_pruned):
+    """
+    Return every file under `root` ending in one of `extensions`.
+
+    Args:
+        root: Directory to walk
+        extensions: Tuple of filename suffixes to collect
+        pruned: Directory filter from make_pruner()
+
+    Returns:
+        Unsorted list of path strings, prefixed with `root`
+    """
+    found = []
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                name = entry.name
+                if name.endswith(extensions):
+                    found.append(entry.path)
+                elif entry.is_dir(follow_symlinks=False) and not pruned(name):
+                    stack.append(entry.path)
+    return found
+
+
+def scan(roots, extensions=DEFAULT_EXTENSIONS, exclude=(), jobs=None):
+    """
+    Scan `roots` concurrently, one thread per root.
+
+    Args:
+        roots: Top-level directories (missing ones are skipped)
+        extensions: Filename suffixes to collect, e.g. ('.swift', '.storekit')
+        exclude: Extra directory names or '*.suffix' patterns to prune
+        jobs: Thread count (default: one per root)
+
+    Returns:
+        Sorted list of path strings
+    """
+    extensions = tuple(extensions)
+    pruned = make_pruner(exclude) if exclude else is_pruned
+    roots = [root for root in roots if os.path.isdir(root)]
+    if len(roots) <= 1 or jobs == 1:
+        results = [walk_root(root, extensions, pruned) for root in roots]
+    else:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=jobs or len(roots)) as pool:
+            results = list(pool.map(lambda root: walk_root(root, extensions, pruned), roots))
+    files = [path for result in results for path in result]
+    files.sort()
+    return files
+
+
+def main():
+    import time
+    import argparse
+
+    parser = argparse.ArgumentParser(description="List source files under the project roots")
+    parser.add_argument("roots", nargs="*", help="Directories to scan (default: the project source roots)")
+    parser.add_argument("--ext", action="append", help="Extension to collect, repeatable (default: .swift)")
+    parser.add_argument("--exclude", action="append", default=[],
+                        help="Extra directory name or '*.suffix' to prune, repeatable")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Threads (default: one per root)")
+    parser.add_argument("--time", action="store_true", help="Print the scan time instead of the files")
+    args = parser.parse_args()
+
+    if args.roots:
+        roots = args.roots
+    else:
+        from add_missing_files_to_project import PROJECT_DIRS
+        roots = PROJECT_DIRS
+
+    start = time.perf_counter()
+    files = scan(roots, extensions=args.ext or DEFAULT_EXTENSIONS, exclude=args.exclude, jobs=args.jobs)
+    elapsed = (time.perf_counter() - start) * 1000
+    if args.time:
+        print(f"⏱ {len(files)} file(s) in {elapsed:.1f} ms")
+    else:
+        for path in files:
+            print(path)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
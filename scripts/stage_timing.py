@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Per-stage timing and counters for the tooling scripts.
+
+Hot paths mark stages and bump counters:
+
+    with stage_timing.stage('decode'):
+        ...
+    stage_timing.count('bytes_read', size)
+
+and whole functions are timed with the @stage_timing.timed decorator.
+Collection is off by default: stage() then hands back one shared no-op
+context manager, count() returns after a flag check and timed functions
+are called straight through, so instrumented code costs a function call
+per stage.
+
+Two flags, added to a script by add_profile_arguments(), turn it on for
+the duration of a Session:
+
+- --stats: aggregate calls and wall time per stage plus the counters,
+  printed as a table at exit
+- --profile [PREFIX]: also run the command under cProfile and record every
+  stage as a Chrome trace event; writes PREFIX.prof (pstats / snakeviz) and
+  PREFIX.trace.json (chrome://tracing, Perfetto)
+
+Stages nest, so their times overlap in the table. Worker processes
+(icon_jobs) collect their own stats; each task's delta travels back with
+its result and is merged into the parent, the same way output_writer's
+write counts do. cProfile only covers the parent process; the trace shows
+the workers' stages under their own pid.
+"""
+
+import os
+import sys
+import time
+import functools
+
+enabled = False
+tracing = False
+
+
+class Stats:
+    """Per-stage (calls, seconds), counters, and trace events of one process."""
+
+    def __init__(self):
+        self.stages = {}
+        self.counters = {}
+        # (name, start µs, duration µs, pid, tid)
+        self.events = []
+
+    def reset(self):
+        self.__init__()
+
+    def snapshot(self):
+        """Marker for since(); None while collection is off."""
+        if not enabled:
+            return None
+        return ({name: tuple(entry) for name, entry in self.stages.items()},
+                dict(self.counters), len(self.events))
+
+    def since(self, snapshot):
+        """Return what was collected after `snapshot` (None if nothing was)."""
+        if snapshot is None:
+            return None
+        stages, counters, events = snapshot
+        return (
+            {name: (entry[0] - stages.get(name, (0, 0.0))[0], entry[1] - stages.get(name, (0, 0.0))[1])
+             for name, entry in self.stages.items()},
+            {name: value - counters.get(name, 0) for name, value in self.counters.items()},
+            self.events[events:],
+        )
+
+    def add(self, delta):
+        """Merge a delta from since(), e.g. from a worker process."""
+        if delta is None:
+            return
+        stages, counters, events = delta
+        for name, (calls, seconds) in stages.items():
+            entry = self.stages.setdefault(name, [0, 0.0])
+            entry[0] += calls
+            entry[1] += seconds
+        for name, value in counters.items():
+            self.counters[name] = self.counters.get(name, 0) + value
+        self.events.extend(events)
+
+
+stats = Stats()
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ('name', 'start', 'wall')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        if tracing:
+            self.wall = time.time_ns() // 1000
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        entry = stats.stages.get(self.name)
+        if entry is None:
+            entry = stats.stages[self.name] = [0, 0.0]
+        entry[0] += 1
+        entry[1] += elapsed
+        if tracing:
+            import threading
+            stats.events.append((self.name, self.wall, int(elapsed * 1e6), os.getpid(), threading.get_ident()))
+        return False
+
+
+def stage(name):
+    """Context manager timing one stage (a shared no-op while collection is off)."""
+    if not enabled:
+        return _NULL_STAGE
+    return _Stage(name)
+
+
+def count(name, amount=1):
+    """Add `amount` to a counter (bytes_read, files_processed, ...)."""
+    if enabled:
+        stats.counters[name] = stats.counters.get(name, 0) + amount
+
+
+def timed(func):
+    """Decorator: time every call of `func` as a stage named after it."""
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not enabled:
+            return func(*args, **kwargs)
+        with _Stage(name):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def configure(collect, trace=False):
+    """Turn collection (and trace events) on or off for this process."""
+    global enabled, tracing
+    enabled = bool(collect)
+    tracing = bool(collect and trace)
+
+
+def settings():
+    """Current (enabled, tracing), for passing to worker processes."""
+    return (enabled, tracing)
+
+
+def add_profile_arguments(parser):
+    """Add the shared --stats and --profile options to an argparse parser."""
+    parser.add_argument("--stats", action="store_true",
+                        help="Print wall time per stage, bytes read/written and files processed/skipped")
+    parser.add_argument("--profile", nargs="?", const="", metavar="PREFIX",
+                        help="Write a cProfile dump (PREFIX.prof) and a Chrome trace (PREFIX.trace.json); "
+                             "PREFIX defaults to the script name")
+
+
+def _format_bytes(value):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if abs(value) < 1024 or unit == 'GB':
+            return f"{value:.0f} {unit}" if unit == 'B' else f"{value:.1f} {unit}"
+        value /= 1024
+
+
+def print_table(wall, out=None):
+    """Print the per-stage summary and the counters."""
+    out = out or sys.stdout
+    print(f"\n⏱ {'Stage':<24}{'calls':>8}{'total':>13}{'mean':>12}{'share':>8}", file=out)
+    for name, (calls, seconds) in sorted(stats.stages.items(), key=lambda item: -item[1][1]):
+        share = seconds / wall * 100 if wall else 0.0
+        print(f"   {name:<24}{calls:>8}{seconds * 1000:>11.1f}ms{seconds / calls * 1000:>10.2f}ms{share:>7.1f}%",
+              file=out)
+    print(f"   {'(wall time)':<24}{'':>8}{wall * 1000:>11.1f}ms", file=out)
+    if stats.counters:
+        print("📊 Counters", file=out)
+        for name, value in sorted(stats.counters.items()):
+            shown = f"{value} ({_format_bytes(value)})" if name.startswith('bytes_') else str(value)
+            print(f"   {name:<24}{shown:>20}", file=out)
+
+
+def write_trace(path):
+    """Write the collected stages as Chrome trace-event JSON."""
+    import json
+
+    events = [{'name': name, 'cat': 'stage', 'ph': 'X', 'ts': start, 'dur': duration, 'pid': pid, 'tid': tid}
+              for name, start, duration, pid, tid in stats.events]
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+
+class Session:
+    """
+    Collect stats for the block when --stats or --profile was given.
+
+    On exit (also via sys.exit) the table is printed and, with --profile,
+    the cProfile dump and trace are written.
+    """
+
+    def __init__(self, args, name, out=None):
+        self.out = out
+        self.show = getattr(args, 'stats', False)
+        self.prefix = getattr(args, 'profile', None)
+        if self.prefix == '':
+            self.prefix = name
+        self.profiler = None
+
+    def __enter__(self):
+        if not self.show and self.prefix is None:
+            return self
+        stats.reset()
+        configure(True, trace=self.prefix is not None)
+        if self.prefix is not None:
+            import cProfile
+            self.profiler = cProfile.Profile()
+        self.start = time.perf_counter()
+        if self.profiler:
+            self.profiler.enable()
+        return self
+
+    def __exit__(self, *exc):
+        if not enabled:
+            return False
+        if self.profiler:
+            self.profiler.disable()
+        wall = time.perf_counter() - self.start
+        configure(False)
+        print_table(wall, self.out)
+        if self.profiler:
+            self.profiler.dump_stats(f"{self.prefix}.prof")
+            write_trace(f"{self.prefix}.trace.json")
+            print(f"📝 Profile: {self.prefix}.prof, trace: {self.prefix}.trace.json", file=self.out or sys.stdout)
+        return False
@@ -0,0 +1,109 @@
+"""Tests for add_missing_files_to_project.py: the --check report and adding files."""
+
+import io
+import os
+import sys
+import json
+import shutil
+import tempfile
+import posixpath
+import unittest
+from contextlib import redirect_stdout
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+from add_missing_files_to_project import PROJECT_DIRS, add_missing_files, check  # noqa: E402
+from pbxproj import PBXProject  # noqa: E402
+from project_reconcile import is_managed  # noqa: E402
+from project_tree import ProjectTree  # noqa: E402
+
+GOLDEN_PROJECT = os.path.join(SCRIPTS_DIR, 'benchmarks', 'golden', 'Plena.snapshot.pbxproj')
+TEST_FILE = 'Tests/DashboardViewModelTests.swift'
+
+
+class ProjectTestCase(unittest.TestCase):
+    """Runs in an empty directory: only the scanned list says which files exist."""
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.root = tempfile.mkdtemp()
+        os.chdir(self.root)
+        with open(GOLDEN_PROJECT, 'r', encoding='utf-8') as f:
+            self.project = PBXProject(f.read())
+        self.source_files = sorted(
+            path for path in ProjectTree(self.project).files
+            if is_managed(path, PROJECT_DIRS) and not posixpath.dirname(path).endswith('.xcdatamodeld'))
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.root)
+
+
+class CheckTests(ProjectTestCase):
+
+    def check(self, source_files, output_format='plain'):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            status = check(self.project, source_files, output_format)
+        return status, out.getvalue()
+
+    def test_in_sync(self):
+        status, out = self.check(self.source_files)
+        self.assertEqual(status, 0)
+        self.assertIn('in sync', out)
+
+    def test_orphaned_files_do_not_fail(self):
+        status, out = self.check(self.source_files + [TEST_FILE])
+        self.assertEqual(status, 0)
+        self.assertIn('Referenced outside any group: 1', out)
+        self.assertIn(f'- {TEST_FILE}', out)
+
+    def test_same_name_under_another_root_is_missing(self):
+        elsewhere = 'PlenaShared/Services/' + posixpath.basename(TEST_FILE)
+        status, out = self.check(self.source_files + [elsewhere])
+        self.assertEqual(status, 1)
+        self.assertIn(f'- {elsewhere}', out)
+        self.assertNotIn('Referenced outside any group', out)
+
+    def test_missing_and_stale_fail(self):
+        status, out = self.check(self.source_files[1:] + ['Plena/Views/New.swift'])
+        self.assertEqual(status, 1)
+        self.assertIn('❌ 1 file(s) not in the Xcode project', out)
+        self.assertIn(f'- {self.source_files[0]}', out)
+
+    def test_json_report(self):
+        status, out = self.check(self.source_files + [TEST_FILE, 'Plena/Views/New.swift'], 'json')
+        report = json.loads(out)
+        self.assertEqual(status, 1)
+        self.assertEqual(report['missing'], ['Plena/Views/New.swift'])
+        self.assertEqual(report['orphaned'], [TEST_FILE])
+        self.assertEqual(report['stale'], [])
+
+
+class AddTests(ProjectTestCase):
+
+    def add(self, source_files, dry_run=False):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            added = add_missing_files(self.project, source_files, dry_run=dry_run)
+        return added, out.getvalue()
+
+    def test_orphaned_files_are_reported_not_added(self):
+        for dry_run in (True, False):
+            with self.subTest(dry_run=dry_run):
+                added, out = self.add(self.source_files + [TEST_FILE], dry_run)
+                self.assertEqual(added, 0)
+                self.assertIn('1 file(s) have a file reference that no group contains', out)
+                self.assertIn('All source files are in the Xcode project', out)
+                self.assertNotIn('No target for', out)
+
+    def test_same_name_under_another_root_is_added(self):
+        elsewhere = 'PlenaShared/Services/' + posixpath.basename(TEST_FILE)
+        added, out = self.add(self.source_files + [elsewhere])
+        self.assertEqual(added, 1)
+        self.assertIn(elsewhere, ProjectTree(self.project))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+"""Tests for background_color.py: sample regions and dominant colors."""
+
+import os
+import sys
+import unittest
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+if np is not None:
+    from background_color import detect_background_color, dominant_colors, sample_pixels  # noqa: E402
+
+
+def solid(height, width, color):
+    data = np.zeros((height, width, len(color)), dtype=np.uint8)
+    data[:, :] = color
+    return data
+
+
+@unittest.skipUnless(np is not None, "needs NumPy")
+class SampleTests(unittest.TestCase):
+
+    def test_center_of_one_pixel(self):
+        data = solid(9, 9, (0, 0, 0))
+        data[4, 4] = (255, 0, 0)
+        pixels = sample_pixels(data, ('center',), sample_size=1)
+        self.assertEqual(pixels.tolist(), [[255, 0, 0]])
+
+    def test_center_of_small_image(self):
+        # The default size is W // 4, which is 0 here; still one pixel
+        data = solid(3, 3, (10, 20, 30))
+        self.assertEqual(len(sample_pixels(data, ('center',))), 1)
+        self.assertEqual(dominant_colors(data, ('center',)), [((10, 20, 30), 1.0)])
+
+    def test_center_size_is_exact(self):
+        data = solid(16, 16, (0, 0, 0))
+        self.assertEqual(len(sample_pixels(data, ('center',), sample_size=3)), 9)
+        self.assertEqual(len(sample_pixels(data, ('center',), sample_size=4)), 16)
+
+    def test_center_no_larger_than_image(self):
+        data = solid(4, 6, (0, 0, 0))
+        self.assertEqual(len(sample_pixels(data, ('center',), sample_size=100)), 16)
+
+    def test_unknown_region(self):
+        with self.assertRaises(ValueError):
+            sample_pixels(solid(4, 4, (0, 0, 0)), ('middle',))
+
+
+@unittest.skipUnless(np is not None, "needs NumPy")
+class DominantColorTests(unittest.TestCase):
+
+    def test_most_common_first(self):
+        data = solid(8, 8, (0, 0, 255))
+        data[:2, :] = (255, 255, 255)
+        colors = dominant_colors(data, ('corners',), top_k=2, sample_size=4)
+        self.assertEqual([color for color, _ in colors], [(0, 0, 255), (255, 255, 255)])
+        self.assertAlmostEqual(sum(share for _, share in colors), 1.0)
+
+    def test_transparent_pixels_are_ignored(self):
+        data = solid(8, 8, (255, 0, 0, 0))
+        data[3:5, 3:5] = (0, 255, 0, 255)
+        self.assertEqual(detect_background_color(data), (0, 255, 0))
+
+    def test_default_when_nothing_is_opaque(self):
+        data = solid(8, 8, (255, 0, 0, 0))
+        self.assertEqual(detect_background_color(data, default=(1, 2, 3)), (1, 2, 3))
+
+    def test_quantized_buckets_report_mean(self):
+        data = solid(4, 4, (100, 100, 100))
+        data[:2, :] = (102, 102, 102)
+        colors = dominant_colors(data, ('center',), quantize=3, sample_size=4)
+        self.assertEqual(colors, [((101, 101, 101), 1.0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+"""Tests for bench_harness.py: baseline comparison and the results file."""
+
+import io
+import os
+import sys
+import json
+import argparse
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+import bench_harness  # noqa: E402
+
+
+def format_ms(seconds):
+    return f"{seconds * 1000:.0f} ms"
+
+
+def pairs(results, baseline):
+    for name, seconds in results['cases'].items():
+        if name in baseline['cases']:
+            yield name, seconds, baseline['cases'][name]
+
+
+class CompareTests(unittest.TestCase):
+
+    def compare(self, pairs, tolerance=0.25, min_regression=0.005):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            regressions = bench_harness.compare(pairs, tolerance, min_regression, format_ms)
+        return regressions, out.getvalue()
+
+    def test_slower_than_tolerance_is_a_regression(self):
+        regressions, out = self.compare([('parse', 0.200, 0.100), ('write', 0.110, 0.100)])
+        self.assertEqual(regressions, 1)
+        self.assertIn('parse: 100 ms → 200 ms (+100%)', out)
+        self.assertNotIn('write', out)
+
+    def test_differences_below_the_noise_floor_are_ignored(self):
+        self.assertEqual(self.compare([('tiny', 0.004, 0.001)])[0], 0)
+
+
+class FinishTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.baseline = os.path.join(self.directory.name, 'baseline.json')
+        with open(self.baseline, 'w', encoding='utf-8') as f:
+            json.dump({'cases': {'parse': 0.100}}, f)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def finish(self, results, *argv):
+        parser = argparse.ArgumentParser()
+        bench_harness.add_arguments(parser, os.path.join(self.directory.name, 'out.json'), 0.25, 'case')
+        args = parser.parse_args(list(argv))
+        with redirect_stdout(io.StringIO()):
+            return bench_harness.finish(results, args, pairs, 0.005, format_ms, 'case')
+
+    def read(self, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_results_are_written(self):
+        self.assertEqual(self.finish({'cases': {'parse': 0.1}}, '--baseline', self.baseline), 0)
+        self.assertEqual(self.read(os.path.join(self.directory.name, 'out.json')), {'cases': {'parse': 0.1}})
+
+    def test_regressed_results_do_not_replace_the_baseline(self):
+        self.assertEqual(self.finish({'cases': {'parse': 0.3}}, '--baseline', self.baseline, '-o', self.baseline), 1)
+        self.assertEqual(self.read(self.baseline), {'cases': {'parse': 0.100}})
+
+    def test_good_results_replace_the_baseline(self):
+        self.finish({'cases': {'parse': 0.09}}, '--baseline', self.baseline, '-o', self.baseline)
+        self.assertEqual(self.read(self.baseline), {'cases': {'parse': 0.09}})
+
+    def test_environment_header(self):
+        header = bench_harness.environment(seed=1)
+        self.assertEqual(header['seed'], 1)
+        self.assertIn('python', header)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+"""Tests for bench_project_sync.py: the synthetic project and its reconcile."""
+
+import os
+import sys
+import shutil
+import random
+import tempfile
+import unittest
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+import bench_project_sync as bench  # noqa: E402
+
+
+class SourcePathTests(unittest.TestCase):
+
+    def test_paths_are_unique_and_spread_over_the_roots(self):
+        paths = bench.source_paths(200, 3)
+        self.assertEqual(len(set(paths)), 200)
+        self.assertEqual({path.split('/')[0] for path in paths}, set(bench.ROOTS))
+        self.assertTrue(all(path.count('/') == 4 for path in paths))
+
+    def test_changes_are_reproducible(self):
+        paths = bench.source_paths(400, 2)
+        first = bench.plan_changes(paths, random.Random(7))
+        self.assertEqual(first, bench.plan_changes(paths, random.Random(7)))
+        adds, removes, moves = first
+        self.assertFalse(set(adds) & set(paths))
+        self.assertTrue(set(removes) <= set(paths))
+        self.assertTrue(all(old != new for old, new in moves))
+
+
+class PipelineTests(unittest.TestCase):
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.root)
+
+    def run_in(self, name, seed=3):
+        directory = os.path.join(self.root, name)
+        info = bench.generate(directory, 120, 2, seed)
+        os.chdir(directory)
+        try:
+            return info, bench.run_pipeline(seed)
+        finally:
+            os.chdir(self.cwd)
+
+    def test_reconcile_brings_the_project_in_sync(self):
+        from pbxproj import PBXProject
+        from project_reconcile import diff
+        from project_tree import ProjectTree
+        from source_scanner import scan
+
+        info, (before, after) = self.run_in('a')
+        self.assertEqual(info['refs'], 120)
+        self.assertNotEqual(before, after)
+        self.assertTrue(bench.xcode_layout_matches(after))
+
+        os.chdir(os.path.join(self.root, 'a'))
+        self.assertEqual(diff(ProjectTree(PBXProject(after)), scan(bench.ROOTS), bench.ROOTS), ([], []))
+
+    def test_same_seed_gives_the_same_output(self):
+        self.assertEqual(self.run_in('a')[1], self.run_in('b')[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
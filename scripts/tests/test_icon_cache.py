@@ -0,0 +1,174 @@
+"""Tests for icon_cache.py: when a processed icon can be skipped."""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+import icon_cache  # noqa: E402
+
+PARAMS = {'background': (255, 255, 255), 'preset': 'balanced'}
+
+
+class IconCacheTestCase(unittest.TestCase):
+    """A catalog in a temp directory, with the manifests in another one."""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.catalog = os.path.join(self.root, 'Assets.xcassets')
+        self.icon_set = os.path.join(self.catalog, 'AppIcon.appiconset')
+        os.makedirs(self.icon_set)
+        environ = mock.patch.dict(os.environ, {'XDG_CACHE_HOME': os.path.join(self.root, 'cache')})
+        environ.start()
+        self.addCleanup(environ.stop)
+        self.input = self.path('master.png')
+        self.output = self.path('icon_1024.png')
+        self.write(self.input, b'input')
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def path(self, name):
+        return os.path.join(self.icon_set, name)
+
+    def write(self, path, data):
+        with open(path, 'wb') as f:
+            f.write(data)
+
+    def process(self, cache, input_path, output_path, data, params=PARAMS):
+        """Stand-in for an icon operation: hash the input, write, record."""
+        input_hash = icon_cache.file_sha256(input_path)
+        self.write(output_path, data)
+        cache.record(input_hash, input_path, output_path, 'flatten', params)
+
+    def reopen(self, cache):
+        cache.save()
+        return icon_cache.IconCache.for_path(self.icon_set)
+
+    def touch(self, path):
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+class LocationTests(IconCacheTestCase):
+
+    def test_manifest_lives_outside_the_catalog(self):
+        cache = icon_cache.IconCache.for_path(self.output)
+        self.assertEqual(cache.root, os.path.abspath(self.catalog))
+        self.process(cache, self.input, self.output, b'output')
+        cache.save()
+        self.assertTrue(cache.path.startswith(os.path.join(self.root, 'cache', icon_cache.CACHE_DIR_NAME)))
+        self.assertTrue(os.path.exists(cache.path))
+        self.assertEqual(sorted(os.listdir(self.icon_set)), ['icon_1024.png', 'master.png'])
+
+    def test_outside_a_catalog_the_directory_is_the_root(self):
+        loose = os.path.join(self.root, 'loose')
+        os.makedirs(loose)
+        self.assertEqual(icon_cache.find_catalog_root(os.path.join(loose, 'a.png')), loose)
+
+
+class SeparateOutputTests(IconCacheTestCase):
+
+    def test_matching_rerun_skips(self):
+        cache = icon_cache.IconCache.for_path(self.icon_set)
+        self.process(cache, self.input, self.output, b'output')
+        cache = self.reopen(cache)
+        self.assertTrue(cache.is_fresh(self.input, self.output, 'flatten', PARAMS))
+        self.assertEqual(cache.skipped, 1)
+        # The fast path only stats the files
+        self.assertFalse(cache.dirty)
+
+    def test_changed_parameter_reprocesses(self):
+        cache = icon_cache.IconCache.for_path(self.icon_set)
+        self.process(cache, self.input, self.output, b'output')
+        cache = self.reopen(cache)
+        self.assertFalse(cache.is_fresh(self.input, self.output, 'flatten', dict(PARAMS, preset='smallest')))
+        self.assertFalse(cache.is_fresh(self.input, self.output, 'remove_alpha', PARAMS))
+
+    def test_replaced_input_reprocesses(self):
+        cache = icon_cache.IconCache.for_path(self.icon_set)
+        self.process(cache, self.input, self.output, b'output')
+        # Same size, new content and mtime: the slow path has to hash it
+        self.write(self.input, b'INPUT')
+        self.touch(self.input)
+        self.assertFalse(self.reopen(cache).is_fresh(self.input, self.output, 'flatten', PARAMS))
+
+    def test_touched_but_identical_input_is_rehashed_and_skipped(self):
+        cache = icon_cache.IconCache.for_path(self.icon_set)
+        self.process(cache, self.input, self.output, b'output')
+        self.touch(self.input)
+        cache = self.reopen(cache)
+        self.assertTrue(cache.is_fresh(self.input, self.output, 'flatten', PARAMS))
+        # The new mtime is recorded so the next run takes the fast path again
+        self.assertTrue(cache.dirty)
+        cache = self.reopen(cache)
+        self.assertTrue(cache.is_fresh(self.input, self.output, 'flatten', PARAMS))
+        self.assertFalse(cache.dirty)
+
+    def test_changed_or_missing_output_reprocesses(self):
+        cache = icon_cache.IconCache.for_path(self.icon_set)
+        self.process(cache, self.input, self.output, b'output')
+        self.write(self.output, b'edited')
+        self.assertFalse(cache.is_fresh(self.input, self.output, 'flatten', PARAMS))
+        os.remove(self.output)
+        self.assertFalse(cache.is_fresh(self.input, self.output, 'flatten', PARAMS))
+
+
+class InPlaceTests(IconCacheTestCase):
+
+    def test_record_keeps_the_hash_taken_before_the_overwrite(self):
+        cache = icon_cache.IconCache.for_path(self.icon_set)
+        before = icon_cache.file_sha256(self.input)
+        self.process(cache, self.input, self.input, b'flattened')
+        entry = cache.entries['AppIcon.appiconset/master.png']['flatten']
+        self.assertEqual(entry['input'], {'sha256': before})
+        self.assertEqual(entry['output']['sha256'], icon_cache.file_sha256(self.input))
+
+    def test_matching_rerun_skips(self):
+        cache = icon_cache.IconCache.for_path(self.icon_set)
+        self.process(cache, self.input, self.input, b'flattened')
+        self.touch(self.input)
+        # Only the output is compared: the recorded input no longer exists
+        self.assertTrue(self.reopen(cache).is_fresh(self.input, self.input, 'flatten', PARAMS))
+
+    def test_replaced_file_reprocesses(self):
+        cache = icon_cache.IconCache.for_path(self.icon_set)
+        self.process(cache, self.input, self.input, b'flattened')
+        self.write(self.input, b'new master')
+        self.touch(self.input)
+        self.assertFalse(self.reopen(cache).is_fresh(self.input, self.input, 'flatten', PARAMS))
+
+
+class ManifestTests(IconCacheTestCase):
+
+    def test_corrupt_manifest_means_a_full_run(self):
+        cache = icon_cache.IconCache.for_path(self.icon_set)
+        self.process(cache, self.input, self.output, b'output')
+        cache.save()
+        with open(cache.path, 'w') as f:
+            f.write('{"version": 1, "entries": {')
+        cache = icon_cache.IconCache.for_path(self.icon_set)
+        self.assertEqual(cache.entries, {})
+        self.assertFalse(cache.is_fresh(self.input, self.output, 'flatten', PARAMS))
+
+    def test_other_version_is_ignored(self):
+        cache = icon_cache.IconCache.for_path(self.icon_set)
+        self.process(cache, self.input, self.output, b'output')
+        cache.save()
+        with open(cache.path, 'w') as f:
+            f.write('{"version": 0, "entries": {}}')
+        self.assertEqual(icon_cache.IconCache.for_path(self.icon_set).entries, {})
+
+    def test_clean_cache_is_not_saved(self):
+        cache = icon_cache.IconCache.for_path(self.icon_set)
+        cache.save()
+        self.assertFalse(os.path.exists(cache.path))
+
+
+if __name__ == '__main__':
+    unittest.main()
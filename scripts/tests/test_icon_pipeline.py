@@ -0,0 +1,152 @@
+"""Tests for icon_pipeline.py: the inward bbox scan and the in-place edge crop."""
+
+import os
+import sys
+import unittest
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+try:
+    import numpy as np
+    import PIL  # noqa: F401
+except ImportError:
+    np = None
+
+if np is not None:
+    from icon_pipeline import DEFAULT_PARAMS, find_content_bbox, stage_edge_crop  # noqa: E402
+
+
+def reference_bbox(alpha):
+    """Full-image np.any version of find_content_bbox."""
+    rows, cols = np.any(alpha, axis=1), np.any(alpha, axis=0)
+    if not rows.any():
+        return None
+    top, left = int(np.argmax(rows)), int(np.argmax(cols))
+    bottom = len(rows) - int(np.argmax(rows[::-1]))
+    right = len(cols) - int(np.argmax(cols[::-1]))
+    return top, bottom, left, right
+
+
+def reference_edge_crop(data, params):
+    """Copying version of stage_edge_crop."""
+    data = data.copy()
+    height, width = data.shape[:2]
+    bw, threshold = params['border_width'], params['threshold']
+    edge = np.ones((height, width), dtype=bool)
+    edge[bw:height - bw, bw:width - bw] = False
+    white = np.all(data[:, :, :3] > threshold, axis=2)
+    data[edge & white, 3] = 0
+
+    bbox = reference_bbox(data[:, :, 3])
+    if bbox is None:
+        return data
+    top, bottom, left, right = bbox
+    padding = params['padding']
+    top, left = max(0, top - padding), max(0, left - padding)
+    bottom, right = min(height, bottom + padding), min(width, right + padding)
+    crop = data[top:bottom, left:right].copy()
+    canvas = np.zeros_like(data)
+    start_y, start_x = (height - crop.shape[0]) // 2, (width - crop.shape[1]) // 2
+    canvas[start_y:start_y + crop.shape[0], start_x:start_x + crop.shape[1]] = crop
+    return canvas
+
+
+def icon(height, width, box, color=(40, 80, 160, 255)):
+    """Transparent canvas with an opaque (top, bottom, left, right) box."""
+    data = np.zeros((height, width, 4), dtype=np.uint8)
+    top, bottom, left, right = box
+    data[top:bottom, left:right] = color
+    # Vary the content so a wrongly moved row shows
+    data[top:bottom, left:right, 0] = (np.arange(bottom - top)[:, None] * 7 + np.arange(right - left)) % 256
+    return data
+
+
+@unittest.skipUnless(np is not None, "needs Pillow and NumPy")
+class BBoxTests(unittest.TestCase):
+
+    def check(self, alpha, step=8):
+        self.assertEqual(find_content_bbox(alpha, step), reference_bbox(alpha))
+
+    def test_content_touching_each_edge(self):
+        cases = {'top': (0, 20, 10, 30), 'bottom': (15, 40, 5, 25), 'left': (12, 30, 0, 9),
+                 'right': (3, 17, 20, 33), 'all': (0, 40, 0, 33)}
+        for edge, box in cases.items():
+            with self.subTest(edge=edge):
+                self.check(icon(40, 33, box)[:, :, 3])
+
+    def test_single_pixel(self):
+        for y, x in ((0, 0), (39, 32), (17, 8), (8, 16), (7, 31)):
+            alpha = np.zeros((40, 33), dtype=np.uint8)
+            alpha[y, x] = 1
+            with self.subTest(pixel=(y, x)):
+                self.assertEqual(find_content_bbox(alpha), (y, y + 1, x, x + 1))
+                self.check(alpha, step=3)
+
+    def test_empty_image(self):
+        self.assertIsNone(find_content_bbox(np.zeros((16, 16), dtype=np.uint8)))
+
+    def test_block_sizes(self):
+        alpha = icon(50, 45, (9, 33, 17, 26))[:, :, 3]
+        for step in (1, 2, 7, 8, 64):
+            with self.subTest(step=step):
+                self.check(alpha, step)
+
+    def test_strided_view(self):
+        data = icon(40, 33, (5, 21, 11, 30))
+        self.check(data[:, :, 3])
+        self.check(data[::2, ::3, 3])
+
+
+@unittest.skipUnless(np is not None, "needs Pillow and NumPy")
+class EdgeCropTests(unittest.TestCase):
+
+    def crop(self, data, **params):
+        params = dict(DEFAULT_PARAMS, **params)
+        expected = reference_edge_crop(data, params)
+        result = stage_edge_crop(data, params, {})
+        self.assertIs(result, data)
+        self.assertTrue((result == expected).all())
+        return result
+
+    def test_odd_sized_offset_recentre(self):
+        # Content off to the top left of an odd-sized canvas: moves down and right
+        self.crop(icon(41, 37, (2, 13, 3, 22)))
+        # ... and off to the bottom right: moves up and left
+        self.crop(icon(41, 37, (25, 40, 20, 35)))
+
+    def test_overlapping_move(self):
+        # Source and destination rows overlap, in both directions
+        self.crop(icon(31, 31, (4, 24, 4, 20)))
+        self.crop(icon(31, 31, (9, 29, 9, 27)))
+
+    def test_content_touching_an_edge(self):
+        for box in ((0, 10, 5, 15), (21, 31, 5, 15), (5, 15, 0, 10), (5, 15, 21, 31)):
+            with self.subTest(box=box):
+                self.crop(icon(31, 31, box))
+
+    def test_single_pixel(self):
+        result = self.crop(icon(21, 21, (3, 4, 15, 16)), padding=0)
+        self.assertEqual(find_content_bbox(result[:, :, 3]), (10, 11, 10, 11))
+
+    def test_white_border_is_cleared_first(self):
+        data = icon(32, 32, (8, 20, 6, 18))
+        data[:2] = 255
+        data[:, -1] = 255
+        result = self.crop(data, border_width=3)
+        self.assertFalse((result[:, :, :3] == 255).all(axis=2).any())
+
+    def test_fully_white_image_becomes_empty(self):
+        data = np.full((24, 24, 4), 255, dtype=np.uint8)
+        result = self.crop(data, border_width=12)
+        self.assertFalse(result[:, :, 3].any())
+
+    def test_centred_content_is_left_alone(self):
+        data = icon(30, 30, (0, 30, 0, 30))
+        before = data.copy()
+        self.crop(data)
+        self.assertTrue((data == before).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
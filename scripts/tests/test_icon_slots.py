@@ -0,0 +1,129 @@
+"""Tests for icon_slots.py: slot planning and filling an .appiconset."""
+
+import io
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+try:
+    import numpy  # noqa: F401
+    from PIL import Image
+except ImportError:
+    Image = None
+
+from icon_slots import (IconSetContents, dump_contents, fill_missing_slots, pixel_size,  # noqa: E402
+                        plan_sizes, slot_filename, spec_entries)
+
+
+class PlanningTests(unittest.TestCase):
+
+    def test_pixel_size(self):
+        self.assertEqual(pixel_size({'size': '83.5x83.5', 'scale': '2x'}), (167, 167))
+        self.assertEqual(pixel_size({'size': '1024x1024', 'scale': '1x'}), (1024, 1024))
+        self.assertIsNone(pixel_size({'size': '1024x1024'}))
+        self.assertIsNone(pixel_size({'size': 'big', 'scale': '2x'}))
+
+    def test_slot_filename(self):
+        self.assertEqual(slot_filename({'idiom': 'iphone', 'size': '60x60', 'scale': '3x'}),
+                         'icon_180x180_iphone_app_3x.png')
+        entry = {'idiom': 'watch', 'size': '40x40', 'scale': '2x', 'role': 'appLauncher', 'subtype': '38mm'}
+        self.assertEqual(slot_filename(entry), 'icon_80x80_watch_appLauncher_38mm_2x.png')
+
+    def test_equal_sizes_are_rendered_once(self):
+        plan = plan_sizes(spec_entries('ios'))
+        self.assertEqual(len(plan[(40, 40)]), 3)  # 20pt @2x (iPhone, iPad) and 40pt @1x (iPad)
+        self.assertEqual(sum(len(entries) for entries in plan.values()), len(spec_entries('ios')))
+        self.assertLess(len(plan), len(spec_entries('ios')))
+
+    def test_dump_contents_uses_xcode_formatting(self):
+        text = dump_contents({'info': {'version': 1, 'author': 'xcode'}})
+        self.assertEqual(text, '{\n  "info" : {\n    "author" : "xcode",\n    "version" : 1\n  }\n}\n')
+
+
+class ContentsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp(suffix='.appiconset')
+        self.write_contents({'images': [
+            {'idiom': 'universal', 'platform': 'ios', 'size': '1024x1024'},
+            {'idiom': 'iphone', 'size': '60x60', 'scale': '2x', 'filename': 'gone.png'},
+        ], 'info': {'author': 'xcode', 'version': 1}})
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def write_contents(self, contents):
+        with open(os.path.join(self.path, 'Contents.json'), 'w') as f:
+            json.dump(contents, f, indent=4)
+
+    def read_contents(self):
+        with open(os.path.join(self.path, 'Contents.json'), 'r') as f:
+            return json.load(f)
+
+
+class ContentsTests(ContentsTestCase):
+
+    def test_missing_slots(self):
+        model = IconSetContents(self.path)
+        # The single-size slot has no scale and is left alone
+        self.assertEqual([entry['size'] for entry in model.missing_slots()], ['60x60'])
+
+    def test_spec_slots_are_added_once(self):
+        model = IconSetContents(self.path)
+        added = model.add_spec_slots('ios')
+        self.assertEqual(added, len(spec_entries('ios')) - 1)
+        self.assertEqual(model.add_spec_slots('ios'), 0)
+
+    def test_unchanged_model_is_not_saved(self):
+        self.assertFalse(IconSetContents(self.path).save())
+
+
+@unittest.skipUnless(Image is not None, "needs Pillow and NumPy")
+class FillTests(ContentsTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.master = os.path.join(self.path, 'master.png')
+        Image.new('RGB', (256, 256), (30, 60, 90)).save(self.master)
+
+    def fill(self, **kwargs):
+        with redirect_stdout(io.StringIO()):
+            return fill_missing_slots(self.path, master_path=self.master, **kwargs)
+
+    def test_fill_watch_slots(self):
+        created, _ = self.fill(platforms=('watch',))
+        contents = self.read_contents()
+        for entry in contents['images']:
+            if pixel_size(entry):
+                with self.subTest(entry=entry), Image.open(os.path.join(self.path, entry['filename'])) as img:
+                    self.assertEqual(img.size, pixel_size(entry))
+        self.assertEqual(created, sum(1 for entry in contents['images'] if pixel_size(entry)))
+        # A second pass has nothing left to do
+        self.assertEqual(self.fill(platforms=('watch',)), (0, 0))
+
+    def test_shared_sizes_are_encoded_once(self):
+        created, sizes = self.fill(platforms=('ios',))
+        self.assertEqual(created, len(spec_entries('ios')))
+        self.assertLess(sizes, created)
+
+    def test_existing_filename_is_kept(self):
+        self.fill()
+        with Image.open(os.path.join(self.path, 'gone.png')) as img:
+            self.assertEqual(img.size, (120, 120))
+
+    def test_dry_run_writes_nothing(self):
+        before = self.read_contents()
+        self.assertEqual(self.fill(platforms=('ios',), dry_run=True)[0], 0)
+        self.assertEqual(self.read_contents(), before)
+        self.assertFalse(os.path.exists(os.path.join(self.path, 'gone.png')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+"""Tests for output_writer.py: write-if-changed and the written/skipped counts."""
+
+import io
+import os
+import sys
+import stat
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from contextlib import redirect_stdout
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+import output_writer  # noqa: E402
+
+
+class OutputWriterTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.path = os.path.join(self.root, 'Contents.json')
+        with open(self.path, 'wb') as f:
+            f.write(b'{"images": []}\n')
+        # Push the mtime into the past so a rewrite would show
+        os.utime(self.path, ns=(1_000_000_000, 1_000_000_000))
+        output_writer.stats.written = output_writer.stats.skipped = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+        output_writer.stats.written = output_writer.stats.skipped = 0
+
+    def read(self):
+        with open(self.path, 'rb') as f:
+            return f.read()
+
+
+class ContentMatchesTests(OutputWriterTestCase):
+
+    def test_same_bytes_match(self):
+        self.assertTrue(output_writer.content_matches(self.path, b'{"images": []}\n'))
+
+    def test_same_size_different_bytes(self):
+        self.assertFalse(output_writer.content_matches(self.path, b'{"images": {}}\n'))
+
+    def test_different_size_is_not_read(self):
+        with mock.patch('builtins.open') as opened:
+            self.assertFalse(output_writer.content_matches(self.path, b'{}'))
+        opened.assert_not_called()
+
+    def test_missing_file(self):
+        self.assertFalse(output_writer.content_matches(os.path.join(self.root, 'missing.json'), b''))
+
+
+class WriteTests(OutputWriterTestCase):
+
+    def test_identical_bytes_are_skipped(self):
+        self.assertFalse(output_writer.write_bytes(self.path, b'{"images": []}\n'))
+        self.assertEqual(os.stat(self.path).st_mtime_ns, 1_000_000_000)
+        self.assertEqual(output_writer.stats.snapshot(), (0, 1))
+
+    def test_different_bytes_replace_the_file(self):
+        os.chmod(self.path, 0o640)
+        inode = os.stat(self.path).st_ino
+        self.assertTrue(output_writer.write_text(self.path, '{"images": [1]}\n'))
+        self.assertEqual(self.read(), b'{"images": [1]}\n')
+        # Renamed over the old file, not rewritten in place, and nothing left behind
+        self.assertNotEqual(os.stat(self.path).st_ino, inode)
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o640)
+        self.assertEqual(os.listdir(self.root), ['Contents.json'])
+        self.assertEqual(output_writer.stats.snapshot(), (1, 0))
+
+    def test_failed_rename_keeps_the_old_file(self):
+        with mock.patch('os.replace', side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                output_writer.write_bytes(self.path, b'new', fsync=True)
+        self.assertEqual(self.read(), b'{"images": []}\n')
+        self.assertEqual(os.listdir(self.root), ['Contents.json'])
+        self.assertEqual(output_writer.stats.snapshot(), (0, 0))
+
+    def test_uncounted_writes(self):
+        output_writer.write_bytes(self.path, b'new', count=False)
+        output_writer.write_bytes(self.path, b'new', count=False)
+        self.assertEqual(output_writer.stats.snapshot(), (0, 0))
+
+    def test_new_file(self):
+        path = os.path.join(self.root, 'new.json')
+        self.assertTrue(output_writer.write_bytes(path, b'{}', fsync=True))
+        self.assertEqual(sorted(os.listdir(self.root)), ['Contents.json', 'new.json'])
+
+
+class StatsTests(OutputWriterTestCase):
+
+    def test_delta_from_a_worker(self):
+        before = output_writer.stats.snapshot()
+        output_writer.write_bytes(self.path, b'{"images": []}\n')
+        output_writer.write_bytes(self.path, b'new')
+        delta = output_writer.stats.since(before)
+        self.assertEqual(delta, (1, 1))
+        parent = output_writer.WriteStats()
+        parent.add(delta)
+        self.assertEqual(parent.snapshot(), (1, 1))
+
+    def test_report(self):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            output_writer.report()
+        self.assertEqual(out.getvalue(), '')
+        output_writer.write_bytes(self.path, b'{"images": []}\n')
+        output_writer.write_bytes(self.path, b'{"images": []}\n')
+        with redirect_stdout(out):
+            output_writer.report()
+        self.assertIn('2 output file(s) unchanged on disk', out.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
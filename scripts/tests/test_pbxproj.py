@@ -0,0 +1,148 @@
+"""Tests for pbxproj.py: parsing project.pbxproj and writing it back."""
+
+import os
+import sys
+import unittest
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+from pbxproj import PBXParseError, PBXProject  # noqa: E402
+
+GOLDEN_DIR = os.path.join(SCRIPTS_DIR, 'benchmarks', 'golden')
+
+
+def read_golden(name):
+    with open(os.path.join(GOLDEN_DIR, f'{name}.pbxproj'), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+class RoundTripTests(unittest.TestCase):
+
+    def test_xcode_saved_file_round_trips(self):
+        text = read_golden('Plena.snapshot')
+        self.assertEqual(PBXProject(text).serialize(), text)
+
+    def test_xcode_layout_file_renders_canonically(self):
+        # Every object re-rendered from the graph, in ID order
+        text = read_golden('project.before')
+        self.assertEqual(PBXProject(text).serialize(canonical=True), text)
+
+    def test_hand_edited_file_keeps_its_text(self):
+        # The watch target's Sources phase is misindented in the saved file
+        text = read_golden('Plena.snapshot')
+        project = PBXProject(text)
+        self.assertNotEqual(project.serialize(canonical=True), text)
+        self.assertEqual(project.serialize(), text)
+
+    def test_missing_header_is_a_parse_error(self):
+        with self.assertRaises(PBXParseError):
+            PBXProject("{\n\tobjects = {\n\t};\n}\n")
+
+
+class GraphTests(unittest.TestCase):
+
+    def setUp(self):
+        self.project = PBXProject(read_golden('Plena.snapshot'))
+
+    def test_objects_are_indexed_by_isa(self):
+        targets = self.project.isa('PBXNativeTarget')
+        self.assertEqual(sorted(t['name'] for t in targets), ['Plena', 'Plena Watch App'])
+        self.assertEqual(self.project.isa('NoSuchIsa'), [])
+
+    def test_field_index(self):
+        by_path = self.project.index('PBXFileReference', 'path')
+        self.assertEqual(len(by_path['PlenaDataModel.xcdatamodel']), 1)
+
+    def test_main_group_is_reachable_from_root(self):
+        self.assertEqual(self.project.main_group.isa, 'PBXGroup')
+
+    def test_id_source_gives_reproducible_ids(self):
+        existing = next(iter(self.project.objects))
+
+        def ids():
+            yield existing
+            yield 'A' * 24
+            yield 'B' * 24
+
+        self.project.id_source = ids()
+        # IDs already in the project are skipped
+        self.assertEqual(self.project.new_id(), 'A' * 24)
+        self.assertEqual(self.project.add_object('PBXGroup', {'children': []}).id, 'B' * 24)
+        # Then random, unused ones
+        self.assertNotIn(self.project.new_id(), self.project)
+
+    def test_duplicate_id_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.project.add_object('PBXGroup', {}, object_id=next(iter(self.project.objects)))
+
+
+class BatchEditTests(unittest.TestCase):
+
+    def test_insertion_at_id_position_in_sorted_section(self):
+        text = read_golden('project.before')
+        project = PBXProject(text)
+        ids = [obj.id for obj in project.isa('PBXFileReference')]
+        before, after = ids[2], ids[3]
+        new_id = f"{int(before, 16) + 1:024X}"
+        self.assertLess(new_id, after)
+        project.add_object('PBXFileReference', {'path': 'New.swift', 'sourceTree': '<group>'}, object_id=new_id)
+
+        output = project.serialize()
+        self.assertEqual(output, PBXProject(output).serialize(canonical=True))
+        lines = output.splitlines()
+        position = next(i for i, line in enumerate(lines) if line.startswith(f'\t\t{new_id} '))
+        self.assertTrue(lines[position - 1].startswith(f'\t\t{before} '))
+        self.assertTrue(lines[position + 1].startswith(f'\t\t{after} '))
+
+    def test_insertion_at_end_of_unsorted_section(self):
+        # The saved file's PBXBuildFile section has hand-appended entries
+        text = read_golden('Plena.snapshot')
+        project = PBXProject(text)
+        file_ref = next(iter(project.isa('PBXFileReference')))
+        build_file = project.add_object('PBXBuildFile', {'fileRef': file_ref.id}, object_id='0' * 24)
+
+        lines = project.serialize().splitlines()
+        end = lines.index('/* End PBXBuildFile section */')
+        self.assertTrue(lines[end - 1].startswith(f'\t\t{build_file.id} '))
+
+    def test_new_section_is_placed_by_isa(self):
+        project = PBXProject(read_golden('project.before'))
+        project.add_object('PBXResourcesBuildPhase', {'files': []})
+        output = project.serialize()
+        self.assertEqual(output, PBXProject(output).serialize(canonical=True))
+
+    def test_add_modify_remove_in_one_pass(self):
+        text = read_golden('project.before')
+        project = PBXProject(text)
+        removed = project.isa('PBXFileReference')[0]
+        for group in project.isa('PBXGroup'):
+            if removed.id in group.get('children', ()):
+                group['children'].remove(removed.id)
+        for build_file in list(project.isa('PBXBuildFile')):
+            if build_file['fileRef'] == removed.id:
+                for phase in project.isa('PBXSourcesBuildPhase'):
+                    if build_file.id in phase['files']:
+                        phase['files'].remove(build_file.id)
+                project.remove_object(build_file.id)
+        project.remove_object(removed.id)
+        added = project.add_object('PBXFileReference', {'path': 'Added.swift', 'sourceTree': '<group>'})
+        project.main_group['children'].append(added.id)
+
+        output = project.serialize()
+        self.assertEqual(output, PBXProject(output).serialize(canonical=True))
+        reparsed = PBXProject(output)
+        self.assertNotIn(removed.id, reparsed)
+        self.assertEqual(reparsed[added.id]['path'], 'Added.swift')
+        self.assertIn(added.id, reparsed.main_group['children'])
+
+    def test_equal_reassignment_is_not_an_edit(self):
+        text = read_golden('Plena.snapshot')
+        project = PBXProject(text)
+        project.main_group['children'] = list(project.main_group['children'])
+        self.assertFalse(project.main_group.dirty)
+        self.assertEqual(project.serialize(), text)
+
+
+if __name__ == '__main__':
+    unittest.main()
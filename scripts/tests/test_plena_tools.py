@@ -0,0 +1,89 @@
+"""Tests for plena_tools.py: command dispatch and the --help paths."""
+
+import io
+import os
+import sys
+import subprocess
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+import plena_tools  # noqa: E402
+
+
+def run_tool(*argv):
+    """Run plena-tools in a fresh interpreter; return (status, stdout, loaded modules)."""
+    # argparse's --help exits with SystemExit, so report the modules on the way out
+    code = ("import sys, plena_tools\n"
+            "try:\n"
+            "    sys.exit(plena_tools.main(sys.argv[1:]))\n"
+            "finally:\n"
+            "    print('MODULES', ' '.join(sorted(sys.modules)))\n")
+    result = subprocess.run([sys.executable, '-c', code, *argv], cwd=SCRIPTS_DIR,
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    output, _, modules = result.stdout.rpartition('MODULES ')
+    return result.returncode, output, set(modules.split())
+
+
+class ResolveTests(unittest.TestCase):
+
+    def test_two_word_commands(self):
+        self.assertEqual(plena_tools.resolve(['project', 'sync', '--dry-run']),
+                         (('project', 'sync'), ['--dry-run']))
+        self.assertEqual(plena_tools.resolve(['icons', 'analyze', 'icon.png']),
+                         (('icons', 'analyze'), ['icon.png']))
+
+    def test_unknown_commands(self):
+        self.assertIsNone(plena_tools.resolve(['project']))
+        self.assertIsNone(plena_tools.resolve(['project', 'build']))
+        self.assertIsNone(plena_tools.resolve([]))
+
+    def test_usage_filters_by_prefix(self):
+        text = plena_tools.usage(['icons'])
+        self.assertIn('icons audit', text)
+        self.assertNotIn('project sync', text)
+
+    def test_every_command_names_a_module(self):
+        for module, _, _ in plena_tools.COMMANDS.values():
+            self.assertTrue(os.path.exists(os.path.join(SCRIPTS_DIR, f'{module}.py')), module)
+
+
+class MainTests(unittest.TestCase):
+
+    def main(self, *argv):
+        out, err = io.StringIO(), io.StringIO()
+        with redirect_stdout(out), redirect_stderr(err):
+            status = plena_tools.main(list(argv))
+        return status, out.getvalue(), err.getvalue()
+
+    def test_exit_statuses(self):
+        self.assertEqual(self.main()[0], 2)
+        self.assertEqual(self.main('--help')[0], 0)
+        self.assertEqual(self.main('project')[0], 2)
+        self.assertEqual(self.main('project', '--help')[0], 0)
+        status, _, err = self.main('project', 'build')
+        self.assertEqual(status, 2)
+        self.assertIn('Unknown command: project build', err)
+
+    def test_help_loads_no_command(self):
+        status, output, modules = run_tool('--help')
+        self.assertEqual(status, 0)
+        self.assertIn('project hook', output)
+        self.assertFalse(modules & {'add_missing_files_to_project', 'pbxproj', 'PIL', 'numpy'})
+
+    def test_hook_help_runs_no_sync(self):
+        status, output, modules = run_tool('project', 'hook', '--help')
+        self.assertEqual(status, 0)
+        self.assertIn('usage: project_sync_hook.py', output)
+        self.assertNotIn('add_missing_files_to_project', modules)
+
+    def test_analyze_help_is_not_an_icon_path(self):
+        status, output, _ = run_tool('icons', 'analyze', '--help')
+        self.assertEqual(status, 0)
+        self.assertIn('master_icon', output)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+"""Tests for png_encoder.py: presets and lossless palette reduction."""
+
+import io
+import os
+import sys
+import unittest
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError:
+    Image = None
+
+import png_encoder  # noqa: E402
+
+
+def decode(data):
+    with Image.open(io.BytesIO(data)) as img:
+        return np.asarray(img.convert('RGBA'))
+
+
+def gradient(mode, colors=None):
+    """64x64 test image; with `colors`, only that many distinct values."""
+    y, x = np.mgrid[0:64, 0:64]
+    values = (x * 4 + y) % (colors or 256)
+    rgba = np.stack([values, 255 - values, (values * 7) % 256, np.where(x < 8, values % 128, 255)], axis=-1)
+    image = Image.fromarray(rgba.astype(np.uint8), 'RGBA')
+    return image if mode == 'RGBA' else image.convert(mode)
+
+
+@unittest.skipUnless(Image is not None, "needs Pillow and NumPy")
+class PaletteTests(unittest.TestCase):
+
+    def test_reduction_is_lossless(self):
+        image = gradient('RGBA', colors=40)
+        reduced = png_encoder.reduce_palette(image)
+        self.assertEqual(reduced.mode, 'P')
+        self.assertTrue((np.asarray(reduced.convert('RGBA')) == np.asarray(image)).all())
+
+    def test_transparent_entries_come_first(self):
+        image = gradient('RGBA', colors=40)
+        reduced = png_encoder.reduce_palette(image)
+        alphas = list(reduced.info['transparency'])
+        # tRNS lists exactly the translucent colors; the rest are opaque
+        colors = {tuple(pixel) for pixel in np.asarray(image).reshape(-1, 4)}
+        self.assertEqual(len(alphas), sum(1 for color in colors if color[3] < 255))
+        self.assertTrue(all(alpha < 255 for alpha in alphas))
+
+    def test_only_small_rgba_images_are_reduced(self):
+        self.assertIsNone(png_encoder.reduce_palette(gradient('RGBA')))
+        self.assertIsNone(png_encoder.reduce_palette(gradient('RGB', colors=40)))
+
+
+@unittest.skipUnless(Image is not None, "needs Pillow and NumPy")
+class EncodeTests(unittest.TestCase):
+
+    def test_every_preset_decodes_to_the_same_pixels(self):
+        for colors in (40, None):
+            image = gradient('RGBA', colors)
+            for preset in png_encoder.PRESETS:
+                with self.subTest(preset=preset, colors=colors):
+                    self.assertTrue((decode(png_encoder.encode(image, preset)) == np.asarray(image)).all())
+
+    def test_palette_use_per_preset(self):
+        image = gradient('RGBA', colors=40)
+        self.assertFalse(png_encoder.is_palette(png_encoder.encode(image, 'fast')))
+        self.assertTrue(png_encoder.is_palette(png_encoder.encode(image, 'balanced')))
+
+    def test_opaque_images_stay_rgb(self):
+        data = png_encoder.encode(gradient('RGB', colors=40), 'smallest')
+        with Image.open(io.BytesIO(data)) as img:
+            self.assertEqual(img.mode, 'RGB')
+
+    def test_smallest_is_no_larger_than_balanced(self):
+        image = gradient('RGBA')
+        self.assertLessEqual(len(png_encoder.encode(image, 'smallest')), len(png_encoder.encode(image, 'balanced')))
+
+    def test_default_preset(self):
+        image = gradient('RGBA', colors=40)
+        self.assertEqual(png_encoder.encode(image), png_encoder.encode(image, png_encoder.DEFAULT_PRESET))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,175 @@
+"""Tests for png_preflight.py: header-only classification against a real decode."""
+
+import io
+import os
+import sys
+import zlib
+import shutil
+import struct
+import tempfile
+import unittest
+from unittest import mock
+from contextlib import redirect_stdout
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+import png_preflight  # noqa: E402
+
+
+def chunk(chunk_type, data):
+    return struct.pack('>I', len(data)) + chunk_type + data + struct.pack('>I', zlib.crc32(chunk_type + data))
+
+
+def build_png(width, height, bit_depth, color_type, samples, extra=()):
+    """Hand-built PNG, for the formats Pillow won't write (e.g. 16-bit RGB)."""
+    row = bytes(width * samples * bit_depth // 8)
+    raw = b''.join(b'\0' + row for _ in range(height))
+    ihdr = struct.pack('>IIBBBBB', width, height, bit_depth, color_type, 0, 0, 0)
+    return (png_preflight.PNG_SIGNATURE + chunk(b'IHDR', ihdr) + b''.join(chunk(*c) for c in extra)
+            + chunk(b'IDAT', zlib.compress(raw)) + chunk(b'IEND', b''))
+
+
+def decoded_has_alpha(img):
+    """What a full decode says: an alpha band, or a tRNS that hides something."""
+    if 'A' in img.getbands():
+        return True
+    if 'transparency' in img.info:
+        return img.convert('RGBA').getchannel('A').getextrema()[0] < 255
+    return False
+
+
+class PreflightTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def write(self, name, data):
+        path = os.path.join(self.root, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def save(self, name, image, **kwargs):
+        out = io.BytesIO()
+        image.save(out, 'PNG', **kwargs)
+        return self.write(name, out.getvalue())
+
+
+@unittest.skipUnless(Image is not None, "needs Pillow")
+class DecodeAgreementTests(PreflightTestCase):
+
+    def check(self, path, mode, has_alpha, bit_depth=8):
+        info = png_preflight.read_png_header(path)
+        with Image.open(path) as img:
+            img.load()
+            self.assertEqual((info['width'], info['height']), img.size)
+            if bit_depth != 16:
+                self.assertEqual(info['mode'], img.mode)
+            self.assertEqual(info['has_alpha'], decoded_has_alpha(img))
+        self.assertEqual((info['mode'], info['has_alpha']), (mode, has_alpha))
+        if bit_depth is not None:
+            self.assertEqual(info['bit_depth'], bit_depth)
+        return info
+
+    def test_rgb(self):
+        info = self.check(self.save('rgb.png', Image.new('RGB', (6, 4), (10, 20, 30))), 'RGB', False)
+        self.assertTrue(png_preflight.is_opaque_rgb(info))
+
+    def test_rgba(self):
+        info = self.check(self.save('rgba.png', Image.new('RGBA', (6, 4), (10, 20, 30, 255))), 'RGBA', True)
+        self.assertFalse(png_preflight.is_opaque_rgb(info))
+
+    def check_palette(self, path, has_alpha):
+        # Pillow packs a small palette into fewer bits per pixel
+        return self.check(path, 'P', has_alpha, bit_depth=None)
+
+    def palette_image(self):
+        image = Image.new('P', (4, 4))
+        image.putpalette([0, 0, 0, 255, 255, 255, 200, 0, 0])
+        image.putdata([0, 1, 2, 1] * 4)
+        return image
+
+    def test_palette_with_translucent_trns(self):
+        path = self.save('p.png', self.palette_image(), transparency=bytes([255, 128, 255]))
+        info = self.check_palette(path, True)
+        self.assertEqual(info['palette_size'], 3)
+
+    def test_palette_with_opaque_trns(self):
+        # A tRNS chunk whose entries are all 255 hides nothing
+        path = self.save('p.png', self.palette_image(), transparency=bytes([255, 255, 255]))
+        self.check_palette(path, False)
+
+    def test_palette_without_trns(self):
+        self.check_palette(self.save('p.png', self.palette_image()), False)
+
+    def test_grayscale_with_trns(self):
+        image = Image.new('L', (4, 4), 0)
+        image.putpixel((1, 1), 3)
+        info = self.check(self.save('l.png', image, transparency=3), 'L', True)
+        self.assertTrue(info['has_trns'])
+
+    def test_16_bit_grayscale(self):
+        self.check(self.save('l16.png', Image.new('I;16', (5, 3), 300)), 'L', False, bit_depth=16)
+
+    def test_16_bit_rgb_and_rgba(self):
+        self.check(self.write('rgb16.png', build_png(5, 3, 16, 2, 3)), 'RGB', False, bit_depth=16)
+        self.check(self.write('rgba16.png', build_png(5, 3, 16, 6, 4)), 'RGBA', True, bit_depth=16)
+
+    def test_16_bit_rgb_with_trns(self):
+        path = self.write('rgb16.png', build_png(5, 3, 16, 2, 3, [(b'tRNS', bytes(6))]))
+        self.check(path, 'RGB', True, bit_depth=16)
+
+
+class MalformedTests(PreflightTestCase):
+
+    def test_not_a_png(self):
+        path = self.write('icon.png', b'GIF89a' + bytes(40))
+        with self.assertRaises(png_preflight.PNGHeaderError):
+            png_preflight.read_png_header(path)
+        self.assertIsNone(png_preflight.preflight(path))
+
+    def test_truncated(self):
+        data = build_png(4, 4, 8, 2, 3)
+        for size in (0, 8, 12, 20, 28):
+            with self.subTest(size=size):
+                path = self.write('icon.png', data[:size])
+                with self.assertRaises(png_preflight.PNGHeaderError):
+                    png_preflight.read_png_header(path)
+                self.assertIsNone(png_preflight.preflight(path))
+
+    def test_truncated_after_ihdr_is_still_classified(self):
+        data = build_png(4, 4, 8, 6, 4)
+        info = png_preflight.read_png_header(self.write('icon.png', data[:33 + 5]))
+        self.assertEqual((info['mode'], info['has_alpha']), ('RGBA', True))
+
+    def test_bad_color_type(self):
+        with self.assertRaises(png_preflight.PNGHeaderError):
+            png_preflight.read_png_header(self.write('icon.png', build_png(4, 4, 8, 5, 3)))
+
+    def test_missing_file(self):
+        self.assertIsNone(png_preflight.preflight(os.path.join(self.root, 'missing.png')))
+
+    def test_cli_reports_unreadable_icons(self):
+        icon_set = os.path.join(self.root, 'AppIcon.appiconset')
+        os.makedirs(icon_set)
+        self.write('AppIcon.appiconset/good.png', build_png(4, 4, 8, 2, 3))
+        self.write('AppIcon.appiconset/broken.png', b'not a png')
+        out = io.StringIO()
+        with mock.patch.object(sys, 'argv', ['png_preflight.py', icon_set]), redirect_stdout(out):
+            status = png_preflight.main()
+        self.assertEqual(status, 1)
+        self.assertIn('broken.png: unreadable PNG header', out.getvalue())
+        self.assertIn('2 PNG(s) checked, 1 need fixing', out.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
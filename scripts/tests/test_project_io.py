@@ -0,0 +1,111 @@
+"""Tests for project_io.py: locked, verified and backed-up project writes."""
+
+import io
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+import project_io  # noqa: E402
+
+GOLDEN_PROJECT = os.path.join(SCRIPTS_DIR, 'benchmarks', 'golden', 'Plena.snapshot.pbxproj')
+
+
+class ProjectIOTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.path = os.path.join(self.root, 'project.pbxproj')
+        shutil.copyfile(GOLDEN_PROJECT, self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def read(self, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+
+class WriteTests(ProjectIOTestCase):
+
+    def test_write_keeps_a_backup(self):
+        text, expected = project_io.read_project(self.path)
+        self.assertTrue(project_io.write_project(self.path, text + '\n', text, expected))
+        self.assertEqual(self.read(self.path), text + '\n')
+        self.assertEqual(self.read(project_io.backup_path(self.path)), text)
+
+    def test_unchanged_text_is_not_written(self):
+        text, expected = project_io.read_project(self.path)
+        self.assertFalse(project_io.write_project(self.path, text, text, expected))
+        self.assertFalse(os.path.exists(project_io.backup_path(self.path)))
+
+    def test_concurrent_change_is_detected(self):
+        text, expected = project_io.read_project(self.path)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write('// Xcode was here\n')
+        self.assertIsNone(project_io.write_project(self.path, text + '\n', text, expected))
+        self.assertTrue(self.read(self.path).endswith('// Xcode was here\n'))
+
+    def test_backups_rotate(self):
+        for number in range(4):
+            project_io.rotate_backups(self.path, f'version {number}\n', keep=3)
+        self.assertEqual(self.read(project_io.backup_path(self.path)), 'version 3\n')
+        self.assertEqual(self.read(project_io.backup_path(self.path, 1)), 'version 2\n')
+        self.assertEqual(self.read(project_io.backup_path(self.path, 2)), 'version 1\n')
+        self.assertFalse(os.path.exists(project_io.backup_path(self.path, 3)))
+
+    def test_same_backup_does_not_rotate(self):
+        project_io.rotate_backups(self.path, 'same\n')
+        project_io.rotate_backups(self.path, 'same\n')
+        self.assertFalse(os.path.exists(project_io.backup_path(self.path, 1)))
+
+
+class UpdateTests(ProjectIOTestCase):
+
+    def rename_main_group(self, project):
+        project.main_group['name'] = 'Renamed'
+        return 1
+
+    def test_update_edits_and_writes(self):
+        self.assertEqual(project_io.update_project(self.path, self.rename_main_group), (1, True))
+        self.assertIn('name = Renamed;', self.read(self.path))
+
+    def test_dry_run_writes_nothing(self):
+        before = self.read(self.path)
+        self.assertEqual(project_io.update_project(self.path, self.rename_main_group, dry_run=True), (1, False))
+        self.assertEqual(self.read(self.path), before)
+
+    def test_retries_when_the_file_keeps_changing(self):
+        def edit(project):
+            # Another writer gets in between every read and write
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write('\n')
+            return self.rename_main_group(project)
+
+        with redirect_stdout(io.StringIO()), self.assertRaises(project_io.ProjectBusyError):
+            project_io.update_project(self.path, edit, retries=2)
+
+
+class LockTests(ProjectIOTestCase):
+
+    def test_second_lock_times_out(self):
+        try:
+            import fcntl  # noqa: F401
+        except ImportError:
+            self.skipTest("needs fcntl; without it the lock is skipped")
+        with project_io.ProjectLock(self.path):
+            # flock locks belong to the open file, so a second open conflicts
+            with self.assertRaises(project_io.ProjectBusyError):
+                with project_io.ProjectLock(self.path, timeout=0.1):
+                    pass
+        with project_io.ProjectLock(self.path, timeout=0.1):
+            pass
+
+
+if __name__ == '__main__':
+    unittest.main()
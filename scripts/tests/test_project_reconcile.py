@@ -0,0 +1,143 @@
+"""Tests for project_reconcile.py: diffing, planning and applying changesets."""
+
+import io
+import os
+import sys
+import shutil
+import tempfile
+import posixpath
+import unittest
+from contextlib import redirect_stdout
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+from pbxproj import PBXProject  # noqa: E402
+from project_reconcile import Changeset, apply, diff, is_managed, plan, split_orphaned  # noqa: E402
+from project_targets import TargetIndex  # noqa: E402
+from project_tree import ProjectTree  # noqa: E402
+
+GOLDEN_PROJECT = os.path.join(SCRIPTS_DIR, 'benchmarks', 'golden', 'Plena.snapshot.pbxproj')
+ROOTS = ('Plena', 'Plena Watch App', 'PlenaShared', 'Tests')
+TEST_FILE = 'Tests/DashboardViewModelTests.swift'
+
+
+class ReconcileTestCase(unittest.TestCase):
+    """Runs in an empty directory: only `on_disk` says which files exist."""
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.root = tempfile.mkdtemp()
+        os.chdir(self.root)
+        with open(GOLDEN_PROJECT, 'r', encoding='utf-8') as f:
+            self.project = PBXProject(f.read())
+        self.tree = ProjectTree(self.project)
+        self.on_disk = {path for path in self.tree.files if is_managed(path, ROOTS)
+                        and not posixpath.dirname(path).endswith('.xcdatamodeld')}
+        self.component = min(path for path in self.on_disk if path.startswith('Plena/Views/Components/'))
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.root)
+
+
+class DiffTests(ReconcileTestCase):
+
+    def test_is_managed(self):
+        self.assertTrue(is_managed('Plena/Views/A.swift', ROOTS))
+        self.assertTrue(is_managed('PlenaShared/Store.storekit', ROOTS))
+        self.assertFalse(is_managed('Plena/README.md', ROOTS))
+        self.assertFalse(is_managed('Other/A.swift', ROOTS))
+        self.assertFalse(is_managed('Plena/.build/A.swift', ROOTS))
+
+    def test_in_sync(self):
+        self.assertEqual(diff(self.tree, self.on_disk, ROOTS), ([], []))
+
+    def test_missing_and_stale(self):
+        on_disk = (self.on_disk - {self.component}) | {'Plena/Views/New.swift'}
+        self.assertEqual(diff(self.tree, on_disk, ROOTS), (['Plena/Views/New.swift'], [self.component]))
+
+    def test_directories_limit_the_diff(self):
+        on_disk = (self.on_disk - {self.component}) | {'Plena/Views/New.swift'}
+        self.assertEqual(diff(self.tree, on_disk, ROOTS, directories={'Plena/Views'}),
+                         (['Plena/Views/New.swift'], []))
+
+    def test_split_orphaned(self):
+        missing, orphaned = split_orphaned(self.tree, ['Plena/Views/New.swift', TEST_FILE])
+        self.assertEqual((missing, orphaned), (['Plena/Views/New.swift'], [TEST_FILE]))
+
+    def test_same_name_under_another_root_is_missing(self):
+        # PlenaShared/Services has a group, so the orphan can't have lived there
+        elsewhere = 'PlenaShared/Services/' + posixpath.basename(TEST_FILE)
+        self.assertEqual(split_orphaned(self.tree, [elsewhere, TEST_FILE]), ([elsewhere], [TEST_FILE]))
+        self.assertEqual(split_orphaned(self.tree, ['Plena/Tests/' + posixpath.basename(TEST_FILE)])[1], [])
+
+    def test_orphan_path_with_directories(self):
+        ref = self.tree.orphans()[posixpath.basename(TEST_FILE)][0]
+        ref['path'] = 'Unit/' + posixpath.basename(TEST_FILE)
+        tree = ProjectTree(self.project)
+        self.assertEqual(split_orphaned(tree, ['Tests/Unit/' + posixpath.basename(TEST_FILE), TEST_FILE]),
+                         ([TEST_FILE], ['Tests/Unit/' + posixpath.basename(TEST_FILE)]))
+
+
+class PlanTests(ReconcileTestCase):
+
+    def test_unique_name_is_a_move(self):
+        moved = 'PlenaShared/Views/' + posixpath.basename(self.component)
+        changeset = plan(self.tree, (self.on_disk - {self.component}) | {moved}, ROOTS)
+        self.assertEqual((changeset.adds, changeset.removes, changeset.moves), ([], [], [(self.component, moved)]))
+
+    def test_ambiguous_name_is_a_remove_and_adds(self):
+        name = posixpath.basename(self.component)
+        added = {'PlenaShared/A/' + name, 'PlenaShared/B/' + name}
+        changeset = plan(self.tree, (self.on_disk - {self.component}) | added, ROOTS)
+        self.assertEqual(changeset.moves, [])
+        self.assertEqual(changeset.removes, [self.component])
+        self.assertEqual(sorted(changeset.adds), sorted(added))
+
+    def test_orphaned_files_are_not_added(self):
+        changeset = plan(self.tree, self.on_disk | {TEST_FILE}, ROOTS)
+        self.assertFalse(changeset)
+        self.assertEqual(changeset.summary(), '0 add(s), 0 remove(s), 0 move(s)')
+
+    def test_same_name_under_another_root_is_added(self):
+        elsewhere = 'PlenaShared/Services/' + posixpath.basename(TEST_FILE)
+        self.assertEqual(plan(self.tree, self.on_disk | {elsewhere}, ROOTS).adds, [elsewhere])
+
+
+class ApplyTests(ReconcileTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.targets = TargetIndex(self.project, self.tree)
+
+    def apply(self, changeset):
+        with redirect_stdout(io.StringIO()):
+            return apply(changeset, self.project, self.tree, self.targets)
+
+    def test_move_keeps_id_and_follows_the_rules(self):
+        obj = self.tree.file(self.component)
+        moved = 'PlenaShared/Views/' + posixpath.basename(self.component)
+        counts = self.apply(Changeset(moves=[(self.component, moved)]))
+        self.assertEqual(counts['moved'], 1)
+        self.assertIs(self.tree.file(moved), obj)
+        # PlenaShared/ files are built by both apps
+        self.assertEqual(self.targets.members[obj.id], {t.id for t in self.targets.select('@application')})
+
+    def test_remove_drops_build_files_and_empty_groups(self):
+        group = self.tree.ensure_group('Plena/Views/Gone')
+        obj = self.tree.add_file('Plena/Views/Gone/Old.swift', {'lastKnownFileType': 'sourcecode.swift'})
+        self.targets.add_member(obj, self.targets.targets_for('Plena/Views/Gone/Old.swift'), 'sources')
+        counts = self.apply(Changeset(removes=['Plena/Views/Gone/Old.swift']))
+        self.assertEqual((counts['removed'], counts['groups_removed']), (1, 1))
+        self.assertNotIn(obj.id, self.targets.members)
+        self.assertNotIn(group.id, self.project)
+
+    def test_add(self):
+        counts = self.apply(Changeset(adds=['Plena/Views/New.swift']))
+        self.assertEqual(counts['added'], 1)
+        self.assertIn('Plena/Views/New.swift', self.tree)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+"""Tests for project_sync_hook.py: the state file and the no-op fast path."""
+
+import io
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+import project_sync_hook as hook  # noqa: E402
+
+
+class StateTests(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.project = os.path.join(self.root, 'project.pbxproj')
+        self.state = os.path.join(self.root, 'state')
+        self.sources = os.path.join(self.root, 'Sources')
+        os.makedirs(os.path.join(self.sources, 'Views'))
+        self.write(self.project, '// !$*UTF8*$!\n')
+        hook.write_state(self.state, self.project, [self.sources], self.root)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def write(self, path, text):
+        with open(path, 'w') as f:
+            f.write(text)
+
+    def unchanged(self):
+        return hook.is_unchanged(hook.read_state(self.state), self.project)
+
+    def test_state_round_trips(self):
+        state = hook.read_state(self.state)
+        self.assertEqual(state['project'][1], os.path.getsize(self.project))
+        self.assertIn(os.path.join(self.sources, 'Views'), state['paths'])
+        # Missing tool files are recorded as missing, not skipped
+        self.assertIsNone(state['paths'][os.path.join(self.root, 'pbxproj.py')])
+
+    def test_unchanged_tree(self):
+        self.assertEqual(self.unchanged(), (True, None))
+
+    def test_new_file_invalidates(self):
+        self.write(os.path.join(self.sources, 'Views', 'New.swift'), '')
+        os.utime(os.path.join(self.sources, 'Views'), ns=(1, 1))
+        self.assertEqual(self.unchanged(), (False, None))
+
+    def test_project_edit_invalidates(self):
+        self.write(self.project, '// !$*UTF8*$!\n{}\n')
+        self.assertFalse(self.unchanged()[0])
+
+    def test_touch_with_same_content_is_refreshed(self):
+        os.utime(self.project, ns=(1, 1))
+        unchanged, refreshed = self.unchanged()
+        self.assertTrue(unchanged)
+        self.assertEqual(refreshed[0], 1)
+
+    def test_other_version_is_ignored(self):
+        self.write(self.state, 'version\t0\nproject\t1\t1\tabc\n')
+        self.assertIsNone(hook.read_state(self.state))
+
+
+class ParseArgsTests(unittest.TestCase):
+
+    def parse(self, *argv):
+        out, err = io.StringIO(), io.StringIO()
+        with redirect_stdout(out), redirect_stderr(err):
+            result = hook.parse_args(list(argv))
+        return result, out.getvalue(), err.getvalue()
+
+    def test_defaults(self):
+        self.assertEqual(self.parse()[0], (False, False, hook.DEFAULT_STATE_FILE))
+
+    def test_options(self):
+        self.assertEqual(self.parse('--force', '-v', '--state', 'x')[0], (True, True, 'x'))
+        self.assertEqual(self.parse('--state=y')[0], (False, False, 'y'))
+
+    def test_help_runs_nothing(self):
+        result, out, _ = self.parse('--help')
+        self.assertEqual(result, 0)
+        self.assertIn('usage: project_sync_hook.py', out)
+
+    def test_usage_errors(self):
+        self.assertEqual(self.parse('--bogus')[0], 2)
+        self.assertEqual(self.parse('--state')[0], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+"""Tests for project_targets.py: routing new files to targets and phases."""
+
+import os
+import sys
+import unittest
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+from pbxproj import PBXProject  # noqa: E402
+from project_targets import EXCEPTION_SET_ISA, TargetIndex, file_type  # noqa: E402
+from project_tree import ProjectTree  # noqa: E402
+
+GOLDEN_PROJECT = os.path.join(SCRIPTS_DIR, 'benchmarks', 'golden', 'Plena.snapshot.pbxproj')
+
+
+def load_golden():
+    with open(GOLDEN_PROJECT, 'r', encoding='utf-8') as f:
+        return PBXProject(f.read())
+
+
+class RoutingTests(unittest.TestCase):
+
+    def setUp(self):
+        self.project = load_golden()
+        self.index = TargetIndex(self.project, ProjectTree(self.project))
+
+    def names(self, path, index=None):
+        return sorted(t['name'] for t in (index or self.index).targets_for(path))
+
+    def test_file_types(self):
+        self.assertEqual(file_type('A/B.swift'), ('sourcecode.swift', 'sources'))
+        self.assertEqual(file_type('A/Model.xcdatamodeld'), ('wrapper.xcdatamodel', 'sources'))
+        self.assertEqual(file_type('A/Products.storekit'), ('text', 'resources'))
+        self.assertIsNone(file_type('A/README.md'))
+
+    def test_default_rules(self):
+        self.assertEqual(self.names('Plena/Views/New.swift'), ['Plena'])
+        self.assertEqual(self.names('Plena Watch App/Views/New.swift'), ['Plena Watch App'])
+        self.assertEqual(self.names('PlenaShared/Models/New.swift'), ['Plena', 'Plena Watch App'])
+        # No unit-test bundle in this project
+        self.assertEqual(self.names('Tests/NewTests.swift'), [])
+
+    def test_selectors(self):
+        self.assertEqual(len(self.index.select('@application')), 2)
+        self.assertEqual([t['name'] for t in self.index.select('Plena')], ['Plena'])
+        self.assertEqual(self.index.select('@bundle.unit-test'), [])
+
+    def test_inferred_from_nearest_group(self):
+        index = TargetIndex(self.project, ProjectTree(self.project), rules=[])
+        # Charts/ has no group yet: the files in Components/ decide
+        self.assertEqual(self.names('Plena/Views/Components/Charts/New.swift', index), ['Plena'])
+        self.assertEqual(self.names('Plena Watch App/Views/New.swift', index), ['Plena Watch App'])
+        self.assertEqual(self.names('Elsewhere/New.swift', index), [])
+
+    def test_add_and_remove_member(self):
+        tree = ProjectTree(self.project)
+        ref = tree.add_file('PlenaShared/Models/New.swift', {'lastKnownFileType': 'sourcecode.swift'})
+        targets = self.index.targets_for('PlenaShared/Models/New.swift')
+        self.index.add_member(ref, targets, 'sources')
+        self.assertEqual(self.index.members[ref.id], {t.id for t in targets})
+        for target in targets:
+            phase = self.index.phase(target, 'sources', create=False)
+            self.assertTrue(any(self.project[b]['fileRef'] == ref.id for b in phase['files']))
+
+        watch = self.index.select('Plena Watch App')[0]
+        self.assertEqual(self.index.remove_member(ref.id, {watch.id}), 1)
+        self.assertEqual(self.index.members[ref.id], {self.index.select('Plena')[0].id})
+        self.assertEqual(self.index.remove_member(ref.id), 1)
+        self.assertNotIn(ref.id, self.index.members)
+
+    def test_missing_resources_phase_is_created(self):
+        target = self.index.select('Plena Watch App')[0]
+        for phase_id in list(target['buildPhases']):
+            if self.project[phase_id].isa == 'PBXResourcesBuildPhase':
+                target['buildPhases'].remove(phase_id)
+        self.assertIsNone(self.index.phase(target, 'resources', create=False))
+        phase = self.index.phase(target, 'resources')
+        self.assertEqual(phase.isa, 'PBXResourcesBuildPhase')
+        self.assertEqual(target['buildPhases'][-1], phase.id)
+
+
+class SynchronizedGroupTests(unittest.TestCase):
+
+    def setUp(self):
+        self.project = load_golden()
+        folder = self.project.add_object('PBXFileSystemSynchronizedRootGroup', {
+            'path': 'Plena/Widgets', 'sourceTree': '<group>'})
+        self.project.main_group['children'].append(folder.id)
+        plena, watch = (self.project_target(name) for name in ('Plena', 'Plena Watch App'))
+        for target in (plena, watch):
+            target['fileSystemSynchronizedGroups'] = [folder.id]
+        exception = self.project.add_object(EXCEPTION_SET_ISA, {
+            'membershipExceptions': ['Phone/Only.swift'], 'target': watch.id})
+        folder['exceptions'] = [exception.id]
+        self.index = TargetIndex(self.project, ProjectTree(self.project))
+
+    def project_target(self, name):
+        return next(t for t in self.project.isa('PBXNativeTarget') if t['name'] == name)
+
+    def names(self, path):
+        return sorted(t['name'] for t in self.index.targets_for(path))
+
+    def test_folder_targets_win_over_rules(self):
+        # The Plena/ rule alone would give only the iOS app
+        self.assertEqual(self.index.synchronized['Plena/Widgets'], {t.id for t in self.index.targets})
+        self.assertEqual(self.names('Plena/Widgets/Deep/Widget.swift'), ['Plena', 'Plena Watch App'])
+
+    def test_membership_exceptions(self):
+        self.assertEqual(self.names('Plena/Widgets/Phone/Only.swift'), ['Plena'])
+
+    def test_paths_outside_the_folder_use_the_rules(self):
+        self.assertEqual(self.names('Plena/Views/New.swift'), ['Plena'])
+        self.assertEqual(self.names('PlenaShared/Widgets/New.swift'), ['Plena', 'Plena Watch App'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+"""Tests for project_tree.py: real paths, group creation and moves."""
+
+import os
+import sys
+import unittest
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+from pbxproj import PBXProject  # noqa: E402
+from project_tree import ProjectTree, resolve_path  # noqa: E402
+
+GOLDEN_DIR = os.path.join(SCRIPTS_DIR, 'benchmarks', 'golden')
+MODEL = 'PlenaShared/Models/PlenaDataModel.xcdatamodeld'
+
+
+def load_golden(name='Plena.snapshot'):
+    with open(os.path.join(GOLDEN_DIR, f'{name}.pbxproj'), 'r', encoding='utf-8') as f:
+        return PBXProject(f.read())
+
+
+class ResolvePathTests(unittest.TestCase):
+
+    def test_source_trees(self):
+        self.assertEqual(resolve_path({'path': 'B.swift'}, 'A'), 'A/B.swift')
+        self.assertEqual(resolve_path({'path': '../C', 'sourceTree': '<group>'}, 'A/B'), 'A/C')
+        self.assertEqual(resolve_path({'path': 'A', 'sourceTree': '<group>'}, ''), 'A')
+        self.assertEqual(resolve_path({'path': './', 'sourceTree': '<group>'}, ''), '')
+        self.assertEqual(resolve_path({'path': 'X/Y', 'sourceTree': 'SOURCE_ROOT'}, 'A'), 'X/Y')
+        self.assertEqual(resolve_path({'path': '/abs', 'sourceTree': '<absolute>'}, 'A'), '/abs')
+        self.assertEqual(resolve_path({'path': 'P.app', 'sourceTree': 'BUILT_PRODUCTS_DIR'}, 'A'),
+                         '$(BUILT_PRODUCTS_DIR)/P.app')
+
+    def test_name_only_group_sits_at_parent_path(self):
+        self.assertEqual(resolve_path({'name': 'Products', 'sourceTree': '<group>'}, 'A'), 'A')
+
+
+class LookupTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tree = ProjectTree(load_golden())
+
+    def test_files_and_groups_by_real_path(self):
+        self.assertIn('Plena/Views/Components', self.tree.groups)
+        self.assertIn(MODEL, self.tree)
+        self.assertIn(MODEL + '/PlenaDataModel.xcdatamodel', self.tree)
+        self.assertNotIn('Plena/Views/Missing.swift', self.tree)
+        ref = next(path for path in self.tree.files if path.startswith('Plena/Views/'))
+        self.assertEqual(self.tree.group('Plena/Views').id, self.tree.parent(self.tree.file(ref).id))
+
+    def test_orphans_are_the_ungrouped_test_files(self):
+        orphans = self.tree.orphans()
+        self.assertEqual(len(orphans), 9)
+        self.assertIn('DashboardViewModelTests.swift', orphans)
+        self.assertIn('TestUtilities.swift', orphans)
+        # None of them is indexed under a real path
+        self.assertFalse(any(path.endswith('DashboardViewModelTests.swift') for path in self.tree.files))
+
+    def test_synchronized_folder_contains_everything_below(self):
+        project = load_golden()
+        folder = project.add_object('PBXFileSystemSynchronizedRootGroup', {
+            'path': 'Widgets', 'sourceTree': '<group>'})
+        project.main_group['children'].append(folder.id)
+        tree = ProjectTree(project)
+        self.assertIn('Widgets/Deep/Widget.swift', tree)
+        self.assertNotIn('WidgetsExtra/Widget.swift', tree)
+
+
+class EditTests(unittest.TestCase):
+
+    def setUp(self):
+        self.project = load_golden()
+        self.tree = ProjectTree(self.project)
+
+    def test_ensure_group_creates_missing_levels(self):
+        group = self.tree.ensure_group('Plena/Views/Charts/Axis')
+        self.assertEqual(group['path'], 'Axis')
+        charts = self.tree.group('Plena/Views/Charts')
+        self.assertIn(group.id, charts['children'])
+        self.assertIn(charts.id, self.tree.group('Plena/Views')['children'])
+        # Existing groups are returned as they are
+        self.assertIs(self.tree.ensure_group('Plena/Views/Charts/Axis/'), group)
+
+    def test_ensure_group_needs_an_existing_top_level_group(self):
+        self.assertIsNone(self.tree.ensure_group('Tools/Lint'))
+        self.assertIsNotNone(self.tree.ensure_group('Tools/Lint', create_top_level=True))
+
+    def test_ensure_group_dry_run_creates_nothing(self):
+        count = len(self.project.objects)
+        self.assertIs(self.tree.ensure_group('Plena/New', dry_run=True), True)
+        self.assertEqual(len(self.project.objects), count)
+        self.assertIsNone(self.tree.group('Plena/New'))
+
+    def test_add_file(self):
+        ref = self.tree.add_file('Plena/Views/New/NewView.swift', {'lastKnownFileType': 'sourcecode.swift'})
+        self.assertEqual(ref['path'], 'NewView.swift')
+        self.assertIs(self.tree.file('Plena/Views/New/NewView.swift'), ref)
+        self.assertEqual(self.tree.paths[ref.id], 'Plena/Views/New/NewView.swift')
+
+    def test_move_data_model_keeps_ids(self):
+        model = self.tree.file(MODEL)
+        version = self.tree.file(MODEL + '/PlenaDataModel.xcdatamodel')
+        moved, old_group = self.tree.move_file(MODEL, 'PlenaShared/Storage/PlenaDataModel.xcdatamodeld')
+        self.assertIs(moved, model)
+        self.assertEqual(old_group.id, self.tree.group('PlenaShared/Models').id)
+        self.assertNotIn(MODEL, self.tree)
+        self.assertIs(self.tree.file('PlenaShared/Storage/PlenaDataModel.xcdatamodeld'), model)
+        self.assertIs(self.tree.file('PlenaShared/Storage/PlenaDataModel.xcdatamodeld/PlenaDataModel.xcdatamodel'),
+                      version)
+        self.assertIn(model.id, self.project)
+
+    def test_remove_data_model_removes_versions(self):
+        version = self.tree.file(MODEL + '/PlenaDataModel.xcdatamodel')
+        model, group = self.tree.remove_file(MODEL)
+        self.assertNotIn(model.id, group['children'])
+        self.assertNotIn(model.id, self.project)
+        self.assertNotIn(version.id, self.project)
+        self.assertNotIn(MODEL + '/PlenaDataModel.xcdatamodel', self.tree)
+
+    def test_prune_empty_group_stops_at_non_empty_parent(self):
+        leaf = self.tree.ensure_group('Plena/Views/Gone/Deeper')
+        removed = self.tree.prune_empty_group(leaf)
+        self.assertEqual(removed, ['Plena/Views/Gone/Deeper', 'Plena/Views/Gone'])
+        self.assertIsNotNone(self.tree.group('Plena/Views'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+"""Tests for project_watch.py: the resident ProjectSync between batches."""
+
+import io
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+from project_watch import ProjectSync  # noqa: E402
+
+GOLDEN_PROJECT = os.path.join(SCRIPTS_DIR, 'benchmarks', 'golden', 'Plena.snapshot.pbxproj')
+PROJECT_FILE = os.path.join('Plena.xcodeproj', 'project.pbxproj')
+
+
+class ProjectSyncTests(unittest.TestCase):
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.root = tempfile.mkdtemp()
+        os.chdir(self.root)
+        os.makedirs('Plena.xcodeproj')
+        shutil.copyfile(GOLDEN_PROJECT, PROJECT_FILE)
+        with redirect_stdout(io.StringIO()):
+            self.sync = ProjectSync(PROJECT_FILE)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.root)
+
+    def write(self, path, text=''):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(text)
+
+    def apply(self, directory):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            added = self.sync.apply([directory])
+        return added, out.getvalue()
+
+    def test_adds_missing_file_once(self):
+        self.write('Plena/Views/NewView.swift')
+        added, out = self.apply('Plena/Views')
+        self.assertEqual(added, 1)
+        self.assertIn('Plena/Views/NewView.swift', self.sync.tree)
+        self.assertEqual(self.apply('Plena/Views'), (0, ''))
+
+    def test_skipped_file_warns_once(self):
+        self.write('Scratch/Notes.swift')
+        _, out = self.apply('Scratch')
+        self.assertIn('No target for Scratch/Notes.swift', out)
+        self.assertEqual(self.apply('Scratch'), (0, ''))
+
+    def test_skipped_file_warns_again_after_it_changes(self):
+        self.write('Scratch/Notes.swift')
+        self.apply('Scratch')
+        self.write('Scratch/Notes.swift', 'struct Notes {}\n')
+        _, out = self.apply('Scratch')
+        self.assertIn('No target for Scratch/Notes.swift', out)
+
+
+    def test_orphaned_file_is_reported_once(self):
+        self.write('Tests/DashboardViewModelTests.swift')
+        added, out = self.apply('Tests')
+        self.assertEqual(added, 0)
+        self.assertIn('no group contains', out)
+        self.assertNotIn('No target for', out)
+        self.assertEqual(self.apply('Tests'), (0, ''))
+
+
+if __name__ == '__main__':
+    unittest.main()
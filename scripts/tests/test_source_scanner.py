@@ -0,0 +1,64 @@
+"""Tests for source_scanner.py: the pruned walk over the source roots."""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+from source_scanner import is_pruned, make_pruner, scan  # noqa: E402
+
+
+class PrunerTests(unittest.TestCase):
+
+    def test_default_pruning(self):
+        for name in ('.git', '.hidden', 'DerivedData', 'archive', 'Assets.xcassets', 'AppIcon.icon',
+                     'Plena.xcodeproj'):
+            self.assertTrue(is_pruned(name), name)
+        for name in ('Views', 'Models', 'Plena Watch App'):
+            self.assertFalse(is_pruned(name), name)
+
+    def test_extra_names_and_suffixes(self):
+        pruned = make_pruner(['Generated/', '*.playground'])
+        self.assertTrue(pruned('Generated'))
+        self.assertTrue(pruned('Demo.playground'))
+        self.assertTrue(pruned('DerivedData'))
+        self.assertFalse(pruned('Views'))
+
+
+class ScanTests(unittest.TestCase):
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.root = tempfile.mkdtemp()
+        os.chdir(self.root)
+        for path in ('App/Views/B.swift', 'App/A.swift', 'App/Notes.md', 'App/.build/Gen.swift',
+                     'App/Assets.xcassets/X.swift', 'App/Store.storekit', 'Shared/Models/M.swift',
+                     'App/Model.xcdatamodeld/Model.xcdatamodel/contents'):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            open(path, 'w').close()
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.root)
+
+    def test_sorted_and_pruned(self):
+        self.assertEqual(scan(['App', 'Shared', 'Missing']),
+                         ['App/A.swift', 'App/Views/B.swift', 'Shared/Models/M.swift'])
+
+    def test_single_thread_gives_the_same_result(self):
+        self.assertEqual(scan(['App', 'Shared'], jobs=1), scan(['App', 'Shared']))
+
+    def test_bundles_are_reported_as_files(self):
+        found = scan(['App'], extensions=('.storekit', '.xcdatamodeld'))
+        self.assertEqual(found, ['App/Model.xcdatamodeld', 'App/Store.storekit'])
+
+    def test_exclude(self):
+        self.assertEqual(scan(['App'], exclude=['Views']), ['App/A.swift'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+"""Tests for stage_timing.py: stage/counter collection and worker deltas."""
+
+import io
+import os
+import sys
+import json
+import argparse
+import tempfile
+import unittest
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+import stage_timing  # noqa: E402
+
+
+class StageTimingTestCase(unittest.TestCase):
+
+    def setUp(self):
+        stage_timing.stats.reset()
+
+    def tearDown(self):
+        stage_timing.configure(False)
+        stage_timing.stats.reset()
+
+
+class CollectionTests(StageTimingTestCase):
+
+    def test_off_by_default(self):
+        with stage_timing.stage('decode'):
+            stage_timing.count('bytes_read', 10)
+        self.assertEqual((stage_timing.stats.stages, stage_timing.stats.counters), ({}, {}))
+        self.assertIsNone(stage_timing.stats.snapshot())
+
+    def test_stages_and_counters(self):
+        stage_timing.configure(True)
+        for _ in range(3):
+            with stage_timing.stage('decode'):
+                stage_timing.count('bytes_read', 10)
+        calls, seconds = stage_timing.stats.stages['decode']
+        self.assertEqual(calls, 3)
+        self.assertGreaterEqual(seconds, 0.0)
+        self.assertEqual(stage_timing.stats.counters, {'bytes_read': 30})
+        self.assertEqual(stage_timing.stats.events, [])
+
+    def test_timed_uses_the_function_name(self):
+        @stage_timing.timed
+        def encode(value):
+            return value * 2
+
+        self.assertEqual(encode(2), 4)
+        stage_timing.configure(True, trace=True)
+        self.assertEqual(encode(3), 6)
+        self.assertEqual(stage_timing.stats.stages['encode'][0], 1)
+        self.assertEqual(stage_timing.stats.events[0][0], 'encode')
+
+    def test_settings(self):
+        stage_timing.configure(True, trace=True)
+        self.assertEqual(stage_timing.settings(), (True, True))
+        stage_timing.configure(False, trace=True)
+        self.assertEqual(stage_timing.settings(), (False, False))
+
+
+class DeltaTests(StageTimingTestCase):
+
+    def test_since_and_add_merge_a_worker(self):
+        stage_timing.configure(True)
+        with stage_timing.stage('write'):
+            stage_timing.count('files_processed')
+        before = stage_timing.stats.snapshot()
+        with stage_timing.stage('write'):
+            stage_timing.count('files_processed')
+        with stage_timing.stage('encode'):
+            pass
+        delta = stage_timing.stats.since(before)
+        self.assertEqual(delta[0]['write'][0], 1)
+        self.assertEqual(delta[0]['encode'][0], 1)
+        self.assertEqual(delta[1], {'files_processed': 1})
+
+        parent = stage_timing.Stats()
+        parent.add(delta)
+        parent.add(delta)
+        parent.add(None)
+        self.assertEqual(parent.stages['write'][0], 2)
+        self.assertEqual(parent.counters, {'files_processed': 2})
+
+
+class SessionTests(StageTimingTestCase):
+
+    def session(self, *argv):
+        parser = argparse.ArgumentParser()
+        stage_timing.add_profile_arguments(parser)
+        return parser.parse_args(list(argv))
+
+    def test_stats_table(self):
+        out = io.StringIO()
+        with stage_timing.Session(self.session('--stats'), 'tool', out=out):
+            with stage_timing.stage('parse'):
+                stage_timing.count('bytes_read', 2048)
+        self.assertFalse(stage_timing.enabled)
+        self.assertIn('parse', out.getvalue())
+        self.assertIn('2048 (2.0 KB)', out.getvalue())
+
+    def test_no_flags_collects_nothing(self):
+        with stage_timing.Session(self.session(), 'tool'):
+            self.assertFalse(stage_timing.enabled)
+
+    def test_profile_writes_dump_and_trace(self):
+        with tempfile.TemporaryDirectory() as directory:
+            prefix = os.path.join(directory, 'run')
+            with stage_timing.Session(self.session('--profile', prefix), 'tool', out=io.StringIO()):
+                with stage_timing.stage('scan'):
+                    pass
+            self.assertTrue(os.path.exists(prefix + '.prof'))
+            with open(prefix + '.trace.json', 'r', encoding='utf-8') as f:
+                events = json.load(f)['traceEvents']
+        self.assertEqual([event['name'] for event in events], ['scan'])
+
+
+if __name__ == '__main__':
+    unittest.main()
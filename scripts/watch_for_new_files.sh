@@ -1,6 +1,10 @@
 #!/bin/bash
 # File watcher that automatically adds new Swift files to Xcode project
 # Run this in the background: ./scripts/watch_for_new_files.sh &
+#
+# Uses the resident watch mode of add_missing_files_to_project.py: inotify on
+# Linux, directory polling elsewhere (no fswatch needed). Extra arguments are
+# passed through, e.g. --poll or --debounce 1.0
 
 set -e
 
@@ -9,29 +13,4 @@ PROJECT_ROOT="$(cd "$SCRIPT_DIR/.." && pwd)"
 
 cd "$PROJECT_ROOT"
 
-# Check if fswatch is installed
-if ! command -v fswatch &> /dev/null; then
-    echo "❌ fswatch is not installed. Install it with:"
-    echo "   brew install fswatch"
-    echo ""
-    echo "Alternatively, use the Xcode build phase or git hooks for automatic checking."
-    exit 1
-fi
-
-echo "👀 Watching for new Swift files..."
-echo "   Press Ctrl+C to stop"
-echo ""
-
-# Watch for new .swift files in project directories
-fswatch -o \
-    "Plena/**/*.swift" \
-    "Plena Watch App/**/*.swift" \
-    "PlenaShared/**/*.swift" \
-    "Tests/**/*.swift" \
-    | while read num; do
-    echo "📝 Detected Swift file changes, checking for missing files..."
-    python3 "$SCRIPT_DIR/add_missing_files_to_project.py" 2>&1 | grep -E "(Found|Successfully|Error)" || true
-done
-
-
-
+exec python3 "$SCRIPT_DIR/add_missing_files_to_project.py" --watch "$@"